@@ -0,0 +1,274 @@
+import numpy as np
+from ikpy.chain import Chain
+from ikpy.link import OriginLink, URDFLink
+from typing import Optional, Sequence
+
+
+def _axis_terms(axis: np.ndarray) -> np.ndarray:
+    """Split ikpy's axis rotation matrix into its constant, cosine and sine parts
+
+    ikpy builds ``axis_rotation_matrix(axis, q)`` with the Rodrigues formula
+    without normalising the axis, so the matrix is always exactly
+    ``K0 + cos(q) * Kc + sin(q) * Ks``. Keeping the raw axis here means the
+    solver reproduces ikpy's forward kinematics for any axis, unit or not.
+
+    Args:
+        axis: Rotation axis as given to the URDFLink
+
+    Returns:
+        Array of shape (3, 3, 3) holding K0, Kc and Ks
+    """
+    x, y, z = axis
+    k0 = np.outer(axis, axis)
+    kc = np.array([
+        [1 - x ** 2, -x * y, -x * z],
+        [-x * y, 1 - y ** 2, -y * z],
+        [-x * z, -y * z, 1 - z ** 2]
+    ])
+    ks = np.array([
+        [0, -z, y],
+        [z, 0, -x],
+        [-y, x, 0]
+    ])
+    return np.stack([k0, kc, ks])
+
+
+def _trig_basis(q: np.ndarray) -> np.ndarray:
+    """Return [1, cos q, sin q] for each angle"""
+    q = np.asarray(q, dtype=float)
+    return np.stack([np.ones_like(q), np.cos(q), np.sin(q)], axis=-1)
+
+
+def _trig_derivatives(q: float) -> np.ndarray:
+    """Return [1, cos q, sin q] and its first two derivatives as rows of a 3x3 array"""
+    c, s = np.cos(q), np.sin(q)
+    return np.array([
+        [1.0, c, s],
+        [0.0, -s, c],
+        [0.0, -c, -s]
+    ])
+
+
+class AnalyticFingerSolver:
+    """Position IK for the HandIK finger chains from their analytic tip model
+
+    Handles chains built like ``HandIK._create_finger_chain`` and
+    ``HandIK._create_thumb_chain``: an origin link followed by a knuckle joint
+    and two bend joints, all revolute with no origin orientation. The tip
+    position of such a chain is
+
+        tip = d0 + M_a(q1) (d1 + M_b(q2) d2)
+
+    where the last bend only spins the tip frame, so q3 does not move the tip.
+    Both rotation matrices are linear in (1, cos q, sin q), which makes the tip
+    a fixed bilinear form in the two knuckle angles. The form is precomputed
+    once per chain, so evaluating the tip for a whole grid of configurations is
+    a single tensor contraction, and its derivatives are exact.
+
+    A solve seeds from that grid (global, so it never gets stuck in the local
+    minima the iterative solver can fall into for out-of-reach targets) and then
+    polishes with a few damped Gauss-Newton steps using the exact Jacobian.
+    Joints that do not affect the tip keep their initial value, which matches
+    what ``Chain.inverse_kinematics`` returns.
+    """
+
+    def __init__(self, chain: Chain, grid_size: Sequence[int] = (48, 24),
+                 refine_steps: int = 8, tolerance: float = 1e-12):
+        """Precompute the tip form for a supported chain
+
+        Args:
+            chain: IKPy chain to solve for
+            grid_size: Number of seed samples for the knuckle and first bend
+            refine_steps: Maximum number of Gauss-Newton refinement steps
+            tolerance: Stop refining once the squared step falls below this
+
+        Raises:
+            ValueError: If the chain does not have the supported structure
+        """
+        if not self.supports(chain):
+            raise ValueError(f"Chain '{chain.name}' is not supported by the analytic solver")
+
+        knuckle, intermediate, tip = chain.links[1:4]
+        self.chain = chain
+        self.n_links = len(chain.links)
+        self.refine_steps = refine_steps
+        self.tolerance = tolerance
+
+        d0 = np.asarray(knuckle.origin_translation, dtype=float)
+        d1 = np.asarray(intermediate.origin_translation, dtype=float)
+        d2 = np.asarray(tip.origin_translation, dtype=float)
+        ka = _axis_terms(np.asarray(knuckle.rotation, dtype=float))
+        kb = _axis_terms(np.asarray(intermediate.rotation, dtype=float))
+
+        # Inner vector v(q2) = d1 + M_b(q2) d2 split into its 1 / cos / sin parts
+        inner = kb @ d2
+        inner[0] += d1
+
+        # tip - d0 = sum_ij g_i(q1) h_j(q2) form[i, j]
+        self.base = d0
+        self.form = np.einsum('ikl,jl->ijk', ka, inner)
+
+        self.bounds = np.array([
+            self._link_bounds(knuckle),
+            self._link_bounds(intermediate)
+        ])
+        # A knuckle allowed a full turn is continuous, so it wraps instead of clipping
+        self.periodic = (self.bounds[:, 1] - self.bounds[:, 0]) >= 2 * np.pi - 1e-9
+        self.seeds = np.stack(np.meshgrid(
+            np.linspace(*self.bounds[0], grid_size[0]),
+            np.linspace(*self.bounds[1], grid_size[1]),
+            indexing='ij'
+        ), axis=-1).reshape(-1, 2)
+        self.seed_tips = self.tip_positions(self.seeds)
+
+    @staticmethod
+    def supports(chain: Chain) -> bool:
+        """Check whether a chain has the knuckle + two bends structure
+
+        Args:
+            chain: IKPy chain to inspect
+
+        Returns:
+            True if the analytic solver can handle the chain
+        """
+        links = chain.links
+        if len(links) != 4 or not isinstance(links[0], OriginLink):
+            return False
+        for link in links[1:]:
+            if not isinstance(link, URDFLink) or link.joint_type != 'revolute':
+                return False
+            if np.any(np.asarray(link.origin_orientation, dtype=float) != 0):
+                return False
+        return list(chain.active_links_mask) == [False, True, True, True]
+
+    @staticmethod
+    def _link_bounds(link: URDFLink) -> tuple:
+        """Return finite joint bounds, defaulting to a full turn"""
+        low, high = link.bounds if link.bounds is not None else (None, None)
+        low = -np.pi if low is None or not np.isfinite(low) else low
+        high = np.pi if high is None or not np.isfinite(high) else high
+        return (low, high)
+
+    def tip_positions(self, angles: np.ndarray) -> np.ndarray:
+        """Evaluate the tip position for many (q1, q2) pairs at once
+
+        Args:
+            angles: Array of shape (N, 2) with knuckle and first bend angles
+
+        Returns:
+            Array of shape (N, 3) with tip positions
+        """
+        angles = np.asarray(angles, dtype=float)
+        g = _trig_basis(angles[:, 0])
+        h = _trig_basis(angles[:, 1])
+        return self.base + np.einsum('ni,nj,ijk->nk', g, h, self.form)
+
+    def _tip_derivatives(self, q: np.ndarray) -> tuple:
+        """Tip position with its exact first and second derivatives
+
+        Args:
+            q: Knuckle and first bend angle
+
+        Returns:
+            tuple: (tip (3,), jacobian (3, 2), hessian (3, 2, 2))
+        """
+        # terms[a, b] is the tip form differentiated a times in q1 and b times in q2
+        knuckle = (_trig_derivatives(q[0]) @ self.form.reshape(3, 9)).reshape(3, 3, 3)
+        terms = _trig_derivatives(q[1]) @ knuckle
+
+        tip = self.base + terms[0, 0]
+        jacobian = np.stack([terms[1, 0], terms[0, 1]], axis=1)
+        hessian = np.stack([
+            np.stack([terms[2, 0], terms[1, 1]], axis=1),
+            np.stack([terms[1, 1], terms[0, 2]], axis=1)
+        ], axis=1)
+        return tip, jacobian, hessian
+
+    def _project(self, q: np.ndarray) -> np.ndarray:
+        """Wrap continuous joints and clip the others to their bounds"""
+        low, high = self.bounds[:, 0], self.bounds[:, 1]
+        wrapped = low + np.mod(q - low, 2 * np.pi)
+        return np.where(self.periodic, wrapped, np.clip(q, low, high))
+
+    def solve(self, target: Sequence[float],
+              initial_position: Optional[Sequence[float]] = None) -> np.ndarray:
+        """Solve position IK for a target
+
+        Args:
+            target: Target tip position [x, y, z]
+            initial_position: Optional full joint vector to start from; joints
+                that do not affect the tip keep these values
+
+        Returns:
+            Full joint vector in the same layout as Chain.inverse_kinematics
+        """
+        solution, _ = self.solve_with_iterations(target, initial_position)
+        return solution
+
+    def solve_with_iterations(self, target: Sequence[float],
+                              initial_position: Optional[Sequence[float]] = None,
+                              max_steps: Optional[int] = None) -> tuple:
+        """Solve position IK and report how many Newton iterations it took
+
+        Without an initial position the solve seeds from the precomputed grid.
+        With one (e.g. the previous frame's solution) it starts from there,
+        which skips the grid search and usually converges in one or two steps.
+
+        Args:
+            target: Target tip position [x, y, z]
+            initial_position: Optional full joint vector to start from
+            max_steps: Optional cap on Newton iterations, overriding refine_steps
+
+        Returns:
+            tuple: (full joint vector, number of Newton iterations)
+        """
+        target = np.asarray(target, dtype=float)
+        if initial_position is None:
+            solution = np.zeros(self.n_links)
+            offsets = self.seed_tips - target
+            q = self.seeds[np.argmin(np.einsum('nk,nk->n', offsets, offsets))].copy()
+        else:
+            solution = np.array(initial_position, dtype=float)
+            q = self._project(solution[1:3])
+
+        # Damped Newton on 0.5 * |tip - target|^2 with the exact Hessian. Far
+        # targets leave a large residual, so the second-order term matters and
+        # plain Gauss-Newton would stall short of the true minimum.
+        tip, jacobian, hessian = self._tip_derivatives(q)
+        residual = tip - target
+        cost = residual @ residual
+        damping = 0.0
+        iterations = 0
+        for _ in range(self.refine_steps if max_steps is None else max_steps):
+            iterations += 1
+            gradient = jacobian.T @ residual
+            curvature = jacobian.T @ jacobian + np.einsum('k,kij->ij', residual, hessian)
+            # Joints pinned at a bound by the gradient stay there; Newton runs
+            # on the remaining ones so the clip does not skew the free step.
+            pinned = ~self.periodic & (
+                ((q <= self.bounds[:, 0]) & (gradient > 0)) |
+                ((q >= self.bounds[:, 1]) & (gradient < 0)))
+            if pinned.all():
+                break
+            free = ~pinned
+            reduced = curvature[np.ix_(free, free)]
+            scale = np.trace(reduced) / len(reduced) or 1.0
+            lowest = np.linalg.eigvalsh(reduced)[0]
+            shift = max(damping * scale, 1e-9 * scale - lowest if lowest <= 0 else 0.0)
+            step = np.zeros(2)
+            step[free] = -np.linalg.solve(reduced + shift * np.eye(len(reduced)), gradient[free])
+            candidate = self._project(q + step)
+            candidate_tip, candidate_jacobian, candidate_hessian = self._tip_derivatives(candidate)
+            candidate_residual = candidate_tip - target
+            candidate_cost = candidate_residual @ candidate_residual
+            if candidate_cost > cost:
+                damping = max(damping * 10, 1e-3)
+                continue
+            damping *= 0.1
+            q, residual, cost = candidate, candidate_residual, candidate_cost
+            jacobian, hessian = candidate_jacobian, candidate_hessian
+            if step @ step < self.tolerance:
+                break
+
+        solution[1:3] = q
+        return solution, iterations
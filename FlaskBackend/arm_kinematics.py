@@ -0,0 +1,94 @@
+import numpy as np
+from typing import Sequence
+from ikpy.chain import Chain
+from ikpy.link import OriginLink, URDFLink
+from batch_fk import BatchFK
+
+
+class ArmKinematics:
+    """Forward kinematics of the shoulder yaw / shoulder pitch / elbow arm chain
+
+    In the zero pose the upper arm hangs straight down from the shoulder and
+    the forearm points forward (+x). Shoulder yaw turns the whole arm about
+    the vertical (z) axis, shoulder pitch swings it about the y axis, and
+    elbow yaw swings the forearm about the upper arm's long axis.
+
+    The chain is an IKPy chain like the finger chains, evaluated through
+    BatchFK. Its link transforms are precomputed, and a whole batch of joint
+    readings is converted with one batched matrix product per link.
+    """
+
+    def __init__(self, upper_arm: float = 0.1, forearm: float = 0.1,
+                 shoulder_offset: Sequence[float] = (0.0, 0.0, 0.0), degrees: bool = True):
+        """Build the arm chain
+
+        Args:
+            upper_arm: Shoulder to elbow length in metres
+            forearm: Elbow to gripper length in metres
+            shoulder_offset: Shoulder position in the robot base frame
+            degrees: Whether joint readings are in degrees (as reported by
+                the actuators) rather than radians
+        """
+        self.degrees = degrees
+        self.chain = Chain(name='arm', links=[
+            OriginLink(),
+            URDFLink(
+                name='shoulder_yaw',
+                origin_translation=list(shoulder_offset),
+                origin_orientation=[0, 0, 0],
+                rotation=[0, 0, 1]
+            ),
+            URDFLink(
+                name='shoulder_pitch',
+                origin_translation=[0, 0, 0],
+                origin_orientation=[0, 0, 0],
+                rotation=[0, 1, 0]
+            ),
+            URDFLink(
+                name='elbow_yaw',
+                origin_translation=[0, 0, -upper_arm],
+                origin_orientation=[0, 0, 0],
+                rotation=[0, 0, 1]
+            ),
+            URDFLink(
+                name='gripper',
+                origin_translation=[forearm, 0, 0],
+                origin_orientation=[0, 0, 0],
+                joint_type='fixed'
+            )
+        ], active_links_mask=[False, True, True, True, False])
+        self.fk = BatchFK(self.chain)
+
+    def chain_joints(self, joints: np.ndarray) -> np.ndarray:
+        """Expand (..., 3) actuator readings to full chain joint vectors in radians"""
+        joints = np.asarray(joints, dtype=float)
+        if joints.shape[-1] != 3:
+            raise ValueError(f"Expected 3 joint values per reading, got {joints.shape[-1]}")
+        if self.degrees:
+            joints = np.radians(joints)
+        full = np.zeros(joints.shape[:-1] + (self.fk.n_links,))
+        full[..., 1:4] = joints
+        return full
+
+    def link_positions(self, joints: np.ndarray) -> np.ndarray:
+        """Positions of the shoulder, elbow and gripper for a batch of readings
+
+        Args:
+            joints: Array of shape (..., 3) with shoulder yaw, shoulder pitch and elbow
+
+        Returns:
+            Array of shape (..., n_links, 3)
+        """
+        full = self.chain_joints(joints)
+        return self.fk.positions(full.reshape(-1, self.fk.n_links)).reshape(full.shape + (3,))
+
+    def positions(self, joints: np.ndarray) -> np.ndarray:
+        """Gripper positions for a batch of joint readings
+
+        Args:
+            joints: Array of shape (..., 3) with shoulder yaw, shoulder pitch and elbow
+
+        Returns:
+            Array of shape (..., 3)
+        """
+        return self.link_positions(joints)[..., -1, :]
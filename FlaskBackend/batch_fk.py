@@ -0,0 +1,110 @@
+import numpy as np
+from ikpy.utils import geometry
+from ikpy.chain import Chain
+from ikpy.link import OriginLink, URDFLink
+from analytic_ik import _axis_terms
+
+
+class BatchFK:
+    """Vectorised forward kinematics for an IKPy chain
+
+    ``Chain.forward_kinematics`` evaluates one configuration at a time and
+    goes through a lambdified sympy matrix per link, so its cost is mostly
+    Python overhead. This class precomputes each link's constant part once:
+    the origin translation, the origin orientation and the Rodrigues terms of
+    its joint axis. Then it composes the frames for a whole batch of
+    configurations with one batched matrix product per link.
+
+    Frames are built exactly as ikpy builds them: translation, then origin
+    orientation, then the joint rotation (ikpy does not normalise the axis),
+    then the joint translation. The results therefore match
+    ``forward_kinematics`` to floating point precision.
+    """
+
+    def __init__(self, chain: Chain):
+        """Precompute the constant part of every link frame
+
+        Args:
+            chain: IKPy chain made of OriginLink and URDFLink links
+        """
+        self.chain = chain
+        self.n_links = len(chain.links)
+        self.links = []
+        for link in chain.links:
+            if isinstance(link, OriginLink):
+                self.links.append(('fixed', np.eye(3), np.zeros(3), None))
+                continue
+            if not isinstance(link, URDFLink):
+                raise ValueError(f"Unsupported link type for batch FK: {type(link).__name__}")
+
+            rotation = geometry.rpy_matrix(*link.origin_orientation)
+            offset = np.asarray(link.origin_translation, dtype=float)
+            if link.joint_type == 'revolute':
+                axis = _axis_terms(np.asarray(link.rotation, dtype=float))
+                # Fold the origin orientation into the K0/Kc/Ks terms
+                self.links.append(('revolute', rotation, offset, np.einsum('ij,tjk->tik', rotation, axis)))
+            elif link.joint_type == 'prismatic':
+                self.links.append(('prismatic', rotation, offset, rotation @ np.asarray(link.translation, dtype=float)))
+            else:
+                self.links.append(('fixed', rotation, offset, None))
+
+    def frames(self, joints: np.ndarray) -> tuple:
+        """Compute the rotation and position of every link frame
+
+        Args:
+            joints: Joint values of shape (N, n_links), or (n_links,) for one configuration
+
+        Returns:
+            tuple: (rotations of shape (N, n_links, 3, 3), positions of shape (N, n_links, 3)),
+            without the batch axis if a single configuration was given
+        """
+        joints = np.asarray(joints, dtype=float)
+        single = joints.ndim == 1
+        joints = np.atleast_2d(joints)
+        if joints.shape[1] != self.n_links:
+            raise ValueError(f"Expected {self.n_links} joint values per configuration, got {joints.shape[1]}")
+
+        n = len(joints)
+        rotations = np.empty((n, self.n_links, 3, 3))
+        positions = np.empty((n, self.n_links, 3))
+        rotation = np.broadcast_to(np.eye(3), (n, 3, 3))
+        position = np.zeros((n, 3))
+
+        for index, (joint_type, origin_rotation, offset, terms) in enumerate(self.links):
+            position = position + rotation @ offset
+            q = joints[:, index]
+            if joint_type == 'revolute':
+                local = terms[0] + np.cos(q)[:, None, None] * terms[1] + np.sin(q)[:, None, None] * terms[2]
+                rotation = rotation @ local
+            else:
+                if joint_type == 'prismatic':
+                    position = position + np.einsum('nij,j->ni', rotation, terms) * q[:, None]
+                rotation = rotation @ origin_rotation
+            rotations[:, index] = rotation
+            positions[:, index] = position
+
+        if single:
+            return rotations[0], positions[0]
+        return rotations, positions
+
+    def positions(self, joints: np.ndarray) -> np.ndarray:
+        """Compute the position of every link frame
+
+        Args:
+            joints: Joint values of shape (N, n_links), or (n_links,) for one configuration
+
+        Returns:
+            Array of shape (N, n_links, 3), or (n_links, 3) for one configuration
+        """
+        return self.frames(joints)[1]
+
+    def tip_positions(self, joints: np.ndarray) -> np.ndarray:
+        """Compute the end effector position
+
+        Args:
+            joints: Joint values of shape (N, n_links), or (n_links,) for one configuration
+
+        Returns:
+            Array of shape (N, 3), or (3,) for one configuration
+        """
+        return self.positions(joints)[..., -1, :]
@@ -0,0 +1,264 @@
+import argparse
+import copy
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+
+# Repository root, where the recorded frames and validation.csv live
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RECORDED_FILES = ['example.json', 'ex2.json', 'ex3.json']
+STAGES = ['process_hand', 'transform_hand_data', 'transform_frame', 'validate_hand', 'process_headset_data']
+
+
+def load_frames(root_dir: str = ROOT_DIR, synthetic: int = 100) -> Dict[str, List[Dict[str, Any]]]:
+    """Load the recorded frames and generate synthetic ones
+
+    Args:
+        root_dir: Directory containing the recorded JSON files
+        synthetic: Number of synthetic frames from test_headset_movement, spread over one circle
+
+    Returns:
+        Dictionary of source name to a list of frames ({"hands": {...}})
+    """
+    frames = {}
+    for filename in RECORDED_FILES:
+        path = os.path.join(root_dir, filename)
+        if not os.path.exists(path):
+            print(f"Warning: Skipping {filename} - file not found")
+            continue
+        with open(path, 'r') as f:
+            frames[filename] = [json.load(f)]
+
+    if synthetic > 0:
+        from test_headset_movement import generate_hand_movement
+        frames['synthetic'] = [{
+            "hands": {
+                "left_hand": {"points": generate_hand_movement(t, is_left=True)},
+                "right_hand": {"points": generate_hand_movement(t, is_left=False)}
+            }
+        } for t in np.linspace(0, 2 * math.pi, synthetic, endpoint=False)]
+    return frames
+
+
+def build_stages(ik_solver: str = 'analytic', fit_mode: str = 'tip') -> Dict[str, Callable[[Dict[str, Any]], Any]]:
+    """Create the components under test and wrap each stage as frame -> result
+
+    The calibration is a fixed synthetic one (a small rotation, scale and
+    offset) so the calibration path is exercised without calibration.json.
+
+    Args:
+        ik_solver: Solver passed to HandIK
+        fit_mode: Fit mode passed to HandIK
+
+    Returns:
+        Dictionary of stage name to a callable processing one frame
+    """
+    from hand_calibration import HandCalibration
+    from hand_frame import HandFrame
+    from hand_ik import HandIK
+    from hand_validator import HandValidator
+    from sim_processor import SimProcessor
+
+    angle = np.radians(10)
+    calibration = HandCalibration(os.path.join(ROOT_DIR, 'benchmark_calibration.json'))
+    calibration.set_calibration(np.array([
+        [np.cos(angle), -np.sin(angle), 0],
+        [np.sin(angle), np.cos(angle), 0],
+        [0, 0, 1]
+    ]), [1.1, 0.9, 1.0], [0.01, -0.02, 0.03])
+
+    ik_processor = HandIK(ik_solver=ik_solver, fit_mode=fit_mode)
+    ik_processor.calibration = calibration
+    validator = HandValidator(os.path.join(ROOT_DIR, 'validation.csv'))
+    sim_processor = SimProcessor()
+
+    def hands(frame):
+        return frame.get('hands', {}).items()
+
+    return {
+        'process_hand': lambda frame: [
+            ik_processor.process_hand(hand_data, hand_id=hand_key.split('_')[0])
+            for hand_key, hand_data in hands(frame)],
+        'transform_hand_data': lambda frame: [
+            calibration.transform_hand_data(hand_data) for _, hand_data in hands(frame)],
+        'transform_frame': lambda frame: [
+            calibration.transform_frame(HandFrame.from_hand_data(hand_data)) for _, hand_data in hands(frame)],
+        'validate_hand': lambda frame: [
+            validator.validate_hand(hand_data) for _, hand_data in hands(frame)],
+        'process_headset_data': sim_processor.process_headset_data
+    }
+
+
+def _run_stage(stage: Callable, frame: Dict[str, Any]) -> bool:
+    """Run a stage on one frame, returning False if it raised"""
+    try:
+        stage(frame)
+        return True
+    except Exception:
+        return False
+
+
+def _time_stage(stage: Callable, frames: List[Dict[str, Any]], repeat: int, warmup: int) -> tuple:
+    """Time a stage over the frames
+
+    Each call gets its own deep copy of the frame (made outside the timed
+    region) so a stage that modifies its input cannot affect later calls. Frames the
+    stage fails on are still timed and counted as errors.
+
+    Returns:
+        tuple: (per-frame latencies in seconds, number of failed calls)
+    """
+    for frame in frames[:warmup]:
+        _run_stage(stage, copy.deepcopy(frame))
+
+    latencies = []
+    errors = 0
+    for _ in range(repeat):
+        for frame in frames:
+            frame_copy = copy.deepcopy(frame)
+            start = time.perf_counter()
+            ok = _run_stage(stage, frame_copy)
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+    return np.array(latencies), errors
+
+
+def _peak_memory(stage: Callable, frames: List[Dict[str, Any]]) -> int:
+    """Peak bytes allocated while running a stage once over the frames"""
+    frame_copies = copy.deepcopy(frames)
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        for frame in frame_copies:
+            _run_stage(stage, frame)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return max(peak - baseline, 0)
+
+
+def run_benchmark(frames: Dict[str, List[Dict[str, Any]]], stages: Dict[str, Callable],
+                  repeat: int = 5, warmup: int = 3) -> Dict[str, Any]:
+    """Benchmark every stage over all frames
+
+    Args:
+        frames: Frames by source, from load_frames()
+        stages: Stages by name, from build_stages()
+        repeat: Number of timed passes over the frames
+        warmup: Number of untimed frames run first per stage
+
+    Returns:
+        Report with latency percentiles (ms), frames per second, peak memory
+        (KiB) and the number of frames that raised, per stage
+    """
+    all_frames = [frame for source in frames.values() for frame in source]
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'frames': {source: len(source_frames) for source, source_frames in frames.items()},
+            'repeat': repeat
+        },
+        'stages': {}
+    }
+    for name, stage in stages.items():
+        latencies, errors = _time_stage(stage, all_frames, repeat, warmup)
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+        report['stages'][name] = {
+            'calls': len(latencies),
+            'errors': errors,
+            'mean_ms': float(latencies.mean() * 1000),
+            'p50_ms': float(p50),
+            'p95_ms': float(p95),
+            'p99_ms': float(p99),
+            'fps': float(len(latencies) / latencies.sum()) if latencies.sum() > 0 else float('inf'),
+            'peak_memory_kb': _peak_memory(stage, all_frames) / 1024
+        }
+    return report
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.1,
+                    metrics: Optional[List[str]] = None) -> List[str]:
+    """Find stages that got slower than a baseline run
+
+    Args:
+        current: Report from run_benchmark()
+        baseline: Earlier report to compare against
+        threshold: Allowed relative slowdown (0.1 = 10%)
+        metrics: Latency metrics to compare, default p50 and p95
+
+    Returns:
+        List of regression messages, empty if nothing regressed
+    """
+    regressions = []
+    for name, stats in current['stages'].items():
+        if name not in baseline.get('stages', {}):
+            continue
+        for metric in metrics or ['p50_ms', 'p95_ms']:
+            before = baseline['stages'][name][metric]
+            after = stats[metric]
+            if before > 0 and after > before * (1 + threshold):
+                regressions.append(
+                    f"{name} {metric}: {before:.3f} -> {after:.3f} (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the hand processing hot path')
+    parser.add_argument('--frames-dir', default=ROOT_DIR, help='Directory with example.json, ex2.json and ex3.json')
+    parser.add_argument('--synthetic', type=int, default=100, help='Number of synthetic frames')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed passes over the frames')
+    parser.add_argument('--warmup', type=int, default=3, help='Untimed frames per stage')
+    parser.add_argument('--stages', nargs='*', choices=STAGES, default=STAGES, help='Stages to run')
+    parser.add_argument('--ik-solver', choices=['analytic', 'workspace', 'ikpy'], default='analytic',
+                        help='IK solver for the process_hand stage')
+    parser.add_argument('--ik-fit', choices=['tip', 'full_pose'], default='tip',
+                        help='IK fit mode for the process_hand stage')
+    parser.add_argument('--output', help='Save the report as JSON')
+    parser.add_argument('--baseline', help='Earlier JSON report to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Allowed relative slowdown against the baseline (default 10%%)')
+
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames_dir, args.synthetic)
+    stages = build_stages(args.ik_solver, args.ik_fit)
+    report = run_benchmark(frames, {name: stages[name] for name in args.stages},
+                           repeat=args.repeat, warmup=args.warmup)
+
+    print(f"Frames: {report['meta']['frames']}, {args.repeat} passes")
+    print(f"{'stage':<22}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'fps':>10}{'peak KiB':>10}")
+    for name, stats in report['stages'].items():
+        print(f"{name:<22}{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}{stats['p99_ms']:>10.3f}"
+              f"{stats['fps']:>10.0f}{stats['peak_memory_kb']:>10.1f}")
+        if stats['errors']:
+            print(f"Warning: {name} raised on {stats['errors']} of {stats['calls']} frames")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare_results(report, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold * 100:.0f}% against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
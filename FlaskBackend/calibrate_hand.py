@@ -1,5 +1,6 @@
 import argparse
 import json
+import numpy as np
 from hand_ik import HandIK
 import time
 from typing import List, Dict
@@ -57,10 +58,34 @@ def collect_calibration_points(input_file: str) -> tuple:
     
     return vr_points, robot_points
 
+def load_pairs(pairs_file: str) -> tuple:
+    """Load recorded VR/robot correspondences
+    
+    Args:
+        pairs_file: .npz file with 'vr' and 'robot' arrays, or a JSON file
+            with "vr" and "robot" lists of [x, y, z]
+            
+    Returns:
+        tuple of (vr_points, robot_points) as (N, 3) arrays
+    """
+    if pairs_file.endswith('.npz'):
+        data = np.load(pairs_file)
+    else:
+        with open(pairs_file, 'r') as f:
+            data = json.load(f)
+    return np.asarray(data['vr'], dtype=float), np.asarray(data['robot'], dtype=float)
+
 def main():
     parser = argparse.ArgumentParser(description='Calibrate hand tracking to robot space')
-    parser.add_argument('--input', required=True, help='Input JSON file with VR calibration poses')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--input', help='Input JSON file with VR calibration poses')
+    source.add_argument('--pairs', help='Recorded correspondences (.npz or .json with "vr" and "robot" point lists)')
     parser.add_argument('--output', default='calibration.json', help='Output calibration file')
+    parser.add_argument('--robust', action='store_true',
+                        help='Fit with RANSAC, ignoring correspondences that disagree with the fit')
+    parser.add_argument('--threshold', type=float, default=0.01,
+                        help='RANSAC inlier distance in robot space units')
+    parser.add_argument('--iterations', type=int, default=256, help='Number of RANSAC hypotheses')
     
     args = parser.parse_args()
     
@@ -68,11 +93,22 @@ def main():
     print("=====================")
     
     # Collect calibration points
-    vr_points, robot_points = collect_calibration_points(args.input)
+    if args.pairs:
+        vr_points, robot_points = load_pairs(args.pairs)
+        print(f"Loaded {len(vr_points)} correspondences from {args.pairs}")
+    else:
+        vr_points, robot_points = collect_calibration_points(args.input)
     
     # Perform calibration
     hand_ik = HandIK(args.output)
-    quality_metrics = hand_ik.calibrate(vr_points, robot_points)
+    fit = hand_ik.calibration.calibrate_from_pairs(vr_points, robot_points, robust=args.robust,
+                                                   threshold=args.threshold, iterations=args.iterations)
+    if args.robust:
+        # Outliers are expected to be far off, so measure the fit on the inliers
+        inliers = fit['inlier_mask']
+        vr_points, robot_points = np.asarray(vr_points)[inliers], np.asarray(robot_points)[inliers]
+        print(f"\nRANSAC kept {fit['inliers']} of {fit['pairs']} correspondences")
+    quality_metrics = hand_ik.calibration.check_calibration_quality(vr_points, robot_points)
     
     print("\nCalibration completed!")
     print("\nQuality Metrics:")
@@ -0,0 +1,250 @@
+import argparse
+import time
+from threading import Event, Thread
+from typing import Callable, Dict, Optional, Tuple
+import numpy as np
+import requests
+from hand_calibration import HandCalibration
+from hand_frame import HandFrame, parse_timestamp
+
+# A sample source returns (timestamp in seconds, values) or None when nothing is available
+Source = Callable[[], Optional[Tuple[float, np.ndarray]]]
+
+
+def http_wrist_source(server_url: str, hand: str = 'left', timeout: float = 0.5) -> Source:
+    """Read the latest headset wrist position from a running server
+
+    Polls return None until the server has received a new frame (a new
+    ``version``), so a frame is recorded once however fast it is polled.
+    Each sample is stamped with the frame's arrival time at the server,
+    moved to the capture clock by an offset taken from the quickest poll
+    so far (now minus the reported age, minus the arrival time), so the
+    server and capture clocks need not agree.
+
+    Args:
+        server_url: Base URL of the server receiving headset data (/move_simbot_headset)
+        hand: 'left' or 'right'
+        timeout: HTTP timeout in seconds
+
+    Returns:
+        Source returning (timestamp, wrist [x, y, z])
+    """
+    session = requests.Session()
+    url = f"{server_url.rstrip('/')}/get_latest_headset_data"
+    state = {'version': None, 'offset': None}
+
+    def read():
+        response = session.get(url, timeout=timeout)
+        received = time.time()
+        if response.status_code != 200:
+            return None
+        body = response.json()
+        arrived = parse_timestamp(body['timestamp'])
+        # Response delays only ever make the offset look larger, so keep the smallest
+        offset = received - body['age_seconds'] - arrived
+        if state['offset'] is None or offset < state['offset']:
+            state['offset'] = offset
+        if body['version'] == state['version']:
+            return None  # No new frame since the last poll
+        state['version'] = body['version']
+        hand_data = body['data'].get('hands', {}).get(f'{hand}_hand')
+        if hand_data is None:
+            return None
+        wrist = HandFrame.from_hand_data(hand_data).get('wrist')
+        if wrist is None:
+            return None
+        return arrived + state['offset'], wrist
+
+    return read
+
+
+def actuator_source(calibration: HandCalibration) -> Source:
+    """Read the arm joint positions, timestamped at the middle of the round trip"""
+    def read():
+        start = time.time()
+        joints = calibration.read_joint_positions()
+        return (start + time.time()) / 2, joints
+
+    return read
+
+
+def align_streams(headset_times: np.ndarray, headset_values: np.ndarray,
+                  robot_times: np.ndarray, robot_values: np.ndarray,
+                  max_gap: float = 0.1) -> Tuple[np.ndarray, np.ndarray]:
+    """Pair each robot sample with the headset position at the same time
+
+    Headset positions are linearly interpolated to every robot sample time.
+    Robot samples outside the headset recording are dropped, and so are those
+    whose two neighbouring headset samples are more than ``max_gap`` apart
+    (tracking dropouts).
+
+    Args:
+        headset_times: Array of shape (H,); repeated frames (same time) are allowed
+        headset_values: Array of shape (H, 3)
+        robot_times: Array of shape (R,)
+        robot_values: Array of shape (R, k)
+        max_gap: Longest headset gap to interpolate across, in seconds
+
+    Returns:
+        tuple: (headset positions (M, 3), matching robot values (M, k))
+    """
+    headset_times, unique = np.unique(headset_times, return_index=True)
+    headset_values = np.asarray(headset_values, dtype=float)[unique]
+    robot_times = np.asarray(robot_times, dtype=float)
+    robot_values = np.asarray(robot_values, dtype=float)
+    if len(headset_times) < 2:
+        return np.zeros((0, 3)), robot_values[:0]
+
+    after = np.searchsorted(headset_times, robot_times)
+    inside = (after > 0) & (after < len(headset_times))
+    after = np.clip(after, 1, len(headset_times) - 1)
+    gap = headset_times[after] - headset_times[after - 1]
+    keep = inside & (gap <= max_gap)
+
+    after = after[keep]
+    fraction = ((robot_times[keep] - headset_times[after - 1]) / gap[keep])[:, None]
+    aligned = headset_values[after - 1] * (1 - fraction) + headset_values[after] * fraction
+    return aligned, robot_values[keep]
+
+
+class CalibrationCapture:
+    """Records calibration correspondences while the operator moves the arm
+
+    The headset and the actuators are sampled by two threads at a fixed rate
+    into preallocated arrays. Neither stream waits for the other, and
+    align_streams pairs them by timestamp afterwards. A few seconds of motion
+    give thousands of pairs for HandCalibration.calibrate_from_pairs, with no
+    prompts.
+    """
+
+    def __init__(self, calibration: HandCalibration, headset_source: Source,
+                 robot_source: Optional[Source] = None, rate: float = 100.0):
+        """Set up the capture
+
+        Args:
+            calibration: Calibration that converts joints to positions and receives the fit
+            headset_source: Source of (timestamp, wrist position) samples
+            robot_source: Source of (timestamp, joint positions) samples,
+                default the calibration's connected robot
+            rate: Samples per second for each stream
+        """
+        self.calibration = calibration
+        self.headset_source = headset_source
+        self.robot_source = robot_source if robot_source is not None else actuator_source(calibration)
+        self.rate = rate
+        self.errors = {'headset': 0, 'robot': 0}
+
+    def _sample(self, name: str, source: Source, times: np.ndarray, values: np.ndarray,
+                counts: Dict[str, int], stop: Event) -> None:
+        """Sampling loop for one stream, on a fixed schedule"""
+        period = 1.0 / self.rate
+        next_time = time.perf_counter()
+        count = 0
+        while not stop.is_set() and count < len(times):
+            try:
+                sample = source()
+            except Exception:
+                sample = None
+                self.errors[name] += 1
+            if sample is not None:
+                times[count] = sample[0]
+                values[count] = sample[1]
+                count += 1
+            next_time += period
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                stop.wait(delay)
+            else:
+                next_time = time.perf_counter()  # Fell behind; don't burst to catch up
+        counts[name] = count
+
+    def record(self, duration: float) -> Dict[str, np.ndarray]:
+        """Sample both streams concurrently
+
+        Args:
+            duration: Recording length in seconds
+
+        Returns:
+            Dictionary with 'headset_times', 'headset_positions', 'robot_times'
+            and 'robot_joints' arrays
+        """
+        capacity = int(duration * self.rate) + 1
+        headset_times, headset_values = np.zeros(capacity), np.zeros((capacity, 3))
+        robot_times, robot_values = np.zeros(capacity), np.zeros((capacity, 3))
+        counts = {'headset': 0, 'robot': 0}
+        stop = Event()
+        threads = [
+            Thread(target=self._sample, args=('headset', self.headset_source, headset_times,
+                                              headset_values, counts, stop), daemon=True),
+            Thread(target=self._sample, args=('robot', self.robot_source, robot_times,
+                                              robot_values, counts, stop), daemon=True)
+        ]
+        for thread in threads:
+            thread.start()
+        stop.wait(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        return {
+            'headset_times': headset_times[:counts['headset']],
+            'headset_positions': headset_values[:counts['headset']],
+            'robot_times': robot_times[:counts['robot']],
+            'robot_joints': robot_values[:counts['robot']]
+        }
+
+    def capture_pairs(self, duration: float, max_gap: float = 0.1) -> Tuple[np.ndarray, np.ndarray]:
+        """Record for ``duration`` seconds and return aligned correspondences
+
+        Args:
+            duration: Recording length in seconds
+            max_gap: Longest headset gap to interpolate across, in seconds
+
+        Returns:
+            tuple: (VR wrist positions (N, 3), robot positions (N, 3))
+        """
+        recording = self.record(duration)
+        vr, joints = align_streams(recording['headset_times'], recording['headset_positions'],
+                                   recording['robot_times'], recording['robot_joints'], max_gap)
+        return vr, self.calibration.joints_to_positions(joints)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record calibration pairs while moving the arm')
+    parser.add_argument('--server', default='http://localhost:5001',
+                        help='Server receiving the headset stream')
+    parser.add_argument('--hand', choices=['left', 'right'], default='left', help='Tracked hand')
+    parser.add_argument('--robot-ip', default='192.168.42.1', help='Robot IP address')
+    parser.add_argument('--duration', type=float, default=10.0, help='Recording length in seconds')
+    parser.add_argument('--rate', type=float, default=100.0, help='Samples per second for each stream')
+    parser.add_argument('--max-gap', type=float, default=0.1,
+                        help='Longest headset gap to interpolate across, in seconds')
+    parser.add_argument('--output', default='calibration_pairs.npz',
+                        help='Recorded pairs, readable by calibrate_hand.py --pairs')
+    parser.add_argument('--calibrate', action='store_true', help='Also fit and save calibration.json')
+    parser.add_argument('--calibration-file', default='calibration.json', help='Calibration file to write')
+    parser.add_argument('--robust', action='store_true', help='Fit with RANSAC')
+    parser.add_argument('--threshold', type=float, default=0.01, help='RANSAC inlier distance')
+
+    args = parser.parse_args()
+
+    calibration = HandCalibration(args.calibration_file, robot_ip=args.robot_ip, connect_robot=True)
+    if calibration.kos is None:
+        parser.exit(1, "Could not connect to the robot\n")
+    capture = CalibrationCapture(calibration, http_wrist_source(args.server, args.hand), rate=args.rate)
+
+    print(f"Recording for {args.duration:.0f}s - move the arm through its range with the tracked hand")
+    vr, robot = capture.capture_pairs(args.duration, args.max_gap)
+    if capture.errors['headset'] or capture.errors['robot']:
+        print(f"Warning: {capture.errors['headset']} headset and {capture.errors['robot']} robot reads failed")
+    np.savez(args.output, vr=vr, robot=robot)
+    print(f"Saved {len(vr)} pairs to {args.output}")
+
+    if args.calibrate:
+        fit = calibration.calibrate_from_pairs(vr, robot, robust=args.robust, threshold=args.threshold)
+        print(f"Calibration version {fit['version']} fitted to {fit['inliers']} of {fit['pairs']} pairs, "
+              f"saved to {args.calibration_file}")
+
+
+if __name__ == '__main__':
+    main()
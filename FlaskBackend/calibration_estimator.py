@@ -0,0 +1,198 @@
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+Points = Union[np.ndarray, Sequence[Sequence[float]], List[Dict[str, float]]]
+
+
+def as_point_array(points: Points) -> np.ndarray:
+    """Convert points given as {'x', 'y', 'z'} dicts or as an array to an (N, 3) array"""
+    if len(points) and isinstance(points[0], dict):
+        return np.array([[p['x'], p['y'], p['z']] for p in points], dtype=float)
+    return np.asarray(points, dtype=float).reshape(-1, 3)
+
+
+def solve_scaled_rotation(vr_centroid: np.ndarray, robot_centroid: np.ndarray,
+                          vr_comoment: np.ndarray, cross_comoment: np.ndarray) -> tuple:
+    """Fit robot = R @ (vr * scale) + offset from point statistics
+
+    The linear part A = R @ diag(scale) is the least-squares map between the
+    centered points, A = cross^T @ inv(vr_comoment). Its column norms are the
+    per-axis scale factors, and the nearest rotation to A @ diag(1 / scale)
+    (from an SVD, flipped if needed to stay right-handed) is R. Only centroids
+    and co-moments are needed, so the fit works on streamed statistics and on
+    many hypotheses at once.
+
+    Args:
+        vr_centroid: Array of shape (..., 3)
+        robot_centroid: Array of shape (..., 3)
+        vr_comoment: Array of shape (..., 3, 3), sum of (vr - mean) (vr - mean)^T
+        cross_comoment: Array of shape (..., 3, 3), sum of (vr - mean) (robot - mean)^T
+
+    Returns:
+        tuple: (rotations (..., 3, 3), scale factors (..., 3), offsets (..., 3))
+    """
+    A = np.swapaxes(cross_comoment, -1, -2) @ np.linalg.pinv(vr_comoment)
+    scale = np.linalg.norm(A, axis=-2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        U, _, Vt = np.linalg.svd(np.nan_to_num(A / scale[..., None, :]))
+    R = U @ Vt
+
+    # Ensure right-handed coordinate system
+    reflected = np.linalg.det(R) < 0
+    if np.any(reflected):
+        U = U.copy()
+        U[..., :, -1] *= np.where(reflected, -1.0, 1.0)[..., None]
+        R = U @ Vt
+
+    offset = robot_centroid - np.einsum('...ij,...j->...i', R, vr_centroid * scale)
+    return R, scale, offset
+
+
+class OnlineCalibrationEstimator:
+    """Running VR to robot calibration fit, updated one correspondence at a time
+
+    Keeps the centroids and co-moments of the VR and robot points, merged with
+    Chan's parallel update, so adding a pair (or a batch) costs O(1) per pair
+    and no history is stored. solve() gives the same fit as solving on the
+    full point lists.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all correspondences"""
+        self.count = 0
+        self.vr_mean = np.zeros(3)
+        self.robot_mean = np.zeros(3)
+        self.vr_comoment = np.zeros((3, 3))
+        self.cross_comoment = np.zeros((3, 3))
+
+    def add(self, vr_point: Points, robot_point: Points) -> None:
+        """Add one VR point and the robot position it corresponds to"""
+        self.add_batch([vr_point], [robot_point])
+
+    def add_batch(self, vr_points: Points, robot_points: Points) -> None:
+        """Add corresponding VR and robot points
+
+        Args:
+            vr_points: N points in VR space (dicts or an (N, 3) array)
+            robot_points: The N matching points in robot space
+        """
+        vr = as_point_array(vr_points)
+        robot = as_point_array(robot_points)
+        if vr.shape != robot.shape:
+            raise ValueError(f"Got {len(vr)} VR points but {len(robot)} robot points")
+        n = len(vr)
+        if n == 0:
+            return
+
+        vr_mean = vr.mean(axis=0)
+        robot_mean = robot.mean(axis=0)
+        vr_centered = vr - vr_mean
+        robot_centered = robot - robot_mean
+
+        total = self.count + n
+        weight = self.count * n / total
+        vr_delta = vr_mean - self.vr_mean
+        robot_delta = robot_mean - self.robot_mean
+        self.vr_comoment += vr_centered.T @ vr_centered + weight * np.outer(vr_delta, vr_delta)
+        self.cross_comoment += vr_centered.T @ robot_centered + weight * np.outer(vr_delta, robot_delta)
+        self.vr_mean = self.vr_mean + vr_delta * (n / total)
+        self.robot_mean = self.robot_mean + robot_delta * (n / total)
+        self.count = total
+
+    def solve(self) -> tuple:
+        """Fit the calibration to the correspondences seen so far
+
+        Returns:
+            tuple: (rotation matrix, scale factors, offset)
+        """
+        if self.count < 4:
+            raise ValueError(f"Need at least 4 correspondences, got {self.count}")
+        if np.linalg.cond(self.vr_comoment) > 1e10:
+            raise ValueError("VR points must span all three axes (they are collinear or coplanar)")
+        return solve_scaled_rotation(self.vr_mean, self.robot_mean, self.vr_comoment, self.cross_comoment)
+
+
+def fit_ransac(vr_points: Points, robot_points: Points, threshold: float = 0.01,
+               iterations: int = 256, sample_size: int = 6, seed: Optional[int] = None,
+               chunk_size: int = 32) -> Dict[str, Any]:
+    """Outlier-robust calibration fit for large batches of correspondences
+
+    Fits a hypothesis to each of ``iterations`` random minimal samples, all in
+    one batched solve. It then keeps the hypothesis with the most pairs within
+    ``threshold`` and refits on those inliers. Tracking glitches and
+    mismatched timestamps in recorded sessions therefore do not skew the
+    calibration.
+
+    Args:
+        vr_points: N points in VR space (dicts or an (N, 3) array)
+        robot_points: The N matching points in robot space
+        threshold: Residual (robot space units) below which a pair is an inlier
+        iterations: Number of random hypotheses
+        sample_size: Pairs per hypothesis (at least 4)
+        seed: Optional random seed
+        chunk_size: Hypotheses scored at once, bounding memory to chunk_size * N * 3
+
+    Returns:
+        Dictionary with 'transform_matrix', 'scale_factors', 'offset' and the
+        boolean 'inliers' mask
+    """
+    vr = as_point_array(vr_points)
+    robot = as_point_array(robot_points)
+    if vr.shape != robot.shape:
+        raise ValueError(f"Got {len(vr)} VR points but {len(robot)} robot points")
+    if sample_size < 4 or len(vr) < sample_size:
+        raise ValueError(f"Need at least {max(sample_size, 4)} correspondences, got {len(vr)}")
+
+    # Random minimal samples without repeats inside a sample
+    rng = np.random.default_rng(seed)
+    samples = np.argpartition(rng.random((iterations, len(vr))), sample_size - 1, axis=1)[:, :sample_size]
+    sample_vr = vr[samples]
+    sample_robot = robot[samples]
+    vr_means = sample_vr.mean(axis=1)
+    robot_means = sample_robot.mean(axis=1)
+    vr_centered = sample_vr - vr_means[:, None]
+    robot_centered = sample_robot - robot_means[:, None]
+    rotations, scales, offsets = solve_scaled_rotation(
+        vr_means, robot_means,
+        np.einsum('hni,hnj->hij', vr_centered, vr_centered),
+        np.einsum('hni,hnj->hij', vr_centered, robot_centered))
+    linear = rotations * scales[:, None, :]
+    valid = np.isfinite(linear).all(axis=(1, 2)) & np.isfinite(offsets).all(axis=1)
+
+    # Score every hypothesis by its inlier count, then by its inlier residuals
+    limit = threshold ** 2
+    best_score = (-1, np.inf)
+    best = None
+    for start in range(0, iterations, chunk_size):
+        stop = min(start + chunk_size, iterations)
+        residuals = vr @ np.swapaxes(linear[start:stop], 1, 2) + (offsets[start:stop, None] - robot)
+        errors = np.einsum('hnk,hnk->hn', residuals, residuals)
+        inliers = errors < limit
+        counts = np.where(valid[start:stop], inliers.sum(axis=1), -1)
+        costs = np.where(inliers, errors, 0.0).sum(axis=1)
+        for h in np.flatnonzero(counts == counts.max()):
+            if (counts[h], -costs[h]) > (best_score[0], -best_score[1]):
+                best_score = (counts[h], costs[h])
+                best = inliers[h]
+    if best is None or best_score[0] < 4:
+        raise ValueError(f"No hypothesis had 4 inliers within {threshold}; try a larger threshold")
+
+    # Refit on the inliers, then once more on the inliers of the refined fit
+    for refit in range(2):
+        estimator = OnlineCalibrationEstimator()
+        estimator.add_batch(vr[best], robot[best])
+        R, scale, offset = estimator.solve()
+        refined = np.sum(((vr * scale) @ R.T + offset - robot) ** 2, axis=1) < limit
+        if refit or refined.sum() < 4 or np.array_equal(refined, best):
+            break
+        best = refined
+
+    return {
+        'transform_matrix': R,
+        'scale_factors': scale,
+        'offset': offset,
+        'inliers': best
+    }
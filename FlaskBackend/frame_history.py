@@ -0,0 +1,156 @@
+import numpy as np
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, List, Optional
+from hand_frame import JOINT_NAMES, N_JOINTS
+
+# Hands and the arms they drive, in the order they are stored
+HANDS = ['left', 'right']
+ARMS = ['leftArm', 'rightArm']
+
+# One processed headset frame: arrival time, both hands' joints (NaN where not
+# tracked) and the arm poses sent to the sim (NaN for arms not updated)
+FRAME_DTYPE = np.dtype([
+    ('timestamp', 'f8'),
+    ('hands', 'f4', (len(HANDS), N_JOINTS, 3)),
+    ('pose', 'f4', (len(ARMS), 3))
+])
+
+
+class FrameHistory:
+    """Fixed-capacity ring buffer of processed headset frames
+
+    Frames are stored in one preallocated structured array, so memory use is
+    fixed (about 0.7KB per frame) however long the server runs. The newest
+    frame overwrites the oldest once the buffer is full. Queries select
+    records by position or by time with index arithmetic and binary search,
+    and copy only the records they return.
+    """
+
+    def __init__(self, capacity: int = 30000):
+        """Allocate the buffer
+
+        Args:
+            capacity: Number of frames kept
+        """
+        if capacity < 1:
+            raise ValueError(f"History capacity must be positive, got {capacity}")
+        self.records = np.zeros(capacity, dtype=FRAME_DTYPE)
+        self.capacity = capacity
+        self.count = 0
+        self.head = 0  # Index the next frame is written to
+        self._lock = Lock()
+
+    def append(self, timestamp: float, hands: np.ndarray, pose: np.ndarray) -> None:
+        """Store a frame
+
+        Args:
+            timestamp: Arrival time in seconds since the epoch; frames are
+                expected in time order
+            hands: Array of shape (2, 27, 3), left then right hand
+            pose: Array of shape (2, 3), leftArm then rightArm
+        """
+        with self._lock:
+            record = self.records[self.head]
+            record['timestamp'] = timestamp
+            record['hands'] = hands
+            record['pose'] = pose
+            self.head = (self.head + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _take(self, start: int, stop: int, stride: int = 1) -> np.ndarray:
+        """Copy records by position in time order (0 = oldest stored)"""
+        oldest = (self.head - self.count) % self.capacity
+        return self.records[(oldest + np.arange(start, stop, stride)) % self.capacity]
+
+    def _position(self, timestamp: float) -> int:
+        """First position in time order whose timestamp is at least ``timestamp``"""
+        oldest = (self.head - self.count) % self.capacity
+        # The stored frames are at most two sorted runs: [oldest:] and [:head]
+        if oldest + self.count <= self.capacity:
+            times = self.records['timestamp'][oldest:oldest + self.count]
+            return int(np.searchsorted(times, timestamp))
+        older = self.records['timestamp'][oldest:]
+        newer = self.records['timestamp'][:self.head]
+        position = int(np.searchsorted(older, timestamp))
+        if position < len(older):
+            return position
+        return len(older) + int(np.searchsorted(newer, timestamp))
+
+    def last(self, n: int, stride: int = 1) -> np.ndarray:
+        """Get the most recent frames
+
+        Args:
+            n: Maximum number of frames to cover, counting back from the newest
+            stride: Keep every stride-th of them, ending at the newest
+
+        Returns:
+            Structured array of up to ceil(n / stride) records, oldest first
+        """
+        with self._lock:
+            n = max(0, min(n, self.count))
+            start = self.count - 1 - ((n - 1) // stride) * stride if n else self.count
+            return self._take(start, self.count, stride)
+
+    def between(self, start: Optional[float] = None, end: Optional[float] = None,
+                stride: int = 1) -> np.ndarray:
+        """Get the frames in a time range
+
+        Args:
+            start: Earliest timestamp (inclusive), default the oldest frame
+            end: Latest timestamp (exclusive), default after the newest frame
+            stride: Keep every stride-th frame of the range
+
+        Returns:
+            Structured array of records, oldest first
+        """
+        with self._lock:
+            first = self._position(start) if start is not None else 0
+            stop = self._position(end) if end is not None else self.count
+            return self._take(first, max(first, stop), stride)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the buffer size, fill and time span"""
+        with self._lock:
+            oldest = self._take(0, 1)['timestamp'] if self.count else None
+            newest = self._take(self.count - 1, self.count)['timestamp'] if self.count else None
+            return {
+                'capacity': self.capacity,
+                'frames': self.count,
+                'memory_bytes': self.records.nbytes,
+                'oldest': float(oldest[0]) if oldest is not None else None,
+                'newest': float(newest[0]) if newest is not None else None
+            }
+
+    @staticmethod
+    def to_dicts(records: np.ndarray, joints: bool = False) -> List[Dict[str, Any]]:
+        """Convert records to JSON-ready dictionaries
+
+        Args:
+            records: Records returned by a query
+            joints: Whether to include each hand's joints ({name: [x, y, z]},
+                tracked joints only), which is most of the size
+
+        Returns:
+            List of {'timestamp', 'time', 'pose'[, 'hands']} dictionaries
+        """
+        entries = []
+        for record in records:
+            pose = {arm: dict(zip('xyz', record['pose'][index].tolist()))
+                    for index, arm in enumerate(ARMS) if not np.isnan(record['pose'][index, 0])}
+            entry = {
+                'timestamp': float(record['timestamp']),
+                'time': datetime.fromtimestamp(record['timestamp']).isoformat(),
+                'pose': pose
+            }
+            if joints:
+                entry['hands'] = {
+                    hand: {JOINT_NAMES[joint]: record['hands'][index, joint].tolist()
+                           for joint in np.flatnonzero(~np.isnan(record['hands'][index, :, 0]))}
+                    for index, hand in enumerate(HANDS)
+                }
+            entries.append(entry)
+        return entries
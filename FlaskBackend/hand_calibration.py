@@ -1,9 +1,11 @@
 import numpy as np
-from scipy.spatial.transform import Rotation
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List, Optional
 import json
 import os
-import pykos
+import time
+from threading import Event, Lock, Thread
+from calibration_estimator import OnlineCalibrationEstimator, as_point_array, fit_ransac
+from hand_frame import HandFrame
 
 # Mapping of joint names to IDs (copied from test_movement.py)
 ACTUATOR_NAME_TO_ID = {
@@ -17,6 +19,71 @@ ACTUATOR_NAME_TO_ID = {
     "right_gripper": 24,
 }
 
+# Left arm actuators used for calibration: shoulder yaw, shoulder pitch, elbow
+ARM_ACTUATOR_IDS = [11, 12, 13]
+
+class CalibrationSnapshot:
+    """Immutable calibration published by HandCalibration
+
+    A snapshot is never modified after it is built (its arrays are read-only),
+    so request threads can read ``HandCalibration.snapshot`` once and use it
+    for a whole request without locks while a reload publishes a new one.
+    """
+
+    __slots__ = ('transform_matrix', 'scale_factors', 'offset', 'affine', 'version', 'source', 'loaded_at')
+
+    def __init__(self, transform_matrix, scale_factors, offset, version: int,
+                 source: Optional[str] = None):
+        """Validate the calibration and precompute its affine transform
+        
+        VR points map to robot space as R @ (p * scale) + offset, which is
+        folded into a single 4x4 affine matrix here so transforms do not
+        rebuild it per point.
+        
+        Args:
+            transform_matrix: 3x3 rotation matrix R
+            scale_factors: Per-axis scale applied before the rotation
+            offset: Translation applied after the rotation
+            version: Version number, increasing with every published calibration
+            source: File the calibration was loaded from, if any
+        """
+        transform_matrix = np.array(transform_matrix, dtype=float)
+        scale_factors = np.array(scale_factors, dtype=float)
+        offset = np.array(offset, dtype=float)
+        if transform_matrix.shape != (3, 3) or scale_factors.shape != (3,) or offset.shape != (3,):
+            raise ValueError("Calibration needs a 3x3 transform matrix and 3-element scale factors and offset")
+        if not (np.isfinite(transform_matrix).all() and np.isfinite(scale_factors).all()
+                and np.isfinite(offset).all()):
+            raise ValueError("Calibration contains non-finite values")
+        if not np.allclose(transform_matrix @ transform_matrix.T, np.eye(3), atol=1e-6):
+            raise ValueError("Calibration transform matrix is not a rotation")
+        
+        affine = np.eye(4)
+        affine[:3, :3] = transform_matrix * scale_factors
+        affine[:3, 3] = offset
+        for array in (transform_matrix, scale_factors, offset, affine):
+            array.setflags(write=False)
+        
+        self.transform_matrix = transform_matrix
+        self.scale_factors = scale_factors
+        self.offset = offset
+        self.affine = affine
+        self.version = version
+        self.source = source
+        self.loaded_at = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary of the snapshot for status responses"""
+        return {
+            'version': self.version,
+            'source': self.source,
+            'loaded_at': self.loaded_at,
+            'transform_matrix': self.transform_matrix.tolist(),
+            'scale_factors': self.scale_factors.tolist(),
+            'offset': self.offset.tolist()
+        }
+
+
 class HandCalibration:
     def __init__(self, calibration_file: str = 'calibration.json', robot_ip: str = '192.168.42.1', connect_robot: bool = False):
         """Initialize calibration system
@@ -27,9 +94,15 @@ class HandCalibration:
             connect_robot: Whether to connect to the robot immediately
         """
         self.calibration_file = calibration_file
-        self.transform_matrix = None
-        self.scale_factors = None
-        self.offset = None
+        # Current CalibrationSnapshot, or None before calibration. Readers take
+        # it without locking; writers replace it under _publish_lock.
+        self.snapshot = None
+        self._publish_lock = Lock()
+        self._file_mtime = None
+        self._watcher = None
+        self._stop_watching = Event()
+        self.estimator = OnlineCalibrationEstimator()  # Running fit for add_correspondences
+        self._arm = None  # ArmKinematics, see the arm property
         self.robot_ip = robot_ip
         self.kos = None
         
@@ -48,6 +121,8 @@ class HandCalibration:
             return True
             
         try:
+            # Imported here so IK without a robot does not load the gRPC stack
+            import pykos
             self.kos = pykos.KOS(ip=self.robot_ip)
             self.setup_robot()
             return True
@@ -61,7 +136,7 @@ class HandCalibration:
             raise RuntimeError("Robot not connected. Call connect_robot() first.")
             
         # Configure left arm actuators
-        for actuator_id in [11, 12, 13]:  # left arm actuators
+        for actuator_id in ARM_ACTUATOR_IDS:
             self.kos.actuator.configure_actuator(
                 actuator_id=actuator_id,
                 torque_enabled=True,
@@ -69,96 +144,264 @@ class HandCalibration:
                 kd=10
             )
     
-    def get_robot_position(self) -> Dict[str, float]:
-        """Get current robot arm position from servo feedback
+    def read_joint_positions(self) -> np.ndarray:
+        """Read the arm joint positions from servo feedback
         
         Returns:
-            Dictionary with x,y,z coordinates calculated from joint positions
+            Array of the ARM_ACTUATOR_IDS joint positions, in that order
         """
         if self.kos is None:
             raise RuntimeError("Robot not connected. Call connect_robot() first.")
             
-        # Get current joint positions
-        actuator_ids = [11, 12, 13]  # left arm actuators
-        states = self.kos.actuator.get_actuators_state(actuator_ids)
-        
-        # TODO: Implement forward kinematics to convert joint angles to x,y,z position
-        # This is a simplified placeholder - you'll need to implement proper forward kinematics
+        states = self.kos.actuator.get_actuators_state(ARM_ACTUATOR_IDS)
         positions = {state.actuator_id: state.position for state in states.states}
+        return np.array([positions[actuator_id] for actuator_id in ARM_ACTUATOR_IDS], dtype=float)
+    
+    @property
+    def arm(self) -> 'ArmKinematics':
+        """Forward kinematics of the calibrated arm, built on first use"""
+        if self._arm is None:
+            # Imported here so calibration without a robot does not load ikpy
+            from arm_kinematics import ArmKinematics
+            self._arm = ArmKinematics()
+        return self._arm
+    
+    @arm.setter
+    def arm(self, arm: 'ArmKinematics') -> None:
+        self._arm = arm
+    
+    def joints_to_positions(self, joints: np.ndarray) -> np.ndarray:
+        """Convert arm joint positions to x,y,z gripper positions
         
-        # Simplified conversion - replace with actual forward kinematics
-        x = positions[11] * 0.3  # shoulder yaw contribution
-        y = positions[12] * 0.3  # shoulder pitch contribution
-        z = positions[13] * 0.3  # elbow contribution
+        Args:
+            joints: Array of shape (..., 3) with shoulder yaw, shoulder pitch and elbow,
+                e.g. a whole recording of actuator readings
+            
+        Returns:
+            Array of shape (..., 3) with x,y,z positions
+        """
+        return self.arm.positions(joints)
+    
+    def get_robot_position(self) -> Dict[str, float]:
+        """Get current robot arm position from servo feedback
+        
+        Returns:
+            Dictionary with x,y,z coordinates calculated from joint positions
+        """
+        x, y, z = self.joints_to_positions(self.read_joint_positions())
         
-        return {'x': x, 'y': y, 'z': z}
+        return {'x': float(x), 'y': float(y), 'z': float(z)}
+    
+    @property
+    def transform_matrix(self) -> Optional[np.ndarray]:
+        return self.snapshot.transform_matrix if self.snapshot is not None else None
+
+    @property
+    def scale_factors(self) -> Optional[np.ndarray]:
+        return self.snapshot.scale_factors if self.snapshot is not None else None
+
+    @property
+    def offset(self) -> Optional[np.ndarray]:
+        return self.snapshot.offset if self.snapshot is not None else None
+
+    @property
+    def affine(self) -> Optional[np.ndarray]:
+        return self.snapshot.affine if self.snapshot is not None else None
+
+    @property
+    def version(self) -> Optional[int]:
+        """Version of the current calibration, or None before calibration"""
+        return self.snapshot.version if self.snapshot is not None else None
     
     def load_calibration(self) -> None:
         """Load calibration data from file if it exists"""
         if os.path.exists(self.calibration_file):
-            with open(self.calibration_file, 'r') as f:
+            self.reload_calibration()
+    
+    def reload_calibration(self) -> CalibrationSnapshot:
+        """Parse and validate the calibration file, then publish it
+        
+        The current calibration stays in use if the file is missing or invalid.
+        
+        Returns:
+            The newly published snapshot
+            
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file does not hold a valid calibration
+        """
+        mtime = os.path.getmtime(self.calibration_file)
+        with open(self.calibration_file, 'r') as f:
+            try:
                 data = json.load(f)
-                self.transform_matrix = np.array(data['transform_matrix'])
-                self.scale_factors = np.array(data['scale_factors'])
-                self.offset = np.array(data['offset'])
+                values = (data['transform_matrix'], data['scale_factors'], data['offset'])
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                raise ValueError(f"Invalid calibration file {self.calibration_file}: {e}")
+        snapshot = self.set_calibration(*values, source=self.calibration_file)
+        self._file_mtime = mtime
+        return snapshot
+    
+    def set_calibration(self, transform_matrix, scale_factors, offset,
+                        source: Optional[str] = None) -> CalibrationSnapshot:
+        """Validate a calibration and publish it as a new snapshot
+        
+        Args:
+            transform_matrix: 3x3 rotation matrix R
+            scale_factors: Per-axis scale applied before the rotation
+            offset: Translation applied after the rotation
+            source: File the calibration was loaded from, if any
+            
+        Returns:
+            The newly published snapshot
+        """
+        with self._publish_lock:
+            version = self.snapshot.version + 1 if self.snapshot is not None else 1
+            snapshot = CalibrationSnapshot(transform_matrix, scale_factors, offset, version, source)
+            self.snapshot = snapshot
+        return snapshot
+    
+    def watch(self, interval: float = 1.0) -> None:
+        """Reload the calibration file in a background thread whenever it changes
+        
+        Args:
+            interval: Seconds between checks of the file's modification time
+        """
+        if self._watcher is not None:
+            return
+        self._stop_watching.clear()
+        self._watcher = Thread(target=self._watch, args=(interval,), daemon=True)
+        self._watcher.start()
+    
+    def stop_watching(self) -> None:
+        """Stop the background file watcher"""
+        if self._watcher is not None:
+            self._stop_watching.set()
+            self._watcher.join()
+            self._watcher = None
+    
+    def _watch(self, interval: float) -> None:
+        """Watcher loop; a bad file is reported and the old calibration kept"""
+        while not self._stop_watching.wait(interval):
+            try:
+                mtime = os.path.getmtime(self.calibration_file)
+            except OSError:
+                continue
+            if mtime == self._file_mtime:
+                continue
+            try:
+                snapshot = self.reload_calibration()
+                print(f"Calibration reloaded from {self.calibration_file} (version {snapshot.version})")
+            except (OSError, ValueError) as e:
+                self._file_mtime = mtime  # Don't retry until the file changes again
+                print(f"Warning: Could not reload calibration: {e}")
     
     def save_calibration(self) -> None:
         """Save calibration data to file"""
+        snapshot = self.snapshot
         data = {
-            'transform_matrix': self.transform_matrix.tolist(),
-            'scale_factors': self.scale_factors.tolist(),
-            'offset': self.offset.tolist()
+            'transform_matrix': snapshot.transform_matrix.tolist(),
+            'scale_factors': snapshot.scale_factors.tolist(),
+            'offset': snapshot.offset.tolist()
         }
         with open(self.calibration_file, 'w') as f:
             json.dump(data, f, indent=2)
+        # Already published, so the watcher need not reload our own write
+        self._file_mtime = os.path.getmtime(self.calibration_file)
     
-    def calibrate(self, vr_points: List[Dict[str, float]]) -> None:
+    def calibrate(self, vr_points: List[Dict[str, float]],
+                  robot_points: Optional[List[Dict[str, float]]] = None) -> None:
         """Perform calibration using VR points and current robot positions
         
         Args:
             vr_points: List of points from VR space
+            robot_points: Corresponding robot points; if omitted, the robot is
+                moved to each pose by hand and read from servo feedback
         """
-        # Get corresponding robot points from servo feedback
-        robot_points = []
-        for _ in vr_points:
-            # Prompt user to move robot to corresponding position
-            input("Move robot to corresponding position and press Enter...")
-            robot_points.append(self.get_robot_position())
+        if robot_points is None:
+            # Get corresponding robot points from servo feedback
+            robot_points = []
+            for _ in vr_points:
+                # Prompt user to move robot to corresponding position
+                input("Move robot to corresponding position and press Enter...")
+                robot_points.append(self.get_robot_position())
         
-        # Convert points to numpy arrays
-        vr_array = np.array([[p['x'], p['y'], p['z']] for p in vr_points])
-        robot_array = np.array([[p['x'], p['y'], p['z']] for p in robot_points])
-        
-        # Calculate centroid and centered coordinates
-        vr_centroid = np.mean(vr_array, axis=0)
-        robot_centroid = np.mean(robot_array, axis=0)
+        self.calibrate_from_pairs(vr_points, robot_points)
+    
+    def calibrate_from_pairs(self, vr_points, robot_points, robust: bool = False,
+                             threshold: float = 0.01, iterations: int = 256,
+                             seed: Optional[int] = None, save: bool = True) -> Dict[str, Any]:
+        """Calibrate from corresponding VR and robot points and publish the result
         
-        vr_centered = vr_array - vr_centroid
-        robot_centered = robot_array - robot_centroid
+        Args:
+            vr_points: Points in VR space (dicts or an (N, 3) array)
+            robot_points: The matching points in robot space
+            robust: Fit with RANSAC, ignoring pairs further than threshold from the fit
+            threshold: RANSAC inlier distance in robot space units
+            iterations: Number of RANSAC hypotheses
+            seed: Optional RANSAC random seed
+            save: Whether to write the calibration file
+            
+        Returns:
+            Dictionary with the published 'version', the number of 'pairs',
+            the number of 'inliers' used by the fit and, for robust fits, the
+            boolean 'inlier_mask'
+        """
+        if robust:
+            fit = fit_ransac(vr_points, robot_points, threshold=threshold,
+                             iterations=iterations, seed=seed)
+            R, scale_factors, offset = fit['transform_matrix'], fit['scale_factors'], fit['offset']
+            inlier_mask = fit['inliers']
+            inliers = int(inlier_mask.sum())
+        else:
+            estimator = OnlineCalibrationEstimator()
+            estimator.add_batch(vr_points, robot_points)
+            R, scale_factors, offset = estimator.solve()
+            inlier_mask = None
+            inliers = estimator.count
         
-        # Calculate scale factors
-        vr_scale = np.std(vr_centered, axis=0)
-        robot_scale = np.std(robot_centered, axis=0)
-        self.scale_factors = robot_scale / vr_scale
+        snapshot = self.set_calibration(R, scale_factors, offset)
         
-        # Scale VR points
-        vr_scaled = vr_centered * self.scale_factors
+        # Save calibration data
+        if save:
+            self.save_calibration()
+        return {'version': snapshot.version, 'pairs': len(vr_points), 'inliers': inliers,
+                'inlier_mask': inlier_mask}
+    
+    def add_correspondences(self, vr_points, robot_points, publish: bool = True) -> Optional[CalibrationSnapshot]:
+        """Feed streamed correspondences into the running calibration estimate
         
-        # Calculate rotation matrix using SVD
-        H = vr_scaled.T @ robot_centered
-        U, _, Vt = np.linalg.svd(H)
-        R = Vt.T @ U.T
+        Each pair updates the running statistics in O(1), so calibration can
+        converge from continuous data instead of a few manual poses.
         
-        # Ensure right-handed coordinate system
-        if np.linalg.det(R) < 0:
-            Vt[-1, :] *= -1
-            R = Vt.T @ U.T
+        Args:
+            vr_points: New points in VR space (dicts or an (N, 3) array)
+            robot_points: The matching points in robot space
+            publish: Whether to publish the updated fit as a new snapshot
+            
+        Returns:
+            The published snapshot, or None if not published (or too few pairs yet)
+        """
+        self.estimator.add_batch(vr_points, robot_points)
+        if not publish or self.estimator.count < 4:
+            return None
+        return self.set_calibration(*self.estimator.solve())
+    
+    def transform_points(self, points: np.ndarray,
+                         snapshot: Optional[CalibrationSnapshot] = None) -> np.ndarray:
+        """Transform an array of points from VR space to robot space
         
-        self.transform_matrix = R
-        self.offset = robot_centroid - (R @ (vr_centroid * self.scale_factors))
+        Args:
+            points: Array of shape (..., 3), e.g. (N, 3) points or (F, J, 3) frames
+            snapshot: Calibration to use, default the current one
+            
+        Returns:
+            New array of the same shape in robot space
+        """
+        snapshot = snapshot if snapshot is not None else self.snapshot
+        if snapshot is None:
+            raise ValueError("Calibration not performed yet")
         
-        # Save calibration data
-        self.save_calibration()
+        return np.asarray(points, dtype=float) @ snapshot.affine[:3, :3].T + snapshot.affine[:3, 3]
     
     def transform_point(self, point: Dict[str, float]) -> Dict[str, float]:
         """Transform a point from VR space to robot space
@@ -169,19 +412,9 @@ class HandCalibration:
         Returns:
             Transformed point in robot space
         """
-        if self.transform_matrix is None:
-            raise ValueError("Calibration not performed yet")
-        
-        # Convert to numpy array and apply transformation
-        p = np.array([point['x'], point['y'], point['z']])
-        p_scaled = p * self.scale_factors
-        p_transformed = self.transform_matrix @ p_scaled + self.offset
+        x, y, z = self.transform_points([point['x'], point['y'], point['z']])
         
-        return {
-            'x': float(p_transformed[0]),
-            'y': float(p_transformed[1]),
-            'z': float(p_transformed[2])
-        }
+        return {'x': float(x), 'y': float(y), 'z': float(z)}
     
     def transform_hand_data(self, hand_data: Dict) -> Dict:
         """Transform all points in hand data from VR space to robot space
@@ -190,16 +423,30 @@ class HandCalibration:
             hand_data: Hand data dictionary with points
             
         Returns:
-            Transformed hand data
+            Transformed hand data with new point dictionaries; the input is unchanged
         """
-        transformed_data = hand_data.copy()
-        
-        # Transform each point in the hand data
-        for point in transformed_data['points']:
-            transformed_point = self.transform_point(point)
-            point.update(transformed_point)
+        points = hand_data['points']
+        positions = np.array([[p['x'], p['y'], p['z']] for p in points], dtype=float).reshape(-1, 3)
+        transformed = self.transform_points(positions).tolist()
         
+        transformed_data = hand_data.copy()
+        transformed_data['points'] = [
+            {**point, 'x': x, 'y': y, 'z': z} for point, (x, y, z) in zip(points, transformed)
+        ]
         return transformed_data
+
+    def transform_frame(self, frame: HandFrame,
+                        snapshot: Optional[CalibrationSnapshot] = None) -> HandFrame:
+        """Transform every joint of a hand frame from VR space to robot space
+
+        Args:
+            frame: Hand frame in VR space
+            snapshot: Calibration to use, default the current one
+
+        Returns:
+            New hand frame in robot space; the input is unchanged
+        """
+        return frame.with_positions(self.transform_points(frame.positions, snapshot))
     
     def get_calibration_poses(self) -> List[Dict[str, float]]:
         """Get list of recommended calibration poses
@@ -216,30 +463,21 @@ class HandCalibration:
             {'name': 'Down Max', 'description': 'Hand at lowest position'},
         ]
     
-    def check_calibration_quality(self, 
-                                vr_points: List[Dict[str, float]], 
-                                robot_points: List[Dict[str, float]]) -> Dict[str, float]:
+    def check_calibration_quality(self, vr_points, robot_points) -> Dict[str, float]:
         """Check the quality of calibration
         
         Args:
-            vr_points: Original VR points
+            vr_points: Original VR points (dicts or an (N, 3) array)
             robot_points: Corresponding robot points
             
         Returns:
             Dictionary with error metrics
         """
-        if self.transform_matrix is None:
-            raise ValueError("Calibration not performed yet")
-        
-        errors = []
-        for vr_p, robot_p in zip(vr_points, robot_points):
-            transformed_p = self.transform_point(vr_p)
-            error = np.sqrt(sum((transformed_p[k] - robot_p[k])**2 
-                              for k in ['x', 'y', 'z']))
-            errors.append(error)
+        errors = np.linalg.norm(
+            self.transform_points(as_point_array(vr_points)) - as_point_array(robot_points), axis=1)
         
         return {
             'mean_error': float(np.mean(errors)),
             'max_error': float(np.max(errors)),
             'std_error': float(np.std(errors))
-        } 
\ No newline at end of file
+        }
@@ -0,0 +1,215 @@
+import numpy as np
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# Canonical joint order; every HandFrame stores its points in this order
+JOINT_NAMES = [
+    "wrist", "forearmWrist", "forearmArm",
+    "thumbKnuckle", "thumbIntermediateBase", "thumbIntermediateTip", "thumbTip",
+    "indexFingerMetacarpal", "indexFingerKnuckle", "indexFingerIntermediateBase",
+    "indexFingerIntermediateTip", "indexFingerTip",
+    "middleFingerMetacarpal", "middleFingerKnuckle", "middleFingerIntermediateBase",
+    "middleFingerIntermediateTip", "middleFingerTip",
+    "ringFingerMetacarpal", "ringFingerKnuckle", "ringFingerIntermediateBase",
+    "ringFingerIntermediateTip", "ringFingerTip",
+    "littleFingerMetacarpal", "littleFingerKnuckle", "littleFingerIntermediateBase",
+    "littleFingerIntermediateTip", "littleFingerTip"
+]
+N_JOINTS = len(JOINT_NAMES)
+
+# Headsets send either 'indexFingerTip' or 'handIndexFingerTip'
+PREFIXED_NAMES = ['hand' + name[0].upper() + name[1:] for name in JOINT_NAMES]
+
+# Joint name (either variant) -> (index, uses the 'hand' prefix)
+JOINT_INDEX = {name: (index, False) for index, name in enumerate(JOINT_NAMES)}
+JOINT_INDEX.update({name: (index, True) for index, name in enumerate(PREFIXED_NAMES)})
+
+# Joint name stem of each finger, as used in the joint names
+FINGER_PREFIXES = {
+    'thumb': 'thumb',
+    'index': 'indexFinger',
+    'middle': 'middleFinger',
+    'ring': 'ringFinger',
+    'little': 'littleFinger'
+}
+
+# Indices of each finger's joints, from the hand outwards
+FINGER_JOINTS = {
+    finger: np.array([index for index, name in enumerate(JOINT_NAMES) if name.startswith(prefix)])
+    for finger, prefix in FINGER_PREFIXES.items()
+}
+
+
+def joint_index(name: str) -> Optional[int]:
+    """Get the schema index of a joint name in either naming variant
+
+    Args:
+        name: Joint name, e.g. 'indexFingerTip' or 'handIndexFingerTip'
+
+    Returns:
+        Index into HandFrame.positions, or None for unknown names
+    """
+    entry = JOINT_INDEX.get(name)
+    return entry[0] if entry is not None else None
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """Convert a frame 'timestamp' to seconds since the epoch
+
+    Args:
+        value: Seconds as a number, or an ISO 8601 string such as
+            '2025-01-18T18:30:00.125Z'
+
+    Returns:
+        Seconds since the epoch, or None if the value is missing or unreadable
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+class HandFrame:
+    """One hand's tracked points as a single (27, 3) array
+
+    The JSON payload is parsed once into ``positions`` in the JOINT_NAMES
+    order. Missing joints are NaN, and ``present`` records which joints were
+    sent. Every later stage indexes the array instead of re-scanning the list
+    of point dicts. ``prefixed`` remembers which naming variant each joint
+    arrived with, so names and point dicts can be reproduced exactly. Points
+    with names outside the schema are kept unchanged in ``extra``.
+    """
+
+    __slots__ = ('positions', 'present', 'prefixed', 'ids', 'extra', 'hand_id', 'timestamp')
+
+    def __init__(self, positions: np.ndarray, present: np.ndarray, prefixed: np.ndarray,
+                 ids: Optional[List[Any]] = None, extra: Optional[List[Dict[str, Any]]] = None,
+                 hand_id: Optional[str] = None, timestamp: Optional[float] = None):
+        """Wrap already parsed arrays
+
+        Args:
+            positions: Array of shape (27, 3), NaN for missing joints
+            present: Boolean mask of shape (27,)
+            prefixed: Boolean mask of shape (27,), True for 'hand'-prefixed names
+            ids: Optional original point id per joint
+            extra: Point dicts whose names are not in the schema
+            hand_id: Identifier for the hand (left/right)
+            timestamp: Optional frame timestamp
+        """
+        self.positions = positions
+        self.present = present
+        self.prefixed = prefixed
+        self.ids = ids if ids is not None else [None] * N_JOINTS
+        self.extra = extra if extra is not None else []
+        self.hand_id = hand_id
+        self.timestamp = timestamp
+
+    @classmethod
+    def from_points(cls, points: List[Dict[str, Any]], hand_id: Optional[str] = None,
+                    timestamp: Optional[float] = None) -> 'HandFrame':
+        """Parse a list of point dicts
+
+        Args:
+            points: Points with 'name', 'x', 'y', 'z' and optionally 'id'
+            hand_id: Identifier for the hand (left/right)
+            timestamp: Optional frame timestamp
+
+        Returns:
+            HandFrame holding the points
+        """
+        positions = np.full((N_JOINTS, 3), np.nan)
+        present = np.zeros(N_JOINTS, dtype=bool)
+        prefixed = np.zeros(N_JOINTS, dtype=bool)
+        ids = [None] * N_JOINTS
+        extra = []
+        for point in points:
+            entry = JOINT_INDEX.get(point['name'])
+            if entry is None:
+                extra.append(point)
+                continue
+            index, is_prefixed = entry
+            positions[index] = (point['x'], point['y'], point['z'])
+            present[index] = True
+            prefixed[index] = is_prefixed
+            ids[index] = point.get('id')
+        return cls(positions, present, prefixed, ids, extra, hand_id, timestamp)
+
+    @classmethod
+    def from_hand_data(cls, hand_data: Any, hand_id: Optional[str] = None,
+                       timestamp: Optional[float] = None) -> 'HandFrame':
+        """Convert a hand payload ({"points": [...]}) unless it already is a HandFrame
+
+        Args:
+            hand_data: Hand data dictionary or HandFrame
+            hand_id: Identifier for the hand (left/right), if not already set
+            timestamp: Optional frame timestamp, if not already set
+
+        Returns:
+            HandFrame for the hand
+        """
+        if isinstance(hand_data, HandFrame):
+            return hand_data
+        return cls.from_points(hand_data.get('points', []), hand_id=hand_id, timestamp=timestamp)
+
+    def with_positions(self, positions: np.ndarray) -> 'HandFrame':
+        """Return a new frame with the same joints at new positions"""
+        return HandFrame(positions, self.present, self.prefixed, self.ids, self.extra,
+                         self.hand_id, self.timestamp)
+
+    def name(self, index: int) -> str:
+        """Get a joint's name in the variant it arrived with"""
+        return PREFIXED_NAMES[index] if self.prefixed[index] else JOINT_NAMES[index]
+
+    def get(self, name: str) -> Optional[np.ndarray]:
+        """Get a joint position by name (either variant)
+
+        Args:
+            name: Joint name
+
+        Returns:
+            Position array [x, y, z], or None if the joint is missing
+        """
+        index = joint_index(name)
+        if index is None or not self.present[index]:
+            return None
+        return self.positions[index]
+
+    def finger_positions(self, finger_name: str) -> np.ndarray:
+        """Get the tracked joints of a finger, from the hand outwards
+
+        Args:
+            finger_name: One of 'thumb', 'index', 'middle', 'ring', 'little'
+
+        Returns:
+            Array of shape (k, 3) with the k joints that are present
+        """
+        indices = FINGER_JOINTS[finger_name]
+        return self.positions[indices[self.present[indices]]]
+
+    def point_names(self) -> List[str]:
+        """Names of all points in the frame, as they were sent"""
+        return [self.name(index) for index in np.flatnonzero(self.present)] + [
+            point['name'] for point in self.extra]
+
+    def to_points(self) -> List[Dict[str, Any]]:
+        """Convert back to a list of point dicts
+
+        Returns:
+            Point dicts in schema order (with their original names and ids),
+            followed by the points outside the schema
+        """
+        points = []
+        for index in np.flatnonzero(self.present):
+            x, y, z = self.positions[index]
+            point = {'name': self.name(index), 'x': float(x), 'y': float(y), 'z': float(z)}
+            if self.ids[index] is not None:
+                point = {'id': self.ids[index], **point}
+            points.append(point)
+        return points + [dict(point) for point in self.extra]
+
+    def __len__(self) -> int:
+        return int(self.present.sum()) + len(self.extra)
@@ -1,24 +1,63 @@
 from ikpy.chain import Chain
 from ikpy.link import OriginLink, URDFLink
 import numpy as np
-import matplotlib
-# Use Agg backend (non-GUI)
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import itertools
 import os
+import threading
 from datetime import datetime
-from hand_calibration import HandCalibration
+from hand_calibration import CalibrationSnapshot, HandCalibration
+from hand_frame import HandFrame, FINGER_PREFIXES
+from analytic_ik import AnalyticFingerSolver
+from ik_warm_start import WarmStartStore
+from ik_cache import IKCache
+from ik_workspace import WorkspaceTable
+from batch_fk import BatchFK
+from pose_fit import BatchPoseFitter
+
+# Per-process solver used by the process pool workers
+_worker_ik = None
+
+
+def _init_worker(ik_solver: str, workspace_file: str) -> None:
+    """Build the finger chains and solvers once in each pool worker"""
+    global _worker_ik
+    _worker_ik = HandIK(ik_solver=ik_solver, warm_start=False, cache_size=0,
+                        workspace_file=workspace_file)
+
+
+def _compute_in_worker(finger_name: str, target: List[float], initial_position: np.ndarray) -> tuple:
+    """Solve one finger in a pool worker"""
+    return _worker_ik._compute_ik(finger_name, target, initial_position)
+
 
 class HandIK:
-    def __init__(self, calibration_file: str = 'calibration.json', connect_robot: bool = False):
+    def __init__(self, calibration_file: str = 'calibration.json', connect_robot: bool = False,
+                 ik_solver: str = 'analytic', warm_start: bool = True,
+                 cache_size: int = 4096, cache_step: float = 0.001,
+                 workspace_file: str = None, plot_quality: str = 'high',
+                 fit_mode: str = 'tip'):
         """Initialize the IK chains for fingers
         
         Args:
             calibration_file: Path to calibration data file
             connect_robot: Whether to connect to robot immediately
+            ik_solver: 'analytic' to use the analytic finger solver where the
+                chain supports it, 'workspace' to start it from the precomputed
+                workspace table, 'ikpy' to always use the iterative solver
+            warm_start: Whether to start each finger's solve from the previous
+                frame's solution for the same hand
+            cache_size: Maximum number of cached IK solutions (0 disables the cache)
+            cache_step: Target quantisation step (m) for the IK cache
+            workspace_file: Optional workspace table built by ik_workspace.py
+            plot_quality: Plot DPI preset, one of hand_plot.DPI_PRESETS
+            fit_mode: 'tip' to solve each finger for its tip only, 'full_pose' to
+                fit the tracked intermediate joint and tip of all fingers in one
+                batched solve
         """
+        if fit_mode not in ('tip', 'full_pose'):
+            raise ValueError(f"Unknown fit mode: {fit_mode}")
         self.fingers = {
             'thumb': self._create_thumb_chain(),
             'index': self._create_finger_chain('index'),
@@ -27,6 +66,36 @@ class HandIK:
             'little': self._create_finger_chain('little')
         }
         
+        # Analytic solvers for the chains that support them; others fall back to ikpy
+        self.ik_solver = ik_solver
+        self.analytic_solvers = {
+            name: AnalyticFingerSolver(chain)
+            for name, chain in self.fingers.items()
+            if AnalyticFingerSolver.supports(chain)
+        }
+        # Batched full-pose fitting over the analytic chains
+        self.fit_mode = fit_mode
+        self.pose_fitter = BatchPoseFitter(self.analytic_solvers)
+        # Vectorised forward kinematics for every chain
+        self.fk = {name: BatchFK(chain) for name, chain in self.fingers.items()}
+        self.warm_start = WarmStartStore() if warm_start else None
+        self.cache = IKCache(cache_size, cache_step) if cache_size > 0 else None
+        self.workspace = WorkspaceTable.load(workspace_file) if workspace_file else None
+        self.workspace_file = workspace_file
+        
+        # Optional pool for solving fingers concurrently (see set_executor)
+        self.executor = None
+        self.executor_kind = None
+        
+        # Optional background queue; when set, plots are rendered off the request path
+        self.plot_queue = None
+        
+        # One persistent renderer per thread that draws plots (see _get_renderer)
+        self.plot_quality = plot_quality
+        self._renderers = threading.local()
+        # Numbers each plot, so plots saved within the same second keep separate files
+        self._plot_counter = itertools.count(1)
+        
         # Create plots directory if it doesn't exist
         os.makedirs('plots', exist_ok=True)
         
@@ -51,42 +120,254 @@ class HandIK:
         """Get recommended calibration poses"""
         return self.calibration.get_calibration_poses()
 
-    def _plot_finger_chain(self, chain: Chain, ik_solution: np.ndarray, ax: Axes3D, color: str = 'blue'):
-        """Plot only the finger segments without the extended lines
+    def set_executor(self, workers: int = 0, kind: str = 'thread') -> None:
+        """Configure parallel finger solving
+        
+        Args:
+            workers: Number of worker threads/processes (0 solves serially)
+            kind: 'thread' for a thread pool, 'process' for a process pool
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+        self.executor = None
+        self.executor_kind = kind
+        if workers <= 0:
+            return
+        if kind == 'process':
+            self.executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.ik_solver, self.workspace_file)
+            )
+        elif kind == 'thread':
+            self.executor = ThreadPoolExecutor(max_workers=workers)
+        else:
+            raise ValueError(f"Unknown executor kind: {kind}")
+
+    def load_workspace(self, workspace_file: str) -> None:
+        """Load a workspace table for the 'workspace' solver
+        
+        Args:
+            workspace_file: Table built by ik_workspace.py
+        """
+        self.workspace = WorkspaceTable.load(workspace_file)
+        self.workspace_file = workspace_file
+
+    def _lookup_ik(self, finger_name: str, target: List[float], hand_id: str = None) -> tuple:
+        """Check the cache and warm-start store before solving
+        
+        Args:
+            finger_name: Name of the finger chain
+            target: Tip target position [x, y, z]
+            hand_id: Identifier for the hand (left/right), used for warm starts
+            
+        Returns:
+            tuple: (cached solution or None, cache key, initial position)
+        """
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key((finger_name, self.ik_solver), target)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                if self.warm_start is not None:
+                    self.warm_start.record(hand_id, finger_name, target, cached)
+                return cached, cache_key, None
+        
+        initial_position = None
+        if self.warm_start is not None:
+            initial_position = self.warm_start.lookup(hand_id, finger_name, target)
+        return None, cache_key, initial_position
+
+    def _compute_ik(self, finger_name: str, target: List[float],
+                    initial_position: np.ndarray = None) -> tuple:
+        """Run the configured solver for one finger
+        
+        Args:
+            finger_name: Name of the finger chain
+            target: Tip target position [x, y, z]
+            initial_position: Optional joint vector to start from
+            
+        Returns:
+            tuple: (joint angles, solver iterations or None if not reported)
+        """
+        solver = self.analytic_solvers.get(finger_name) if self.ik_solver != 'ikpy' else None
+        use_workspace = (self.ik_solver == 'workspace' and self.workspace is not None
+                         and finger_name in self.workspace)
+        if solver is not None and use_workspace:
+            return self.workspace.solve_with_iterations(finger_name, solver, target, initial_position)
+        if solver is not None:
+            return solver.solve_with_iterations(target, initial_position)
+        ik_solution = self.fingers[finger_name].inverse_kinematics(
+            target, initial_position=initial_position)
+        return ik_solution, None
+
+    def _store_ik(self, finger_name: str, target: List[float], hand_id: str, cache_key: tuple,
+                  initial_position: np.ndarray, ik_solution: np.ndarray, iterations: int) -> None:
+        """Record a fresh solution in the warm-start store and the cache"""
+        if self.warm_start is not None:
+            self.warm_start.record(hand_id, finger_name, target, ik_solution,
+                                   iterations=iterations, warm=initial_position is not None)
+        if cache_key is not None:
+            self.cache.put(cache_key, ik_solution)
+
+    def _solve_ik(self, finger_name: str, target: List[float], hand_id: str = None) -> np.ndarray:
+        """Solve IK for one finger with the configured solver
+        
+        Args:
+            finger_name: Name of the finger chain
+            target: Tip target position [x, y, z]
+            hand_id: Identifier for the hand (left/right), used for warm starts
+            
+        Returns:
+            Joint angles in the layout returned by Chain.inverse_kinematics
+        """
+        cached, cache_key, initial_position = self._lookup_ik(finger_name, target, hand_id)
+        if cached is not None:
+            return cached
+        ik_solution, iterations = self._compute_ik(finger_name, target, initial_position)
+        self._store_ik(finger_name, target, hand_id, cache_key, initial_position, ik_solution, iterations)
+        return ik_solution
+
+    def _solve_fingers(self, jobs: List[tuple]) -> Dict[tuple, np.ndarray]:
+        """Solve many fingers, concurrently if an executor is configured
+        
+        Cache and warm-start bookkeeping stays in this process; only the
+        solver calls are handed to the executor.
         
         Args:
-            chain: IKPy chain object
-            ik_solution: Joint angles
-            ax: Matplotlib 3D axis
-            color: Color for the finger segments
+            jobs: List of (hand_id, finger_name, target)
+            
+        Returns:
+            Dictionary of (hand_id, finger_name) to joint angles
         """
-        # Get transformation matrices for each joint
-        transforms = chain.forward_kinematics(ik_solution, full_kinematics=True)
-        
-        # Extract joint positions
-        positions = []
-        for transform in transforms:
-            # Get the translation part of the transformation matrix
-            pos = transform[:3, 3]
-            positions.append(pos)
-        
-        # Convert to numpy array for easier manipulation
-        positions = np.array(positions)
-        
-        # Plot segments between joints
-        for i in range(len(positions) - 1):
-            ax.plot([positions[i][0], positions[i+1][0]],
-                   [positions[i][1], positions[i+1][1]],
-                   [positions[i][2], positions[i+1][2]],
-                   color=color, linewidth=2)
+        if self.executor is None:
+            return {(hand_id, finger_name): self._solve_ik(finger_name, target, hand_id=hand_id)
+                    for hand_id, finger_name, target in jobs}
+        
+        solutions = {}
+        pending = {}
+        for hand_id, finger_name, target in jobs:
+            cached, cache_key, initial_position = self._lookup_ik(finger_name, target, hand_id)
+            if cached is not None:
+                solutions[(hand_id, finger_name)] = cached
+                continue
+            if self.executor_kind == 'process':
+                future = self.executor.submit(_compute_in_worker, finger_name, target, initial_position)
+            else:
+                future = self.executor.submit(self._compute_ik, finger_name, target, initial_position)
+            pending[(hand_id, finger_name)] = (future, target, cache_key, initial_position)
+        
+        for (hand_id, finger_name), (future, target, cache_key, initial_position) in pending.items():
+            ik_solution, iterations = future.result()
+            self._store_ik(finger_name, target, hand_id, cache_key, initial_position, ik_solution, iterations)
+            solutions[(hand_id, finger_name)] = ik_solution
+        return solutions
+
+    def _fit_poses(self, jobs: List[tuple]) -> Dict[tuple, np.ndarray]:
+        """Fit many fingers to their tracked intermediate joints and tips in one batch
+        
+        Cache hits and warm starts are handled per finger as for tip IK; every
+        remaining finger goes into a single BatchPoseFitter call. Fingers the
+        fitter does not support are solved for their tip.
+        
+        Args:
+            jobs: List of (hand_id, finger_name, tip target, intermediate target or None)
             
-            # Plot joint as a small sphere
-            ax.scatter(positions[i][0], positions[i][1], positions[i][2],
-                      color=color, s=50)
+        Returns:
+            Dictionary of (hand_id, finger_name) to joint angles
+        """
+        solutions = {}
+        fallback = []
+        batch = []
+        for hand_id, finger_name, target, intermediate in jobs:
+            if finger_name not in self.pose_fitter:
+                fallback.append((hand_id, finger_name, target))
+                continue
+            pose = list(target) if intermediate is None else list(intermediate) + list(target)
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self.cache.key((finger_name, 'full_pose'), pose)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    if self.warm_start is not None:
+                        self.warm_start.record(hand_id, finger_name, target, cached)
+                    solutions[(hand_id, finger_name)] = cached
+                    continue
+            initial_position = None
+            if self.warm_start is not None:
+                initial_position = self.warm_start.lookup(hand_id, finger_name, target)
+            batch.append((hand_id, finger_name, target, intermediate, cache_key, initial_position))
         
-        # Plot last joint
-        ax.scatter(positions[-1][0], positions[-1][1], positions[-1][2],
-                  color=color, s=50)
+        if batch:
+            targets = np.array([
+                [intermediate if intermediate is not None else [np.nan] * 3, target]
+                for _, _, target, intermediate, _, _ in batch
+            ], dtype=float)
+            fitted, iterations = self.pose_fitter.fit(
+                [job[1] for job in batch], targets, [job[5] for job in batch])
+            for (hand_id, finger_name, target, _, cache_key, initial_position), ik_solution, steps in zip(
+                    batch, fitted, iterations):
+                self._store_ik(finger_name, target, hand_id, cache_key, initial_position,
+                               ik_solution, int(steps))
+                solutions[(hand_id, finger_name)] = ik_solution
+        
+        solutions.update(self._solve_fingers(fallback))
+        return solutions
+
+    def _intermediate_target(self, frame: HandFrame, finger_name: str) -> Optional[List[float]]:
+        """Get the tracked intermediate joint (end of the first segment) of a finger
+        
+        Args:
+            frame: Calibrated hand frame
+            finger_name: Name of the finger
+            
+        Returns:
+            Position [x, y, z], or None if the finger has no intermediate base point
+        """
+        position = frame.get(f"{FINGER_PREFIXES[finger_name]}IntermediateBase")
+        return position.tolist() if position is not None else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get IK solver counters
+        
+        Returns:
+            Dictionary with warm-start, cache and plot queue statistics
+        """
+        return {
+            'solver': self.ik_solver,
+            'fit_mode': self.fit_mode,
+            'warm_start': self.warm_start.get_stats() if self.warm_start is not None else None,
+            'cache': self.cache.get_stats() if self.cache is not None else None,
+            'plots': self.plot_queue.get_stats() if self.plot_queue is not None else None
+        }
+
+    def forward_kinematics(self, finger_name: str, joints: np.ndarray) -> np.ndarray:
+        """Get the joint positions of a finger chain for one or many configurations
+        
+        Args:
+            finger_name: Name of the finger chain
+            joints: Joint angles of shape (N, n_links), or (n_links,) for one configuration
+            
+        Returns:
+            Array of shape (N, n_links, 3), or (n_links, 3) for one configuration
+        """
+        return self.fk[finger_name].positions(joints)
+    
+    def _get_renderer(self) -> 'HandPlotRenderer':
+        """Get this thread's plot renderer, creating it on first use
+        
+        Each thread (the request thread or the plot queue worker) keeps its own
+        figure and canvas, since Agg figures must not be drawn concurrently.
+        A renderer is rebuilt when plot_quality changes.
+        """
+        renderer = getattr(self._renderers, 'renderer', None)
+        if renderer is None or self._renderers.quality != self.plot_quality:
+            # Imported on first plot so IK without --plot-ik never loads matplotlib
+            from hand_plot import HandPlotRenderer
+            renderer = HandPlotRenderer(self.plot_quality)
+            self._renderers.renderer = renderer
+            self._renderers.quality = self.plot_quality
+        return renderer
         
     def _create_thumb_chain(self) -> Chain:
         """Create IK chain for thumb with 4 joints"""
@@ -142,42 +423,33 @@ class HandIK:
             )
         ], active_links_mask=[False, True, True, True])  # Mark base as inactive
 
-    def _get_plot_limits(self, points_by_finger: Dict[str, List[Dict[str, Any]]]) -> tuple:
+    def _get_plot_limits(self, points_by_finger: Dict[str, np.ndarray]) -> tuple:
         """Calculate appropriate axis limits based on hand points
         
         Args:
-            points_by_finger: Dictionary of points organized by finger
+            points_by_finger: Dictionary of finger to tracked joint positions (k, 3)
             
         Returns:
             tuple: (min_x, max_x, min_y, max_y, min_z, max_z)
         """
-        all_points = []
-        for finger_points in points_by_finger.values():
-            all_points.extend(finger_points)
+        all_points = [np.reshape(points, (-1, 3)) for points in points_by_finger.values()]
+        all_points = np.concatenate(all_points) if all_points else np.zeros((0, 3))
         
-        if not all_points:
+        if not len(all_points):
             return (-0.1, 0.1, -0.1, 0.1, -0.1, 0.1)
         
         # Get min and max for each coordinate
-        x_coords = [p['x'] for p in all_points]
-        y_coords = [p['y'] for p in all_points]
-        z_coords = [p['z'] for p in all_points]
-        
-        # Calculate ranges
-        x_range = max(x_coords) - min(x_coords)
-        y_range = max(y_coords) - min(y_coords)
-        z_range = max(z_coords) - min(z_coords)
+        low = all_points.min(axis=0)
+        high = all_points.max(axis=0)
         
         # Add padding (20% of the range)
         padding = 0.2
-        x_pad = x_range * padding
-        y_pad = y_range * padding
-        z_pad = z_range * padding
+        pad = (high - low) * padding
         
         return (
-            min(x_coords) - x_pad, max(x_coords) + x_pad,
-            min(y_coords) - y_pad, max(y_coords) + y_pad,
-            min(z_coords) - z_pad, max(z_coords) + z_pad
+            float(low[0] - pad[0]), float(high[0] + pad[0]),
+            float(low[1] - pad[1]), float(high[1] + pad[1]),
+            float(low[2] - pad[2]), float(high[2] + pad[2])
         )
     
     def process_hand(self, hand_data: Dict[str, Any], plot: bool = False, 
@@ -186,153 +458,145 @@ class HandIK:
         """Process hand data and optionally plot it
         
         Args:
-            hand_data: Dictionary containing hand points
+            hand_data: Dictionary containing hand points, or a HandFrame
             plot: Whether to save plot to file
             hand_id: Identifier for the hand (left/right)
             source_file: Name of the source JSON file
             apply_calibration: Whether to apply calibration transform
             
         Returns:
-            Dictionary with IK solutions for each finger and plot file path if plotting enabled
+            Dictionary with IK solutions for each finger and, if plotting is
+            enabled, the plot file path (or a plot_job id when a plot queue is set)
         """
-        try:
-            # Apply calibration if requested
-            if apply_calibration:
-                try:
-                    hand_data = self.calibration.transform_hand_data(hand_data)
-                except ValueError as e:
-                    print(f"Warning: Calibration not applied - {str(e)}")
-            
-            # Extract points by finger
-            points_by_finger = self._organize_points_by_finger(hand_data.get('points', []))
-            
-            # Process each finger
-            results = {}
-            fig = None
-            ax = None
-            plot_path = None
-            
-            if plot:
-                fig = plt.figure(figsize=(10, 10))
-                ax = fig.add_subplot(111, projection='3d')
-                ax.set_xlabel('X')
-                ax.set_ylabel('Y')
-                ax.set_zlabel('Z')
-                
-                # Set axis limits based on hand points
-                x_min, x_max, y_min, y_max, z_min, z_max = self._get_plot_limits(points_by_finger)
-                ax.set_xlim(x_min, x_max)
-                ax.set_ylim(y_min, y_max)
-                ax.set_zlim(z_min, z_max)
-                
-                # Make the plot aspect ratio equal
-                max_range = max(x_max - x_min, y_max - y_min, z_max - z_min)
-                mid_x = (x_max + x_min) * 0.5
-                mid_y = (y_max + y_min) * 0.5
-                mid_z = (z_max + z_min) * 0.5
-                ax.set_xlim(mid_x - max_range * 0.5, mid_x + max_range * 0.5)
-                ax.set_ylim(mid_y - max_range * 0.5, mid_y + max_range * 0.5)
-                ax.set_zlim(mid_z - max_range * 0.5, mid_z + max_range * 0.5)
-                
-                # Set a good viewing angle
-                ax.view_init(elev=30, azim=45)
-            
-            # Define colors for each finger
-            finger_colors = {
-                'thumb': '#1f77b4',    # blue
-                'index': '#ff7f0e',    # orange
-                'middle': '#2ca02c',   # green
-                'ring': '#d62728',     # red
-                'little': '#9467bd'    # purple
-            }
-            
-            for finger_name, chain in self.fingers.items():
-                if finger_name in points_by_finger and points_by_finger[finger_name]:
-                    points = points_by_finger[finger_name]
-                    try:
-                        # Sort points by their order in the finger
-                        points.sort(key=lambda x: x.get('id', float('inf')))
-                        
-                        # Get all joint positions
-                        joint_positions = [(p['x'], p['y'], p['z']) for p in points]
-                        
-                        # Get tip position for IK
-                        target = [points[-1]['x'], points[-1]['y'], points[-1]['z']]
-                        
-                        # Compute IK
-                        ik_solution = chain.inverse_kinematics(target)
-                        results[finger_name] = ik_solution.tolist()
-                        
-                        if plot and ax:
-                            # Plot actual joint positions and segments
-                            for i in range(len(joint_positions) - 1):
-                                p1 = joint_positions[i]
-                                p2 = joint_positions[i + 1]
-                                # Plot segment
-                                ax.plot([p1[0], p2[0]], [p1[1], p2[1]], [p1[2], p2[2]],
-                                       color=finger_colors[finger_name], linewidth=2, linestyle='-')
-                                # Plot joint
-                                ax.scatter(p1[0], p1[1], p1[2], 
-                                         color=finger_colors[finger_name], s=50)
-                            
-                            # Plot last joint
-                            ax.scatter(joint_positions[-1][0], joint_positions[-1][1], joint_positions[-1][2],
-                                     color=finger_colors[finger_name], s=50)
-                            
-                            # Plot IK chain for comparison
-                            self._plot_finger_chain(chain, ik_solution, ax, color=finger_colors[finger_name])
-                            
-                            # Plot target point
-                            ax.scatter([target[0]], [target[1]], [target[2]], 
-                                     c='red', marker='*', s=100)
-                            
-                            # Add text label for the finger
-                            ax.text(target[0], target[1], target[2], 
-                                   f' {finger_name}', fontsize=8)
-                    except (KeyError, IndexError) as e:
-                        print(f"Warning: Could not process {finger_name} - {str(e)}")
-                        continue
-                    
-            if plot:
-                # Generate plot filename using source file name and hand ID
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                base_name = os.path.splitext(os.path.basename(source_file))[0] if source_file else "hand"
-                hand_suffix = f"_{hand_id}" if hand_id else ""
-                plot_filename = f"{base_name}{hand_suffix}_{timestamp}.png"
-                
-                plt.title(f'Hand IK Visualization - {base_name}{hand_suffix}')
-                # Save plot to file with higher DPI for better quality
-                plot_path = os.path.join('plots', plot_filename)
-                plt.savefig(plot_path, dpi=300, bbox_inches='tight')
-                plt.close()
-                results['plot_path'] = plot_path
+        return self.process_hands({hand_id: hand_data}, plot=plot, source_file=source_file,
+                                  apply_calibration=apply_calibration)[hand_id]
+    
+    def process_hands(self, hands: Dict[str, Dict[str, Any]], plot: bool = False,
+                      source_file: str = None, apply_calibration: bool = True,
+                      snapshot: Optional[CalibrationSnapshot] = None) -> Dict[str, Dict[str, Any]]:
+        """Process several hands, solving all of their fingers together
+        
+        With an executor configured (see set_executor) every finger of every
+        hand is submitted at once, so a two-hand request runs all ten solves
+        concurrently. In 'full_pose' fit mode all fingers are fitted in a
+        single batched solve instead.
+        
+        Args:
+            hands: Dictionary of hand identifier (left/right) to hand data or HandFrame
+            plot: Whether to save a plot per hand
+            source_file: Name of the source JSON file
+            apply_calibration: Whether to apply calibration transform
+            snapshot: Calibration to apply, default the current one (pass it to
+                know which calibration version was used)
             
-            return results
+        Returns:
+            Dictionary of hand identifier to the results process_hand would return
+        """
+        results = {}
+        prepared = {}
+        # Every hand of a request uses the same calibration, even if it is reloaded meanwhile
+        if apply_calibration and snapshot is None:
+            snapshot = self.calibration.snapshot
+        elif not apply_calibration:
+            snapshot = None
+        for hand_id, hand_data in hands.items():
+            try:
+                prepared[hand_id] = self._prepare_hand(hand_data, apply_calibration, snapshot)
+            except Exception as e:
+                print(f"Error processing hand: {str(e)}")
+                results[hand_id] = {"error": str(e)}
+        
+        try:
+            if self.fit_mode == 'full_pose':
+                solutions = self._fit_poses([
+                    (hand_id, finger_name, target, self._intermediate_target(frame, finger_name))
+                    for hand_id, (frame, _, targets) in prepared.items()
+                    for finger_name, target in targets.items()])
+            else:
+                solutions = self._solve_fingers([
+                    (hand_id, finger_name, target)
+                    for hand_id, (_, _, targets) in prepared.items()
+                    for finger_name, target in targets.items()])
         except Exception as e:
             print(f"Error processing hand: {str(e)}")
-            return {"error": str(e)}
+            results.update({hand_id: {"error": str(e)} for hand_id in prepared})
+            return results
+        
+        for hand_id, (_, points_by_finger, targets) in prepared.items():
+            try:
+                hand_solutions = {finger_name: solutions[(hand_id, finger_name)] for finger_name in targets}
+                hand_results = {finger_name: ik_solution.tolist()
+                                for finger_name, ik_solution in hand_solutions.items()}
+                if plot and self.plot_queue is not None:
+                    hand_results['plot_job'] = self.plot_queue.submit(
+                        self._plot_hand, points_by_finger, targets, hand_solutions, hand_id, source_file)
+                elif plot:
+                    hand_results['plot_path'] = self._plot_hand(
+                        points_by_finger, targets, hand_solutions, hand_id, source_file)
+                results[hand_id] = hand_results
+            except Exception as e:
+                print(f"Error processing hand: {str(e)}")
+                results[hand_id] = {"error": str(e)}
+        
+        return results
     
-    def _organize_points_by_finger(self, points: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
-        """Organize points by finger name"""
-        fingers = {
-            'thumb': [],
-            'index': [],
-            'middle': [],
-            'ring': [],
-            'little': []
+    def _prepare_hand(self, hand_data: Any, apply_calibration: bool = True,
+                      snapshot: Optional[CalibrationSnapshot] = None) -> tuple:
+        """Calibrate a hand and extract the IK target of each finger
+        
+        Args:
+            hand_data: Dictionary containing hand points, or a HandFrame
+            apply_calibration: Whether to apply calibration transform
+            snapshot: Calibration to apply, default the current one
+            
+        Returns:
+            tuple: (calibrated HandFrame, tracked joint positions by finger,
+                    dictionary of finger to tip target)
+        """
+        frame = HandFrame.from_hand_data(hand_data)
+        
+        # Apply calibration if requested
+        if apply_calibration:
+            try:
+                frame = self.calibration.transform_frame(frame, snapshot)
+            except ValueError as e:
+                print(f"Warning: Calibration not applied - {str(e)}")
+        
+        # Joints are stored from the hand outwards, so the last tracked one is the tip
+        points_by_finger = {finger_name: frame.finger_positions(finger_name) for finger_name in self.fingers}
+        targets = {finger_name: points[-1].tolist()
+                   for finger_name, points in points_by_finger.items() if len(points)}
+        
+        return frame, points_by_finger, targets
+    
+    def _plot_hand(self, points_by_finger: Dict[str, np.ndarray],
+                   targets: Dict[str, List[float]], solutions: Dict[str, np.ndarray],
+                   hand_id: str = None, source_file: str = None) -> str:
+        """Plot tracked fingers against their IK chains and save the figure
+        
+        Args:
+            points_by_finger: Dictionary of finger to tracked joint positions (k, 3)
+            targets: Dictionary of finger to tip target
+            solutions: Dictionary of finger to IK joint angles
+            hand_id: Identifier for the hand (left/right)
+            source_file: Name of the source JSON file
+            
+        Returns:
+            Path of the saved plot
+        """
+        chain_positions = {
+            finger_name: self.forward_kinematics(finger_name, ik_solution)
+            for finger_name, ik_solution in solutions.items()
         }
         
-        for point in points:
-            name = point['name'].lower()
-            if 'thumb' in name:
-                fingers['thumb'].append(point)
-            elif 'index' in name:
-                fingers['index'].append(point)
-            elif 'middle' in name:
-                fingers['middle'].append(point)
-            elif 'ring' in name:
-                fingers['ring'].append(point)
-            elif 'little' in name:
-                fingers['little'].append(point)
-                
-        return fingers 
\ No newline at end of file
+        # Generate plot filename using source file name, hand ID and plot number
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base_name = os.path.splitext(os.path.basename(source_file))[0] if source_file else "hand"
+        hand_suffix = f"_{hand_id}" if hand_id else ""
+        plot_filename = f"{base_name}{hand_suffix}_{timestamp}_{next(self._plot_counter):06d}.png"
+        plot_path = os.path.join('plots', plot_filename)
+        
+        return self._get_renderer().render(
+            points_by_finger, targets, chain_positions,
+            self._get_plot_limits(points_by_finger),
+            f'Hand IK Visualization - {base_name}{hand_suffix}', plot_path)
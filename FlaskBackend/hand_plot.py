@@ -0,0 +1,121 @@
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+# Registers the '3d' projection
+from mpl_toolkits.mplot3d import Axes3D  # noqa: F401
+from typing import Dict, List
+
+# Colors for each finger
+FINGER_COLORS = {
+    'thumb': '#1f77b4',    # blue
+    'index': '#ff7f0e',    # orange
+    'middle': '#2ca02c',   # green
+    'ring': '#d62728',     # red
+    'little': '#9467bd'    # purple
+}
+
+# Output settings by preset: (dpi, tight bounding box)
+DPI_PRESETS = {
+    'high': (300, True),     # Original quality
+    'medium': (150, True),
+    'low': (72, False)       # Fastest, for rendering whole sessions
+}
+
+
+class HandPlotRenderer:
+    """Reusable 3D renderer for hand IK plots
+
+    Owns one Agg figure and canvas, created once, with a fixed set of artists
+    per finger (tracked joints, IK chain, target and label). Each frame only
+    updates the artists' data and the axis limits before saving, so no figure
+    or artist is created per plot and the global pyplot state is never touched.
+
+    A renderer is not thread-safe; give each worker thread its own.
+    """
+
+    def __init__(self, preset: str = 'high'):
+        """Create the figure and the per-finger artists
+
+        Args:
+            preset: Output quality, one of DPI_PRESETS
+        """
+        if preset not in DPI_PRESETS:
+            raise ValueError(f"Unknown plot preset: {preset}")
+        self.dpi, self.tight = DPI_PRESETS[preset]
+
+        self.figure = Figure(figsize=(10, 10))
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot(111, projection='3d')
+        self.ax.set_xlabel('X')
+        self.ax.set_ylabel('Y')
+        self.ax.set_zlabel('Z')
+
+        # Set a good viewing angle
+        self.ax.view_init(elev=30, azim=45)
+
+        self.artists = {}
+        for finger_name, color in FINGER_COLORS.items():
+            tracked_line, = self.ax.plot([], [], [], color=color, linewidth=2, linestyle='-')
+            chain_line, = self.ax.plot([], [], [], color=color, linewidth=2)
+            self.artists[finger_name] = {
+                'tracked_line': tracked_line,
+                'tracked_joints': self.ax.scatter([], [], [], color=color, s=50),
+                'chain_line': chain_line,
+                'chain_joints': self.ax.scatter([], [], [], color=color, s=50),
+                'target': self.ax.scatter([], [], [], c='red', marker='*', s=100),
+                'label': self.ax.text(0, 0, 0, f' {finger_name}', fontsize=8)
+            }
+
+    @staticmethod
+    def _set_scatter(scatter, positions: np.ndarray) -> None:
+        """Replace the points of a 3D scatter in place"""
+        scatter._offsets3d = (positions[:, 0], positions[:, 1], positions[:, 2])
+
+    def render(self, points_by_finger: Dict[str, np.ndarray],
+               targets: Dict[str, List[float]], chain_positions: Dict[str, np.ndarray],
+               limits: tuple, title: str, plot_path: str) -> str:
+        """Draw one frame and save it
+
+        Args:
+            points_by_finger: Dictionary of finger to tracked joint positions (k, 3)
+            targets: Dictionary of finger to tip target
+            chain_positions: Dictionary of finger to (n_links, 3) IK joint positions
+            limits: (min_x, max_x, min_y, max_y, min_z, max_z) axis limits
+            title: Plot title
+            plot_path: Output PNG path
+
+        Returns:
+            The path the plot was saved to
+        """
+        for finger_name, artists in self.artists.items():
+            visible = finger_name in chain_positions
+            for artist in artists.values():
+                artist.set_visible(visible)
+            if not visible:
+                continue
+
+            tracked = np.asarray(points_by_finger[finger_name], dtype=float).reshape(-1, 3)
+            chain = np.asarray(chain_positions[finger_name])
+            target = np.asarray(targets[finger_name], dtype=float)
+
+            artists['tracked_line'].set_data_3d(tracked[:, 0], tracked[:, 1], tracked[:, 2])
+            self._set_scatter(artists['tracked_joints'], tracked)
+            artists['chain_line'].set_data_3d(chain[:, 0], chain[:, 1], chain[:, 2])
+            self._set_scatter(artists['chain_joints'], chain)
+            self._set_scatter(artists['target'], target[np.newaxis])
+            artists['label'].set_position_3d(target)
+
+        # Make the plot aspect ratio equal
+        x_min, x_max, y_min, y_max, z_min, z_max = limits
+        max_range = max(x_max - x_min, y_max - y_min, z_max - z_min)
+        mid_x = (x_max + x_min) * 0.5
+        mid_y = (y_max + y_min) * 0.5
+        mid_z = (z_max + z_min) * 0.5
+        self.ax.set_xlim(mid_x - max_range * 0.5, mid_x + max_range * 0.5)
+        self.ax.set_ylim(mid_y - max_range * 0.5, mid_y + max_range * 0.5)
+        self.ax.set_zlim(mid_z - max_range * 0.5, mid_z + max_range * 0.5)
+
+        self.ax.set_title(title)
+        self.figure.savefig(plot_path, dpi=self.dpi,
+                            bbox_inches='tight' if self.tight else None)
+        return plot_path
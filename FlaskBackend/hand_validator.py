@@ -1,16 +1,159 @@
+import time
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Any
+from threading import Lock
+from typing import Dict, List, Optional, Tuple, Any
+from hand_frame import HandFrame, JOINT_INDEX, JOINT_NAMES, PREFIXED_NAMES, N_JOINTS
+
+AXES = ['x', 'y', 'z']
+
+class MotionHistory:
+    """Fixed-size ring buffer of one hand's recently accepted frames"""
+    
+    __slots__ = ('positions', 'times', 'count', 'head', 'rejections', 'last_used', 'lock')
+    
+    def __init__(self, size: int):
+        self.positions = np.full((size, N_JOINTS, 3), np.nan)
+        self.times = np.zeros(size)
+        self.count = 0
+        self.head = -1
+        self.rejections = 0  # Frames rejected since the last accepted one
+        self.last_used = time.monotonic()
+        self.lock = Lock()
+    
+    def previous(self, age: int) -> Tuple[np.ndarray, float]:
+        """Get the frame accepted ``age`` frames before the latest one (0 = latest)"""
+        index = (self.head - age) % len(self.times)
+        return self.positions[index], self.times[index]
+    
+    def push(self, positions: np.ndarray, timestamp: float) -> None:
+        """Store a frame, overwriting the oldest one when full"""
+        self.head = (self.head + 1) % len(self.times)
+        self.positions[self.head] = positions
+        self.times[self.head] = timestamp
+        self.count = min(self.count + 1, len(self.times))
 
 class HandValidator:
-    def __init__(self, rules_file: str):
+    def __init__(self, rules_file: str, history_size: int = 8, max_gap: float = 0.25,
+                 max_rejections: int = 3, history_ttl: Optional[float] = None):
         """Initialize the validator with rules from a CSV file.
         
         Args:
             rules_file (str): Path to the CSV file containing validation rules
+            history_size (int): Frames kept per hand for the motion checks
+            max_gap (float): Seconds without an accepted frame after which a
+                hand's motion history starts over
+            max_rejections (int): Consecutive rejected frames after which the
+                latest one replaces the hand's history as the new reference
+            history_ttl (float, optional): Seconds after which an unused motion
+                history is dropped, default 4 * max_gap (it would start over anyway)
         """
         self.rules = pd.read_csv(rules_file)
         # Convert rules to a dictionary for faster lookup
         self.rules_dict = self.rules.set_index('point_name').to_dict('index')
+        
+        # Bounds per [naming variant, joint index] for validating whole frames at once.
+        # Rules only apply to the exact name they list, so each variant gets its own row;
+        # joints without a rule keep NaN bounds, which never flag a violation.
+        self.lower = np.full((2, N_JOINTS, 3), np.nan)
+        self.upper = np.full((2, N_JOINTS, 3), np.nan)
+        for point_name, rules in self.rules_dict.items():
+            if point_name in JOINT_INDEX:
+                index, prefixed = JOINT_INDEX[point_name]
+                self.lower[int(prefixed), index] = [rules[f'min_{axis}'] for axis in AXES]
+                self.upper[int(prefixed), index] = [rules[f'max_{axis}'] for axis in AXES]
+        
+        # Bounds per joint for batches that carry no names: the 'hand'-prefixed
+        # rule where there is one (as validation.csv lists them), else the bare one
+        self.joint_lower = np.where(np.isnan(self.lower[1]), self.lower[0], self.lower[1])
+        self.joint_upper = np.where(np.isnan(self.upper[1]), self.upper[0], self.upper[1])
+        self.joint_names = np.where(np.isnan(self.lower[1, :, 0]), JOINT_NAMES, PREFIXED_NAMES)
+        
+        # Optional per-joint speed (m/s) and acceleration (m/s^2) limits, from the
+        # max_velocity and max_acceleration columns; NaN (no limit) when absent
+        self.max_velocity = np.full(N_JOINTS, np.nan)
+        self.max_acceleration = np.full(N_JOINTS, np.nan)
+        for point_name, rules in self.rules_dict.items():
+            if point_name in JOINT_INDEX:
+                index = JOINT_INDEX[point_name][0]
+                self.max_velocity[index] = rules.get('max_velocity', np.nan)
+                self.max_acceleration[index] = rules.get('max_acceleration', np.nan)
+        
+        self.history_size = history_size
+        self.max_gap = max_gap
+        self.max_rejections = max_rejections
+        self.history_ttl = history_ttl if history_ttl is not None else 4 * max_gap
+        self.histories: Dict[Tuple[str, Optional[str]], MotionHistory] = {}
+        self._histories_lock = Lock()
+        self._last_sweep = time.monotonic()
+    
+    def _bounds(self, prefixed: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the (..., 27, 3) bounds for joints sent with the given naming variants
+        
+        Args:
+            prefixed: None for the per-joint bounds, or a boolean mask of shape
+                (27,) or (F, 27) that is True for 'hand'-prefixed names
+            
+        Returns:
+            tuple: (lower bounds, upper bounds)
+        """
+        if prefixed is None:
+            return self.joint_lower, self.joint_upper
+        variant = np.asarray(prefixed).astype(int)
+        joints = np.arange(N_JOINTS)
+        return self.lower[variant, joints], self.upper[variant, joints]
+    
+    def violation_mask(self, positions: np.ndarray, prefixed: Optional[np.ndarray] = None) -> np.ndarray:
+        """Find the coordinates outside their range for a batch of frames
+        
+        Args:
+            positions (np.ndarray): Joint positions of shape (F, 27, 3) in the
+                HandFrame joint order; NaN (missing joints) never violates
+            prefixed (np.ndarray, optional): Naming variant of each joint, see _bounds
+            
+        Returns:
+            np.ndarray: Boolean array of shape (F, 27, 3), True where a coordinate is out of range
+        """
+        lower, upper = self._bounds(prefixed)
+        return (positions < lower) | (positions > upper)
+    
+    def validate_frames(self, positions: np.ndarray, prefixed: Optional[np.ndarray] = None) -> np.ndarray:
+        """Validate a batch of frames in one vectorised comparison.
+        
+        No messages are built; call violations() for the frames that fail.
+        
+        Args:
+            positions (np.ndarray): Joint positions of shape (F, 27, 3), e.g. stacked
+                HandFrame.positions or a recorded session
+            prefixed (np.ndarray, optional): Naming variant of each joint, see _bounds
+            
+        Returns:
+            np.ndarray: Boolean array of shape (F,), True for frames within all rules
+        """
+        positions = np.asarray(positions, dtype=float)
+        if positions.shape[-2:] != (N_JOINTS, 3):
+            raise ValueError(f"Expected positions of shape (F, {N_JOINTS}, 3), got {positions.shape}")
+        return ~self.violation_mask(positions, prefixed).any(axis=(-2, -1))
+    
+    def violations(self, positions: np.ndarray, prefixed: Optional[np.ndarray] = None) -> List[str]:
+        """Describe the violations of one frame from a batch.
+        
+        Args:
+            positions (np.ndarray): Joint positions of shape (27, 3)
+            prefixed (np.ndarray, optional): Naming variant of each joint, shape (27,)
+            
+        Returns:
+            list: Violation messages, in the same format as validate_hand
+        """
+        lower, upper = self._bounds(prefixed)
+        outside = (positions < lower) | (positions > upper)
+        # Without names, report the name the rule was written for
+        names = self.joint_names if prefixed is None else np.where(prefixed, PREFIXED_NAMES, JOINT_NAMES)
+        return [
+            f"{names[index]} {AXES[axis]}-coordinate {positions[index, axis]} is outside "
+            f"range [{lower[index, axis]}, {upper[index, axis]}]"
+            for index, axis in zip(*np.nonzero(outside))
+        ]
     
     def validate_point(self, point: Dict[str, Any]) -> Tuple[bool, List[str]]:
         """Validate a single point against the rules.
@@ -44,19 +187,123 @@ class HandValidator:
             
         return len(violations) == 0, violations
     
-    def validate_hand(self, hand_data: Dict[str, Any]) -> Tuple[bool, List[str]]:
-        """Validate all points in a hand against the rules.
+    def validate_frame(self, frame: HandFrame) -> Tuple[bool, List[str]]:
+        """Validate all points of a parsed hand frame against the rules.
         
         Args:
-            hand_data (dict): Hand data containing points
+            frame (HandFrame): Hand frame to validate
             
         Returns:
             tuple: (is_valid, list of violations)
         """
         all_violations = []
+        if not self.validate_frames(frame.positions[None], frame.prefixed)[0]:
+            all_violations.extend(self.violations(frame.positions, frame.prefixed))
         
-        for point in hand_data['points']:
+        # Points outside the joint schema can still have rules of their own
+        for point in frame.extra:
             is_valid, violations = self.validate_point(point)
             all_violations.extend(violations)
             
-        return len(all_violations) == 0, all_violations 
\ No newline at end of file
+        return len(all_violations) == 0, all_violations
+    
+    def validate_hand(self, hand_data: Any) -> Tuple[bool, List[str]]:
+        """Validate all points in a hand against the rules.
+        
+        Args:
+            hand_data (dict or HandFrame): Hand data containing points
+            
+        Returns:
+            tuple: (is_valid, list of violations)
+        """
+        return self.validate_frame(HandFrame.from_hand_data(hand_data))
+    
+    def validate_motion(self, frame: HandFrame, session: str = 'default',
+                        timestamp: Optional[float] = None) -> Tuple[bool, List[str]]:
+        """Check a frame's joint speeds and accelerations against the previous frames.
+        
+        Catches tracking glitches that teleport a joint while staying inside its
+        box. Speeds come from the last accepted frame, accelerations from the
+        last two; both are computed for all joints at once. Frames that pass are
+        added to the hand's history. Rejected frames are not, so a glitch is
+        compared against the last good frame rather than becoming the reference.
+        After max_rejections rejections in a row the reference is taken to be
+        stale (the hand really moved, or a glitch was accepted) and the history
+        starts over from the latest frame.
+        
+        The clock must resolve the frame interval. Headset 'timestamp' fields are
+        usually whole seconds, so callers pass the arrival time for live frames,
+        which is also the default.
+        
+        Args:
+            frame (HandFrame): Hand frame to check; its hand_id selects the history
+            session (str): Session the frame belongs to; each keeps its own histories
+            timestamp (float, optional): Frame time in seconds, default the
+                time of the call
+            
+        Returns:
+            tuple: (is_valid, list of violations)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        key = (session, frame.hand_id)
+        with self._histories_lock:
+            history = self.histories.get(key)
+            if history is None:
+                self._drop_idle_histories()
+                history = self.histories[key] = MotionHistory(self.history_size)
+            history.last_used = time.monotonic()
+        
+        with history.lock:
+            if history.count:
+                last_positions, last_time = history.previous(0)
+                if timestamp - last_time > self.max_gap:
+                    history.count = 0  # Tracking was lost; start over from this frame
+                elif timestamp <= last_time:
+                    return True, []  # Repeated or out-of-order frame; nothing to compare
+            
+            violations = []
+            if history.count >= 1:
+                velocity = (frame.positions - last_positions) / (timestamp - last_time)
+                speed = np.linalg.norm(velocity, axis=1)
+                for index in np.flatnonzero(speed > self.max_velocity):
+                    violations.append(
+                        f"{frame.name(index)} speed {speed[index]:.3f} m/s exceeds limit {self.max_velocity[index]}")
+                
+                if history.count >= 2:
+                    older_positions, older_time = history.previous(1)
+                    previous_velocity = (last_positions - older_positions) / (last_time - older_time)
+                    acceleration = np.linalg.norm(velocity - previous_velocity, axis=1) / (
+                        (timestamp - older_time) / 2)
+                    for index in np.flatnonzero(acceleration > self.max_acceleration):
+                        violations.append(
+                            f"{frame.name(index)} acceleration {acceleration[index]:.3f} m/s^2 exceeds "
+                            f"limit {self.max_acceleration[index]}")
+            
+            if not violations:
+                history.rejections = 0
+                history.push(frame.positions, timestamp)
+            else:
+                history.rejections += 1
+                if history.rejections >= self.max_rejections:
+                    # Re-seed from this frame; the next ones are checked against it
+                    history.count = 0
+                    history.rejections = 0
+                    history.push(frame.positions, timestamp)
+            return len(violations) == 0, violations
+    
+    def _drop_idle_histories(self) -> None:
+        """Forget histories unused for history_ttl; called with _histories_lock held"""
+        now = time.monotonic()
+        if now - self._last_sweep < self.history_ttl:
+            return  # Sweep at most once per TTL, so new sessions stay cheap
+        self._last_sweep = now
+        for key in [key for key, history in self.histories.items()
+                    if now - history.last_used > self.history_ttl]:
+            del self.histories[key]
+    
+    def end_session(self, session: str) -> None:
+        """Forget the motion histories of a session"""
+        with self._histories_lock:
+            for key in [key for key in self.histories if key[0] == session]:
+                del self.histories[key]
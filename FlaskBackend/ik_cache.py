@@ -0,0 +1,102 @@
+import numpy as np
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Hashable, Optional, Sequence, Tuple
+
+
+class IKCache:
+    """Bounded LRU cache of IK solutions keyed on quantised tip targets
+
+    Resting hands and repeated gestures produce almost the same fingertip
+    target many times a second. Snapping the target to a grid of ``step``
+    metres lets those frames share one solution, so a hit skips the solver
+    entirely. A coarser step raises the hit rate at the cost of accuracy: a
+    cached solution can be up to half a step (per axis) away from the exact
+    answer for the requested target.
+    """
+
+    def __init__(self, max_size: int = 4096, step: float = 0.001):
+        """Initialize an empty cache
+
+        Args:
+            max_size: Maximum number of cached solutions before evicting the least recently used
+            step: Quantisation grid size for targets, in metres
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        if step <= 0:
+            raise ValueError("step must be positive")
+        self.max_size = max_size
+        self.step = step
+        self._entries: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self.lock = Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0
+        }
+
+    def key(self, chain_key: Hashable, target: Sequence[float]) -> Tuple:
+        """Build the cache key for a chain and target
+
+        Args:
+            chain_key: Identifier of the chain (and solver) the solution belongs to
+            target: Tip target position [x, y, z]
+
+        Returns:
+            Hashable key with the target snapped to the grid
+        """
+        cell = np.round(np.asarray(target, dtype=float) / self.step).astype(np.int64)
+        return (chain_key,) + tuple(cell.tolist())
+
+    def get(self, key: Tuple) -> Optional[np.ndarray]:
+        """Look up a solution and mark it as recently used
+
+        Args:
+            key: Key returned by key()
+
+        Returns:
+            Copy of the cached joint vector, or None on a miss
+        """
+        with self.lock:
+            solution = self._entries.get(key)
+            if solution is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return solution.copy()
+
+    def put(self, key: Tuple, solution: np.ndarray) -> None:
+        """Store a solution, evicting the least recently used entry if full
+
+        Args:
+            key: Key returned by key()
+            solution: Joint vector to cache
+        """
+        with self.lock:
+            self._entries[key] = np.array(solution, dtype=float)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def clear(self) -> None:
+        """Drop all cached solutions"""
+        with self.lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get cache counters
+
+        Returns:
+            Dictionary with hits, misses, evictions, size and hit rate
+        """
+        with self.lock:
+            stats = dict(self.stats)
+            stats['size'] = len(self._entries)
+            stats['max_size'] = self.max_size
+            stats['step'] = self.step
+            lookups = stats['hits'] + stats['misses']
+            stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+            return stats
@@ -0,0 +1,120 @@
+import time
+import numpy as np
+from threading import Lock
+from typing import Dict, Optional, Sequence, Tuple
+
+
+class WarmStartStore:
+    """Per-(hand, finger) memory of the last IK solution
+
+    Consecutive headset frames move a fingertip by millimetres, so the previous
+    frame's joint angles are an excellent starting point for the next solve.
+    Starting there cuts the number of solver iterations and keeps the solver in
+    the same basin from frame to frame, which stops the joints flipping between
+    equivalent solutions.
+
+    An entry is dropped (and the next solve starts cold) when it is older than
+    ``max_age`` seconds or when the new target is more than ``max_jump`` metres
+    away from the one it was solved for.
+    """
+
+    def __init__(self, max_age: float = 0.5, max_jump: float = 0.02):
+        """Initialize an empty store
+
+        Args:
+            max_age: Seconds after which a stored solution is considered stale
+            max_jump: Target distance (m) beyond which a stored solution is discarded
+        """
+        self.max_age = max_age
+        self.max_jump = max_jump
+        self._entries: Dict[Tuple[Optional[str], str], tuple] = {}
+        # Running mean of cold-start iterations per finger, used to estimate savings
+        self._cold_iterations: Dict[str, Tuple[int, float]] = {}
+        self.lock = Lock()
+        self.stats = {
+            'warm_starts': 0,
+            'cold_starts': 0,
+            'stale_resets': 0,
+            'jump_resets': 0,
+            'iterations_saved': 0.0
+        }
+
+    def lookup(self, hand_id: Optional[str], finger_name: str,
+               target: Sequence[float]) -> Optional[np.ndarray]:
+        """Get the initial position for a solve, if a fresh one is stored
+
+        Args:
+            hand_id: Hand identifier ('left', 'right' or None)
+            finger_name: Name of the finger chain
+            target: Tip target about to be solved
+
+        Returns:
+            Previous joint vector to start from, or None for a cold start
+        """
+        key = (hand_id, finger_name)
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['cold_starts'] += 1
+                return None
+
+            solution, previous_target, stamp = entry
+            if time.monotonic() - stamp > self.max_age:
+                reset = 'stale_resets'
+            elif np.linalg.norm(np.asarray(target, dtype=float) - previous_target) > self.max_jump:
+                reset = 'jump_resets'
+            else:
+                self.stats['warm_starts'] += 1
+                return solution.copy()
+
+            del self._entries[key]
+            self.stats[reset] += 1
+            self.stats['cold_starts'] += 1
+            return None
+
+    def record(self, hand_id: Optional[str], finger_name: str, target: Sequence[float],
+               solution: np.ndarray, iterations: Optional[int] = None,
+               warm: bool = False) -> None:
+        """Store a solution and account for the iterations it took
+
+        Args:
+            hand_id: Hand identifier ('left', 'right' or None)
+            finger_name: Name of the finger chain
+            target: Tip target that was solved
+            solution: Joint vector returned by the solver
+            iterations: Solver iterations used, if the solver reports them
+            warm: Whether the solve was started from a stored solution
+        """
+        with self.lock:
+            self._entries[(hand_id, finger_name)] = (
+                np.array(solution, dtype=float),
+                np.array(target, dtype=float),
+                time.monotonic()
+            )
+            if iterations is None:
+                return
+
+            count, mean = self._cold_iterations.get(finger_name, (0, 0.0))
+            if not warm:
+                count += 1
+                mean += (iterations - mean) / count
+                self._cold_iterations[finger_name] = (count, mean)
+            elif count:
+                self.stats['iterations_saved'] += max(mean - iterations, 0.0)
+
+    def reset(self) -> None:
+        """Forget all stored solutions"""
+        with self.lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get warm-start counters
+
+        Returns:
+            Dictionary of counters; iterations_saved is estimated against the
+            running mean of cold-start iterations for the same finger
+        """
+        with self.lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+            return stats
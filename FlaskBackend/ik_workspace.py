@@ -0,0 +1,175 @@
+import argparse
+import time
+import numpy as np
+from ikpy.chain import Chain
+from typing import Dict, Optional, Sequence
+from analytic_ik import AnalyticFingerSolver
+
+# One row per sampled configuration, grouped by chain
+WORKSPACE_DTYPE = np.dtype([
+    ('chain', 'S16'),
+    ('tip', '<f4', (3,)),
+    ('angles', '<f4', (2,))
+])
+
+
+def build_workspace_table(chains: Dict[str, Chain],
+                          samples: Sequence[int] = (256, 64)) -> np.ndarray:
+    """Sample each chain over its joint bounds and tabulate tip positions
+
+    Only the knuckle and first bend move the tip of the HandIK chains, so the
+    table covers those two joints on a regular grid. Tips are evaluated in one
+    vectorised call per chain. Chains the analytic model does not support are
+    left out and keep using the regular solver at runtime.
+
+    Args:
+        chains: Mapping of finger name to IKPy chain
+        samples: Number of samples for the knuckle and first bend
+
+    Returns:
+        Structured array with WORKSPACE_DTYPE, rows grouped by chain name
+    """
+    tables = []
+    for name in sorted(chains):
+        chain = chains[name]
+        if not AnalyticFingerSolver.supports(chain):
+            print(f"Warning: Skipping {name} - chain not supported by the workspace table")
+            continue
+        # The solver's seed grid is exactly the sampling we want
+        solver = AnalyticFingerSolver(chain, grid_size=samples)
+        table = np.empty(len(solver.seeds), dtype=WORKSPACE_DTYPE)
+        table['chain'] = name.encode()
+        table['tip'] = solver.seed_tips
+        table['angles'] = solver.seeds
+        tables.append(table)
+    return np.concatenate(tables) if tables else np.empty(0, dtype=WORKSPACE_DTYPE)
+
+
+class WorkspaceTable:
+    """Precomputed target -> joint lookup for the finger chains
+
+    The table is a single ``.npy`` file opened with ``mmap_mode='r'``, so
+    loading it costs one memory-mapped open no matter how large it is. A KD-tree
+    over each chain's tip samples is built the first time that chain is queried.
+
+    A lookup returns the sampled configuration whose tip is nearest the target,
+    which is already the least-squares IK answer up to the sampling resolution.
+    ``refine_steps`` Newton iterations then remove the residual, so the
+    per-frame cost is bounded and does not depend on optimiser convergence.
+    """
+
+    def __init__(self, table: np.ndarray, refine_steps: int = 3):
+        """Wrap a workspace table
+
+        Args:
+            table: Structured array with WORKSPACE_DTYPE, grouped by chain
+            refine_steps: Newton iterations applied after the lookup
+        """
+        self.table = table
+        self.refine_steps = refine_steps
+        names, starts = np.unique(table['chain'], return_index=True)
+        bounds = sorted(starts) + [len(table)]
+        order = np.argsort(starts)
+        self.slices = {
+            names[i].decode(): slice(bounds[rank], bounds[rank + 1])
+            for rank, i in enumerate(order)
+        }
+        self.trees: Dict[str, 'cKDTree'] = {}
+
+    @classmethod
+    def load(cls, path: str, refine_steps: int = 3) -> 'WorkspaceTable':
+        """Memory-map a workspace table from disk
+
+        Args:
+            path: Path to the .npy file written by save()
+            refine_steps: Newton iterations applied after the lookup
+
+        Returns:
+            WorkspaceTable backed by the memory-mapped file
+        """
+        table = np.load(path, mmap_mode='r')
+        if table.dtype != WORKSPACE_DTYPE:
+            raise ValueError(f"{path} is not a workspace table")
+        return cls(table, refine_steps=refine_steps)
+
+    @staticmethod
+    def save(table: np.ndarray, path: str) -> None:
+        """Write a workspace table to disk
+
+        Args:
+            table: Structured array from build_workspace_table()
+            path: Output .npy path
+        """
+        np.save(path, table)
+
+    def __contains__(self, finger_name: str) -> bool:
+        return finger_name in self.slices
+
+    def _tree(self, finger_name: str) -> 'cKDTree':
+        """Get (building on first use) the KD-tree over a chain's tip samples"""
+        tree = self.trees.get(finger_name)
+        if tree is None:
+            from scipy.spatial import cKDTree
+            tree = cKDTree(self.table['tip'][self.slices[finger_name]])
+            self.trees[finger_name] = tree
+        return tree
+
+    def nearest(self, finger_name: str, target: Sequence[float], n_links: int = 4) -> np.ndarray:
+        """Look up the sampled configuration with the tip nearest the target
+
+        Args:
+            finger_name: Name of the finger chain
+            target: Tip target position [x, y, z]
+            n_links: Length of the full joint vector to return
+
+        Returns:
+            Full joint vector with the knuckle and first bend from the table
+        """
+        _, index = self._tree(finger_name).query(np.asarray(target, dtype=float))
+        solution = np.zeros(n_links)
+        solution[1:3] = self.table['angles'][self.slices[finger_name]][index]
+        return solution
+
+    def solve_with_iterations(self, finger_name: str, solver: AnalyticFingerSolver,
+                              target: Sequence[float],
+                              initial_position: Optional[Sequence[float]] = None) -> tuple:
+        """Answer IK by table lookup plus a bounded refinement
+
+        Args:
+            finger_name: Name of the finger chain
+            solver: Analytic solver for the same chain, used for refinement
+            target: Tip target position [x, y, z]
+            initial_position: Optional starting joint vector (e.g. a warm start);
+                the table is only consulted when this is None
+
+        Returns:
+            tuple: (full joint vector, number of Newton iterations)
+        """
+        if initial_position is None:
+            initial_position = self.nearest(finger_name, target, solver.n_links)
+        return solver.solve_with_iterations(target, initial_position, max_steps=self.refine_steps)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute the IK workspace table for the finger chains')
+    parser.add_argument('--output', default='ik_workspace.npy', help='Output table file')
+    parser.add_argument('--knuckle-samples', type=int, default=256, help='Samples over the knuckle joint bounds')
+    parser.add_argument('--bend-samples', type=int, default=64, help='Samples over the first bend joint bounds')
+
+    args = parser.parse_args()
+
+    # Imported here so loading a table at runtime does not pull in HandIK
+    from hand_ik import HandIK
+    hand_ik = HandIK(cache_size=0, warm_start=False)
+
+    start = time.perf_counter()
+    table = build_workspace_table(hand_ik.fingers, (args.knuckle_samples, args.bend_samples))
+    WorkspaceTable.save(table, args.output)
+    elapsed = time.perf_counter() - start
+
+    print(f"Sampled {len(table)} configurations in {elapsed:.2f}s")
+    print(f"Workspace table saved to: {args.output} ({table.nbytes / 1024:.0f} KiB)")
+
+
+if __name__ == '__main__':
+    main()
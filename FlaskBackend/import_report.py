@@ -0,0 +1,90 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+# Packages that must only load when their feature is enabled
+HEAVY_MODULES = ['pandas', 'matplotlib', 'mpl_toolkits', 'ikpy', 'sympy', 'scipy',
+                 'pykos', 'grpc', 'serial']
+
+
+def measure_imports(module: str = 'main') -> Dict[str, Any]:
+    """Import a module in a fresh interpreter and report what it loaded
+
+    Uses ``python -X importtime`` so the numbers match what a server restart
+    pays, without any modules already cached by the calling process.
+
+    Args:
+        module: Name of the module to import, relative to this directory
+
+    Returns:
+        Dictionary with the total import time in seconds, the heavy packages
+        that were loaded and the cumulative time of each top-level import
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    imports: List[Dict[str, Any]] = []
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        loaded.add(name.strip().split('.')[0])
+        # Only count imports made directly by the module, not their dependencies
+        if len(name) - len(name.lstrip()) <= 3:
+            imports.append({'module': name.strip(), 'seconds': int(cumulative) / 1e6})
+
+    total = next((entry['seconds'] for entry in imports if entry['module'] == module), 0.0)
+    return {
+        'module': module,
+        'total_seconds': total,
+        'heavy_modules': sorted(loaded & set(HEAVY_MODULES)),
+        'imports': sorted(
+            (entry for entry in imports if entry['module'] != module),
+            key=lambda entry: entry['seconds'], reverse=True
+        )
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report the import-time cost of the server module')
+    parser.add_argument('--module', default='main', help='Module to import')
+    parser.add_argument('--top', type=int, default=10, help='Number of slowest imports to list')
+    parser.add_argument('--max-seconds', type=float, default=None,
+                        help='Fail if the total import time exceeds this')
+    parser.add_argument('--allow', nargs='*', default=[],
+                        help='Heavy packages that may be loaded at import time')
+    parser.add_argument('--output', help='Optional JSON file for the report')
+
+    args = parser.parse_args()
+
+    report = measure_imports(args.module)
+    print(f"import {report['module']}: {report['total_seconds'] * 1000:.0f} ms")
+    for entry in report['imports'][:args.top]:
+        print(f"  {entry['seconds'] * 1000:8.1f} ms  {entry['module']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    failures = []
+    unexpected = [name for name in report['heavy_modules'] if name not in args.allow]
+    if unexpected:
+        failures.append(f"heavy packages loaded at import time: {', '.join(unexpected)}")
+    if args.max_seconds is not None and report['total_seconds'] > args.max_seconds:
+        failures.append(f"import took {report['total_seconds']:.2f}s (limit {args.max_seconds:.2f}s)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
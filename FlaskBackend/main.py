@@ -1,34 +1,59 @@
-from flask import Flask, request, jsonify, render_template_string, Response
+from flask import Flask, request, jsonify, render_template_string, Response, stream_with_context
 from flask_cors import CORS
-from hand_validator import HandValidator
-from hand_ik import HandIK
-from robot_control import RobotController
-from sim_processor import SimProcessor
-from hand_cli import HandController  # Import the HandController
+from sim_processor import SimProcessor, DEBUG_LEVELS
+from frame_history import FrameHistory
+from pose_state import HeadsetSnapshot
+from hand_frame import HandFrame, N_JOINTS, parse_timestamp
 import argparse
 import json
 import os
 import time
 import math
+import uuid
+import numpy as np
 from datetime import datetime
+from threading import Lock
 from templates import LANDING_PAGE
 
+# Feature modules (pandas, ikpy, matplotlib, pykos, pyserial) are imported only
+# when the feature that needs them is used, so the sim-only server starts fast.
+# Run import_report.py to check what `import main` loads.
+
 app = Flask(__name__)
 # Enable CORS for all domains
 CORS(app)
 
-validator = HandValidator('validation.csv')
-ik_processor = HandIK(connect_robot=False)  # Don't connect to robot for IK processing
+validator = None  # Created on the first /validate request (see get_validator)
+ik_processor = None  # Created when IK is enabled (see get_ik_processor)
 robot_controller = None  # Initialize later if robot control is enabled
 sim_processor = SimProcessor()  # Initialize the simulation processor
+_component_lock = Lock()
 
 # Initialize hand controller (will be set up in run_server)
 hand_controller = None
 enable_hand_updates = False  # Flag to control hand updates from VR data
 
-# Store latest headset data
-latest_headset_data = None
-latest_headset_timestamp = None
+# Latest headset frame, replaced as a whole so readers see data and time together
+latest_headset = None
+_headset_lock = Lock()  # Serialises writers only; readers take latest_headset directly
+
+def get_validator():
+    """Get the hand validator, loading its rules on first use"""
+    global validator
+    with _component_lock:
+        if validator is None:
+            from hand_validator import HandValidator
+            validator = HandValidator('validation.csv')
+        return validator
+
+def get_ik_processor():
+    """Get the IK processor, building the finger chains on first use"""
+    global ik_processor
+    with _component_lock:
+        if ik_processor is None:
+            from hand_ik import HandIK
+            ik_processor = HandIK(connect_robot=False)  # Don't connect to robot for IK processing
+        return ik_processor
 
 def log_request(endpoint, data=None):
     """Log incoming requests with timestamp and data."""
@@ -121,35 +146,191 @@ def validate_hands():
     try:
         data = request.get_json()
         source_file = request.headers.get('X-Source-File', 'unknown')
-        
-        # Validate both hands
-        results = {}
-        for hand_key in ['left_hand', 'right_hand']:
-            if hand_key in data['hands']:
-                is_valid, violations = validator.validate_hand(data['hands'][hand_key])
-                results[hand_key] = {
-                    'is_valid': is_valid,
-                    'violations': violations
-                }
-                
-                # If IK processing is enabled, add IK results
-                if app.config['ENABLE_IK']:
-                    ik_results = ik_processor.process_hand(
-                        data['hands'][hand_key], 
-                        plot=app.config['PLOT_IK'],
-                        hand_id=hand_key.split('_')[0],  # 'left' or 'right'
-                        source_file=source_file
-                    )
-                    results[hand_key]['ik_results'] = ik_results
-        
-        return jsonify({
-            'validation_results': results,
-            'overall_valid': all(result['is_valid'] for result in results.values())
-        }), 200
+        # Motion checks are opt-in: only clients naming a session get a history
+        session = request.headers.get('X-Session-Id')
+        return jsonify(validate_frame_data(data, source_file, session=session)), 200
         
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
+def validate_frame_data(data, source_file='unknown', run_ik=True, session=None, live=True):
+    """Validate one headset frame and, if enabled, solve its IK
+    
+    Args:
+        data (dict): Frame with a 'hands' dictionary and optionally a 'timestamp'
+        source_file (str): Name used for IK plots
+        run_ik (bool): Whether to add IK results when IK processing is enabled
+        session (str, optional): Motion history the frame is checked against and
+            added to; None checks each frame on its own, without motion checks
+        live (bool): Whether the frame was just captured. Live frames are timed
+            by their arrival, since headset timestamps are whole seconds;
+            recorded frames are timed by their timestamp and skip the motion
+            checks unless it has sub-second precision
+        
+    Returns:
+        dict: Response body with 'validation_results' and 'overall_valid'
+    """
+    received_at = time.time()
+    # Parse each hand once; validation and IK share the frame
+    timestamp = parse_timestamp(data.get('timestamp'))
+    frames = {hand_key: HandFrame.from_hand_data(data['hands'][hand_key], hand_id=hand_key.split('_')[0],
+                                                 timestamp=timestamp)
+              for hand_key in ['left_hand', 'right_hand'] if hand_key in data['hands']}
+    
+    # Motion checks need a session and a clock that resolves the frame interval
+    if session is None:
+        motion_time = None
+    elif live:
+        motion_time = received_at
+    elif timestamp is not None and timestamp % 1:
+        motion_time = timestamp
+    else:
+        motion_time = None
+    
+    # Validate both hands, then check the motion of the ones inside their boxes
+    results = {}
+    for hand_key, frame in frames.items():
+        is_valid, violations = get_validator().validate_frame(frame)
+        if is_valid and motion_time is not None:
+            is_valid, violations = get_validator().validate_motion(frame, session, motion_time)
+        results[hand_key] = {
+            'is_valid': is_valid,
+            'violations': violations
+        }
+    
+    # If IK processing is enabled, add IK results, solving both hands together
+    response = {}
+    if run_ik and app.config['ENABLE_IK']:
+        processor = get_ik_processor()
+        # Read the calibration once so the reported version is the one applied
+        snapshot = processor.calibration.snapshot
+        ik_results = processor.process_hands(
+            {frame.hand_id: frame for frame in frames.values()},  # 'left' or 'right'
+            plot=app.config['PLOT_IK'],
+            source_file=source_file,
+            snapshot=snapshot
+        )
+        for hand_key in results:
+            results[hand_key]['ik_results'] = ik_results[hand_key.split('_')[0]]
+        response['calibration_version'] = snapshot.version if snapshot is not None else None
+    
+    return {
+        'validation_results': results,
+        'overall_valid': all(result['is_valid'] for result in results.values()),
+        **response
+    }
+
+# Frames validated per read in the binary stream format
+BINARY_CHUNK_FRAMES = 256
+
+def generate_ndjson_results(stream, source_file, run_ik, session, end_session):
+    """Validate an NDJSON stream of frames, yielding one result line per input line"""
+    try:
+        for index, line in enumerate(stream):
+            if not line.strip():
+                continue
+            try:
+                result = validate_frame_data(json.loads(line), source_file, run_ik, session, live=False)
+            except Exception as e:
+                result = {'error': str(e)}
+            yield json.dumps({'frame': index, **result}) + '\n'
+    finally:
+        if end_session:
+            get_validator().end_session(session)
+
+def generate_binary_results(stream):
+    """Validate a stream of float32 (27, 3) hand frames, yielding one byte per frame (1 = valid)"""
+    frame_bytes = N_JOINTS * 3 * 4
+    chunk_bytes = BINARY_CHUNK_FRAMES * frame_bytes
+    validator = get_validator()
+    pending = b''
+    while True:
+        chunk = stream.read(chunk_bytes - len(pending))
+        if not chunk and not pending:
+            break
+        pending += chunk
+        if chunk and len(pending) < chunk_bytes:
+            continue  # Short read; fill the chunk before validating
+        complete = len(pending) - len(pending) % frame_bytes
+        positions = np.frombuffer(pending[:complete], dtype='<f4').reshape(-1, N_JOINTS, 3)
+        yield validator.validate_frames(positions).astype(np.uint8).tobytes()
+        pending = pending[complete:]
+        if not chunk:
+            break  # A trailing partial frame is ignored
+
+@app.route('/validate/stream', methods=['POST'])
+def validate_stream():
+    """Validate a recorded session streamed as many frames in one request
+    
+    NDJSON bodies (one /validate request body per line) get one JSON result
+    per line back, with IK results unless ?ik=0. application/octet-stream
+    bodies of little-endian float32 (27, 3) hand frames in HandFrame joint
+    order (NaN for missing joints) get one byte per frame back, 1 for valid;
+    they carry no timestamps, so only the static rules are checked.
+    Results are sent as frames are processed, so memory use does not grow
+    with the length of the recording.
+    """
+    source_file = request.headers.get('X-Source-File', 'unknown')
+    if request.mimetype == 'application/octet-stream':
+        return Response(stream_with_context(generate_binary_results(request.stream)),
+                        mimetype='application/octet-stream')
+    run_ik = request.args.get('ik', '1') != '0'
+    # Each stream has its own motion history, dropped at the end, unless it names a session
+    session = request.headers.get('X-Session-Id')
+    end_session = session is None
+    if end_session:
+        session = f'stream-{uuid.uuid4().hex}'
+    return Response(stream_with_context(generate_ndjson_results(request.stream, source_file, run_ik,
+                                                                session, end_session)),
+                    mimetype='application/x-ndjson')
+
+@app.route('/ik/stats', methods=['GET'])
+def ik_stats():
+    """Get IK solver statistics"""
+    if ik_processor is None:
+        return jsonify({
+            "error": "IK processing is not enabled. Start server with --enable-ik flag."
+        }), 400
+    return jsonify(ik_processor.get_stats()), 200
+
+@app.route('/calibration', methods=['GET'])
+def get_calibration():
+    """Get the calibration currently applied to IK requests"""
+    if ik_processor is None:
+        return jsonify({
+            "error": "IK processing is not enabled. Start server with --enable-ik flag."
+        }), 400
+    snapshot = ik_processor.calibration.snapshot
+    if snapshot is None:
+        return jsonify({"version": None, "calibration_file": ik_processor.calibration.calibration_file}), 200
+    return jsonify(snapshot.to_dict()), 200
+
+@app.route('/calibration/reload', methods=['POST'])
+def reload_calibration():
+    """Reload the calibration file; requests in flight finish with the previous one"""
+    if ik_processor is None:
+        return jsonify({
+            "error": "IK processing is not enabled. Start server with --enable-ik flag."
+        }), 400
+    try:
+        snapshot = ik_processor.calibration.reload_calibration()
+    except (OSError, ValueError) as e:
+        return jsonify({"error": str(e), "version": ik_processor.calibration.version}), 400
+    return jsonify(snapshot.to_dict()), 200
+
+@app.route('/plot_jobs/<job_id>', methods=['GET'])
+def get_plot_job(job_id):
+    """Get the status and final plot_path of a background IK plot"""
+    if ik_processor is None or ik_processor.plot_queue is None:
+        return jsonify({
+            "error": "Background plotting is not enabled. Start server with --plot-ik flag."
+        }), 400
+    
+    job = ik_processor.plot_queue.get_job(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown plot job {job_id}"}), 404
+    return jsonify(job), 200
+
 @app.route('/robot/move', methods=['POST', 'OPTIONS'])
 def move_robot():
     """Direct robot control endpoint"""
@@ -169,7 +350,7 @@ def test_simbot_move():
         }
     }
     
-    result = sim_processor.process_movement(test_data["movement"])
+    result = sim_processor.process_movement(test_data["movement"], debug_level='full')
     return jsonify({
         "input": test_data,
         "result": result
@@ -188,7 +369,7 @@ def move_simbot():
         movement_data = data.get('movement', {})
         
         # Process the movement data
-        result = sim_processor.process_movement(movement_data)
+        result = sim_processor.process_movement(movement_data, debug_level=request.args.get('debug'))
         
         return jsonify(result), 200
         
@@ -208,7 +389,7 @@ def get_simbot_position():
 
 @app.route('/get_headset_cache', methods=['GET'])
 def get_headset_cache():
-    """Get the last 10 headset requests and their results."""
+    """Get the last 10 processed headset frames and their poses."""
     log_request('/get_headset_cache')
     
     try:
@@ -223,6 +404,71 @@ def get_headset_cache():
             "details": "Error retrieving cached requests"
         }), 400
 
+@app.route('/sim/smoothing', methods=['GET', 'POST'])
+def sim_smoothing():
+    """Get or change the smoothing of headset-driven arm targets.
+    
+    POST a JSON object with any of 'enabled', 'min_cutoff' (Hz), 'beta' and
+    'd_cutoff' (Hz); the other parameters are left unchanged.
+    """
+    try:
+        if request.method == 'POST':
+            data = request.get_json() if request.is_json else {}
+            params = sim_processor.smoothing.configure(**{
+                name: data[name] for name in ['enabled', 'min_cutoff', 'beta', 'd_cutoff'] if name in data})
+        else:
+            params = sim_processor.smoothing.params()
+        return jsonify(params), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route('/sim/prediction', methods=['GET', 'POST'])
+def sim_prediction():
+    """Get or change the latency-compensating prediction of arm targets.
+    
+    POST a JSON object with any of 'horizon' (seconds, 'auto' or 0 to disable),
+    'process_noise', 'measurement_noise' and 'actuation_delay' (seconds).
+    """
+    try:
+        if request.method == 'POST':
+            data = request.get_json() if request.is_json else {}
+            params = sim_processor.prediction.configure(**{
+                name: data[name] for name in ['horizon', 'process_noise', 'measurement_noise', 'actuation_delay']
+                if name in data})
+        else:
+            params = sim_processor.prediction.params()
+        return jsonify(params), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route('/history', methods=['GET'])
+def get_history():
+    """Query the processed headset frame history.
+    
+    Query parameters (all optional):
+        last: Most recent N frames (default 100 when no time range is given)
+        start, end: Time range in seconds since the epoch, end exclusive
+        stride: Keep every stride-th frame
+        joints: 1 to include each hand's joint positions
+    """
+    try:
+        stride = request.args.get('stride', 1, type=int)
+        if stride < 1:
+            return jsonify({"error": "stride must be at least 1"}), 400
+        start = request.args.get('start', type=float)
+        end = request.args.get('end', type=float)
+        if start is not None or end is not None:
+            records = sim_processor.history.between(start, end, stride)
+        else:
+            records = sim_processor.history.last(request.args.get('last', 100, type=int), stride)
+        return jsonify({
+            **sim_processor.history.stats(),
+            "returned": len(records),
+            "frames": FrameHistory.to_dicts(records, joints=request.args.get('joints') == '1')
+        }), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
 @app.route('/move_simbot_headset', methods=['POST'])
 def move_simbot_headset():
     """Process complex hand tracking data and move the simulated robot."""
@@ -239,12 +485,12 @@ def move_simbot_headset():
             return jsonify({"error": "Missing 'hands' data"}), 400
         
         # Store the latest data with timestamp
-        global latest_headset_data, latest_headset_timestamp
-        latest_headset_data = data
-        latest_headset_timestamp = datetime.now().isoformat()
+        global latest_headset
+        with _headset_lock:
+            latest_headset = HeadsetSnapshot(data, latest_headset.version + 1 if latest_headset else 1)
             
         # Process the headset data
-        result = sim_processor.process_headset_data(data)
+        result = sim_processor.process_headset_data(data, debug_level=request.args.get('debug'))
         
         return jsonify(result), 200
         
@@ -257,15 +503,17 @@ def move_simbot_headset():
 @app.route('/get_latest_headset_data', methods=['GET'])
 def get_latest_headset_data():
     """Get the most recent headset data received by move_simbot_headset."""
-    if latest_headset_data is None:
+    snapshot = latest_headset
+    if snapshot is None:
         return jsonify({
             "error": "No headset data available yet"
         }), 404
         
     return jsonify({
-        "data": latest_headset_data,
-        "timestamp": latest_headset_timestamp,
-        "age_seconds": (datetime.now() - datetime.fromisoformat(latest_headset_timestamp)).total_seconds()
+        "data": snapshot.data,
+        "timestamp": snapshot.timestamp(),
+        "age_seconds": snapshot.age(),
+        "version": snapshot.version
     }), 200
 
 @app.route('/control_hand', methods=['POST'])
@@ -357,11 +605,45 @@ def toggle_hand_updates():
 def run_server(enable_ik: bool = False, plot_ik: bool = False, 
               enable_robot: bool = False, robot_ip: str = '192.168.42.1',
               port: int = 5001, host: str = '0.0.0.0', ssl_context=None,
-              hand_port: str = None, enable_updates: bool = False):
+              hand_port: str = None, enable_updates: bool = False,
+              ik_solver: str = 'analytic', ik_warm_start: bool = True,
+              ik_cache_size: int = 4096, ik_cache_step: float = 0.001,
+              ik_workspace: str = 'ik_workspace.npy', ik_workers: int = 0,
+              ik_executor: str = 'thread', plot_queue_size: int = 8,
+              plot_quality: str = 'high', ik_fit: str = 'tip',
+              calibration_watch: float = 0, debug_level: str = 'summary',
+              history_size: int = 30000, smoothing: bool = True, predict_horizon='0'):
     """Run the Flask server"""
     app.config['ENABLE_IK'] = enable_ik
+    sim_processor.debug_level = debug_level
+    sim_processor.smoothing.configure(enabled=smoothing)
+    sim_processor.prediction.configure(horizon=predict_horizon)
+    if history_size != sim_processor.history.capacity:
+        sim_processor.history = FrameHistory(history_size)
     app.config['PLOT_IK'] = plot_ik
     app.config['ENABLE_ROBOT'] = enable_robot
+    if enable_ik:
+        from ik_cache import IKCache
+        processor = get_ik_processor()
+        processor.ik_solver = ik_solver
+        processor.fit_mode = ik_fit
+        if ik_solver == 'workspace':
+            try:
+                processor.load_workspace(ik_workspace)
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not load IK workspace table {ik_workspace}: {e}")
+                print("Falling back to the analytic solver")
+                processor.ik_solver = 'analytic'
+        if not ik_warm_start:
+            processor.warm_start = None
+        processor.cache = IKCache(ik_cache_size, ik_cache_step) if ik_cache_size > 0 else None
+        processor.set_executor(ik_workers, ik_executor)
+        processor.plot_quality = plot_quality
+        if plot_ik:
+            from plot_queue import PlotQueue
+            processor.plot_queue = PlotQueue(max_pending=plot_queue_size)
+        if calibration_watch > 0:
+            processor.calibration.watch(calibration_watch)
     
     global enable_hand_updates
     enable_hand_updates = enable_updates
@@ -370,6 +652,7 @@ def run_server(enable_ik: bool = False, plot_ik: bool = False,
     global robot_controller
     if enable_robot:
         try:
+            from robot_control import RobotController
             robot_controller = RobotController(robot_ip)
             print(f"Robot control enabled, connected to {robot_ip}")
         except Exception as e:
@@ -380,6 +663,7 @@ def run_server(enable_ik: bool = False, plot_ik: bool = False,
     global hand_controller
     if hand_port:
         try:
+            from hand_cli import HandController
             hand_controller = HandController(port=hand_port)
             print(f"Hand controller enabled, connected to {hand_port}")
         except Exception as e:
@@ -392,12 +676,41 @@ def run_server(enable_ik: bool = False, plot_ik: bool = False,
     print(f"========================")
     print(f"URL: {protocol}://{host}:{port}")
     print(f"IK Processing: {'Enabled' if enable_ik else 'Disabled'}")
-    print(f"IK Plotting: {'Enabled' if plot_ik else 'Disabled'}")
+    print(f"IK Solver: {ik_processor.ik_solver if ik_processor is not None else ik_solver}")
+    print(f"IK Fit: {ik_fit}")
+    print(f"IK Warm Start: {'Enabled' if ik_warm_start else 'Disabled'}")
+    cache_info = f"{ik_cache_size} entries, {ik_cache_step}m step" if ik_cache_size > 0 else "Disabled"
+    print(f"IK Cache: {cache_info}")
+    worker_info = f"{ik_workers} ({ik_executor} pool)" if ik_workers > 0 else "Serial"
+    print(f"IK Workers: {worker_info}")
+    plot_info = f"Enabled ({plot_quality} quality)" if plot_ik else "Disabled"
+    print(f"IK Plotting: {plot_info}")
+    if ik_processor is not None:
+        version = ik_processor.calibration.version
+        watch_info = f", reloaded every {calibration_watch}s on change" if calibration_watch > 0 else ""
+        print(f"Calibration: {'version ' + str(version) if version else 'Not calibrated'}{watch_info}")
     print(f"Robot Control: {'Enabled' if robot_controller else 'Disabled'}")
+    history = sim_processor.history
+    print(f"Frame History: {history.capacity} frames ({history.records.nbytes / 2**20:.0f} MiB)")
+    smoothing_info = "One-Euro, min_cutoff {min_cutoff}Hz, beta {beta}".format(**sim_processor.smoothing.params())
+    print(f"Sim Smoothing: {smoothing_info if smoothing else 'Disabled'}")
+    prediction = sim_processor.prediction
+    prediction_info = f"{prediction.horizon}s ahead" if prediction.horizon != 'auto' else "auto (measured latency + actuation delay)"
+    print(f"Sim Prediction: {prediction_info if prediction.enabled else 'Disabled'}")
+    print(f"Sim Debug Level: {debug_level} (override per request with ?debug={'|'.join(DEBUG_LEVELS)})")
     print("\nEndpoints:")
     print(f"- GET {protocol}://{host}:{port} : Documentation")
     print(f"- GET {protocol}://{host}:{port}/health : Health check")
     print(f"- POST {protocol}://{host}:{port}/validate : Hand validation and IK processing")
+    print(f"- POST {protocol}://{host}:{port}/validate/stream : Validation of NDJSON or binary frame streams")
+    print(f"- GET {protocol}://{host}:{port}/ik/stats : IK solver statistics")
+    print(f"- GET {protocol}://{host}:{port}/history : Headset frame history (?last, ?start, ?end, ?stride, ?joints)")
+    print(f"- GET/POST {protocol}://{host}:{port}/sim/smoothing : Arm target smoothing parameters")
+    print(f"- GET/POST {protocol}://{host}:{port}/sim/prediction : Arm target prediction parameters")
+    print(f"- GET {protocol}://{host}:{port}/calibration : Current calibration")
+    print(f"- POST {protocol}://{host}:{port}/calibration/reload : Reload calibration.json")
+    if plot_ik:
+        print(f"- GET {protocol}://{host}:{port}/plot_jobs/<job_id> : IK plot job status")
     if robot_controller:
         print(f"- POST {protocol}://{host}:{port}/robot/move : Direct robot control")
     print("\nPress Ctrl+C to stop the server")
@@ -412,6 +725,37 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Hand validation and IK processing server')
     parser.add_argument('--enable-ik', action='store_true', help='Enable inverse kinematics processing')
     parser.add_argument('--plot-ik', action='store_true', help='Plot IK results (requires --enable-ik)')
+    parser.add_argument('--plot-queue-size', type=int, default=8,
+                       help='Maximum IK plots waiting to render; the oldest is dropped when full')
+    parser.add_argument('--plot-dpi', choices=['high', 'medium', 'low'], default='high',
+                       help='IK plot quality preset (300, 150 or 72 DPI)')
+    parser.add_argument('--ik-solver', choices=['analytic', 'workspace', 'ikpy'], default='analytic',
+                       help='IK solver for finger chains (analytic falls back to ikpy for unsupported chains)')
+    parser.add_argument('--ik-fit', choices=['tip', 'full_pose'], default='tip',
+                       help='Fit each finger to its tip only, or to its tracked intermediate joint and tip')
+    parser.add_argument('--ik-workspace', default='ik_workspace.npy',
+                       help='Workspace table used by --ik-solver workspace (build with ik_workspace.py)')
+    parser.add_argument('--no-ik-warm-start', action='store_true',
+                       help='Solve every frame from scratch instead of the previous frame\'s solution')
+    parser.add_argument('--ik-workers', type=int, default=0,
+                       help='Workers for solving fingers of both hands concurrently (0 solves serially)')
+    parser.add_argument('--ik-executor', choices=['thread', 'process'], default='thread',
+                       help='Pool type used by --ik-workers (process workers each rebuild the IK model)')
+    parser.add_argument('--ik-cache-size', type=int, default=4096,
+                       help='Maximum number of cached IK solutions (0 disables the cache)')
+    parser.add_argument('--ik-cache-step', type=float, default=0.001,
+                       help='Target quantisation step in metres for the IK cache')
+    parser.add_argument('--watch-calibration', type=float, default=0, metavar='SECONDS',
+                       help='Check calibration.json this often and reload it when it changes (0 disables)')
+    parser.add_argument('--debug-level', choices=DEBUG_LEVELS, default='summary',
+                       help='Debug information in /move_simbot and /move_simbot_headset responses')
+    parser.add_argument('--history-size', type=int, default=30000,
+                       help='Processed headset frames kept for /history (about 0.7KB each)')
+    parser.add_argument('--no-smoothing', action='store_true',
+                       help='Send headset-driven arm targets unfiltered (tune the filter with /sim/smoothing)')
+    parser.add_argument('--predict-horizon', default='0', metavar='SECONDS|auto',
+                       help='Predict headset-driven arm targets this far past the frame timestamp to '
+                            'compensate latency; auto measures it (0 disables)')
     parser.add_argument('--enable-robot', action='store_true', help='Enable robot control')
     parser.add_argument('--robot-ip', default='192.168.42.1', help='Robot IP address')
     parser.add_argument('--port', type=int, default=5001, help='Port to run the server on')
@@ -426,6 +770,10 @@ if __name__ == '__main__':
     
     if args.plot_ik and not args.enable_ik:
         parser.error("--plot-ik requires --enable-ik to be set")
+    try:
+        sim_processor.prediction.configure(horizon=args.predict_horizon)
+    except ValueError:
+        parser.error(f"--predict-horizon must be 'auto' or a number of seconds, got {args.predict_horizon}")
     
     # Configure SSL if certificates provided
     ssl_context = None
@@ -441,5 +789,20 @@ if __name__ == '__main__':
         host=args.host,
         ssl_context=ssl_context,
         hand_port=args.hand_port,
-        enable_updates=args.enable_hand_updates
+        enable_updates=args.enable_hand_updates,
+        ik_solver=args.ik_solver,
+        ik_warm_start=not args.no_ik_warm_start,
+        ik_cache_size=args.ik_cache_size,
+        ik_cache_step=args.ik_cache_step,
+        ik_workspace=args.ik_workspace,
+        ik_workers=args.ik_workers,
+        ik_executor=args.ik_executor,
+        plot_queue_size=args.plot_queue_size,
+        plot_quality=args.plot_dpi,
+        ik_fit=args.ik_fit,
+        calibration_watch=args.watch_calibration,
+        debug_level=args.debug_level,
+        history_size=args.history_size,
+        smoothing=not args.no_smoothing,
+        predict_horizon=args.predict_horizon
     )
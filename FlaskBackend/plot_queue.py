@@ -0,0 +1,137 @@
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime
+from threading import Condition, Thread
+from typing import Any, Callable, Dict, Optional
+
+
+class PlotQueue:
+    """Background render queue for IK plots
+
+    Rendering a 3D figure at 300 DPI takes hundreds of milliseconds, far more
+    than the IK itself, so requests hand their plots to this queue and return
+    straight away with a job id. A single worker thread renders jobs in order.
+
+    The queue holds at most ``max_pending`` jobs. When it is full the oldest
+    pending job is dropped, since during streaming the newest frame is the one
+    worth looking at. Job statuses are kept for the last ``max_history`` jobs.
+    """
+
+    def __init__(self, max_pending: int = 8, max_history: int = 1000):
+        """Start the render worker
+
+        Args:
+            max_pending: Maximum number of jobs waiting to be rendered
+            max_history: Number of finished job statuses to remember
+        """
+        self.max_pending = max_pending
+        self.max_history = max_history
+        self._pending = deque()
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._condition = Condition()
+        self.stats = {
+            'submitted': 0,
+            'rendered': 0,
+            'dropped': 0,
+            'failed': 0
+        }
+        self._worker = Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, render: Callable[..., str], *args, **kwargs) -> str:
+        """Queue a plot for rendering
+
+        Args:
+            render: Callable that renders the plot and returns its path
+            *args, **kwargs: Arguments for the callable
+
+        Returns:
+            Job id to poll with get_job()
+        """
+        job_id = uuid.uuid4().hex
+        with self._condition:
+            if len(self._pending) >= self.max_pending:
+                dropped_id, _, _, _ = self._pending.popleft()
+                self._jobs[dropped_id]['status'] = 'dropped'
+                self.stats['dropped'] += 1
+            self._pending.append((job_id, render, args, kwargs))
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'status': 'queued',
+                'plot_path': None,
+                'error': None,
+                'submitted_at': datetime.now().isoformat()
+            }
+            self.stats['submitted'] += 1
+            self._trim_history()
+            self._condition.notify_all()
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get the status of a plot job
+
+        Args:
+            job_id: Id returned by submit()
+
+        Returns:
+            Job status dictionary (status is queued, rendering, done, dropped
+            or failed; plot_path is set once done), or None if unknown
+        """
+        with self._condition:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get render queue counters"""
+        with self._condition:
+            stats = dict(self.stats)
+            stats['pending'] = len(self._pending)
+            return stats
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued job has been handled
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not any(
+                    job['status'] == 'rendering' for job in self._jobs.values()),
+                timeout=timeout)
+
+    def _trim_history(self) -> None:
+        """Forget the oldest finished jobs beyond max_history (lock held)"""
+        excess = len(self._jobs) - self.max_history
+        for job_id in list(self._jobs):
+            if excess <= 0:
+                break
+            if self._jobs[job_id]['status'] in ('done', 'dropped', 'failed'):
+                del self._jobs[job_id]
+                excess -= 1
+
+    def _run(self) -> None:
+        """Worker loop rendering queued jobs one at a time"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                job_id, render, args, kwargs = self._pending.popleft()
+                self._jobs[job_id]['status'] = 'rendering'
+
+            try:
+                plot_path = render(*args, **kwargs)
+                update = {'status': 'done', 'plot_path': plot_path}
+                counter = 'rendered'
+            except Exception as e:
+                print(f"Error rendering plot: {str(e)}")
+                update = {'status': 'failed', 'error': str(e)}
+                counter = 'failed'
+
+            with self._condition:
+                self._jobs[job_id].update(update)
+                self._jobs[job_id]['finished_at'] = datetime.now().isoformat()
+                self.stats[counter] += 1
+                self._condition.notify_all()
@@ -0,0 +1,118 @@
+import numpy as np
+from threading import Lock
+from typing import Any, Dict, Optional
+
+
+class OneEuroFilter:
+    """Adaptive low-pass filter (One-Euro) over a fixed set of signals
+
+    Each signal is smoothed with an exponential filter whose cutoff rises with
+    its speed: slow movements are heavily smoothed (no jitter) and fast ones
+    barely (little lag). The state for all signals lives in arrays of the
+    given shape, so both arms and all axes are updated in one vector step.
+    Each row of the first axis (one arm) can be updated or skipped per frame.
+
+    See Casiez et al., "1 Euro Filter", CHI 2012.
+    """
+
+    def __init__(self, shape=(2, 3), min_cutoff: float = 1.0, beta: float = 0.2,
+                 d_cutoff: float = 1.0, reset_after: float = 1.0):
+        """Set up the filter
+
+        Args:
+            shape: Shape of the filtered values; rows of the first axis are
+                updated independently
+            min_cutoff: Cutoff frequency in Hz at rest; lower is smoother
+            beta: Cutoff increase in Hz per unit/s of speed; higher lags less when
+                moving fast (the default suits sim units, -50 to 50)
+            d_cutoff: Cutoff frequency in Hz for the speed estimate
+            reset_after: Seconds without an update after which a row starts over
+        """
+        self.shape = tuple(shape)
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset_after = reset_after
+        self.enabled = True
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the filter state"""
+        self.value = np.zeros(self.shape)
+        self.derivative = np.zeros(self.shape)
+        self.time = np.zeros(self.shape[0])
+        self.initialized = np.zeros(self.shape[0], dtype=bool)
+
+    def configure(self, enabled: Optional[bool] = None, min_cutoff: Optional[float] = None,
+                  beta: Optional[float] = None, d_cutoff: Optional[float] = None) -> Dict[str, Any]:
+        """Change parameters at runtime; None leaves a parameter unchanged
+
+        Returns:
+            The current parameters
+        """
+        with self._lock:
+            for name, value in [('min_cutoff', min_cutoff), ('beta', beta), ('d_cutoff', d_cutoff)]:
+                if value is not None:
+                    if value < 0 or (name != 'beta' and value == 0):
+                        raise ValueError(f"{name} must be positive, got {value}")
+                    setattr(self, name, float(value))
+            if enabled is not None:
+                self.enabled = bool(enabled)
+                self.reset()
+            return self.params()
+
+    def params(self) -> Dict[str, Any]:
+        """Get the current parameters"""
+        return {
+            'enabled': self.enabled,
+            'min_cutoff': self.min_cutoff,
+            'beta': self.beta,
+            'd_cutoff': self.d_cutoff
+        }
+
+    @staticmethod
+    def _alpha(cutoff: np.ndarray, dt: np.ndarray) -> np.ndarray:
+        """Smoothing factor of an exponential filter with the given cutoff"""
+        tau = 1.0 / (2 * np.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def update(self, values: np.ndarray, timestamp: float, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Filter new values
+
+        Args:
+            values: Array of the filter's shape
+            timestamp: Time of the values in seconds
+            mask: Boolean array of shape (shape[0],), the rows to update;
+                default all
+
+        Returns:
+            Filtered values; rows not updated hold their previous output
+        """
+        values = np.asarray(values, dtype=float)
+        if mask is None:
+            mask = np.ones(self.shape[0], dtype=bool)
+        with self._lock:
+            if not self.enabled:
+                return values.copy()
+
+            dt = timestamp - self.time
+            restart = mask & (~self.initialized | (dt > self.reset_after))
+            step = mask & ~restart & (dt > 0)  # Repeated timestamps keep the last output
+            if step.any():
+                rows = slice(None) if step.all() else step  # Usually every row; slicing is cheaper
+                dt_rows = dt[rows].reshape((-1,) + (1,) * (len(self.shape) - 1))
+                previous = self.value[rows]
+                derivative = self.derivative[rows] + self._alpha(self.d_cutoff, dt_rows) * (
+                    (values[rows] - previous) / dt_rows - self.derivative[rows])
+                cutoff = self.min_cutoff + self.beta * np.abs(derivative)
+                self.value[rows] = previous + self._alpha(cutoff, dt_rows) * (values[rows] - previous)
+                self.derivative[rows] = derivative
+                self.time[rows] = timestamp
+
+            if restart.any():
+                self.value[restart] = values[restart]
+                self.derivative[restart] = 0.0
+                self.time[restart] = timestamp
+                self.initialized |= restart
+            return self.value.copy()
@@ -0,0 +1,221 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+from analytic_ik import AnalyticFingerSolver, _axis_terms
+
+
+def _trig_derivative_rows(q: np.ndarray) -> np.ndarray:
+    """Return [1, cos q, sin q] and its first two derivatives for many angles
+
+    Args:
+        q: Array of shape (P,)
+
+    Returns:
+        Array of shape (P, 3, 3); row d holds the d-th derivative of the basis
+    """
+    c, s = np.cos(q), np.sin(q)
+    one, zero = np.ones_like(q), np.zeros_like(q)
+    return np.stack([
+        np.stack([one, c, s], axis=-1),
+        np.stack([zero, -s, c], axis=-1),
+        np.stack([zero, -c, -s], axis=-1)
+    ], axis=1)
+
+
+def _intermediate_form(solver: AnalyticFingerSolver) -> np.ndarray:
+    """Split the intermediate joint position of a chain into its trig parts
+
+    Args:
+        solver: Analytic solver for the chain
+
+    Returns:
+        Array of shape (3, 3) so that intermediate - d0 = sum_i g_i(q1) form[i]
+    """
+    knuckle, intermediate = solver.chain.links[1:3]
+    ka = _axis_terms(np.asarray(knuckle.rotation, dtype=float))
+    return ka @ np.asarray(intermediate.origin_translation, dtype=float)
+
+
+class BatchPoseFitter:
+    """Fits finger chains to all of their tracked joints, many fingers at once
+
+    Tip-only IK ignores the intermediate joints the headset tracks, so any
+    (q1, q2) pair that puts the tip in the same place is equally good. Fitting
+    the intermediate joint as well pins down the knuckle direction, which gives
+    a better-conditioned problem and a pose that looks like the tracked hand.
+
+    For the knuckle + two bend chains the knuckle joint sits at the chain base,
+    and the last bend does not move any point. The chain therefore has two
+    points that depend on the angles: the intermediate joint, which is linear
+    in the knuckle's [1, cos q1, sin q1] basis, and the tip, which is the
+    bilinear form from AnalyticFingerSolver. Both are precomputed per chain.
+    Every problem in a batch (e.g. the ten fingers of both hands) is then solved
+    together by a damped Newton iteration. Exact Jacobians and Hessians are
+    evaluated for the whole batch with a few tensor contractions.
+    """
+
+    def __init__(self, solvers: Dict[str, AnalyticFingerSolver],
+                 weights: Sequence[float] = (1.0, 1.0), max_iterations: int = 20,
+                 tolerance: float = 1e-12):
+        """Precompute the point forms of every chain
+
+        Args:
+            solvers: Mapping of finger name to the analytic solver for its chain
+            weights: Residual weights for the intermediate joint and the tip
+            max_iterations: Maximum number of Newton iterations per batch
+            tolerance: A problem stops once its squared step falls below this
+        """
+        self.names = list(solvers)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.n_links = {name: solver.n_links for name, solver in solvers.items()}
+        self.weights = np.asarray(weights, dtype=float)
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+
+        self.bases = np.array([solvers[name].base for name in self.names])
+        self.forms = np.array([solvers[name].form for name in self.names])
+        self.mid_forms = np.array([
+            # intermediate - d0 = sum_i g_i(q1) mid_form[i]
+            _intermediate_form(solvers[name]) for name in self.names
+        ])
+        self.bounds = np.array([solvers[name].bounds for name in self.names])
+        self.periodic = np.array([solvers[name].periodic for name in self.names])
+
+        # Every solver samples the same grid, so the seeds can be shared
+        self.seeds = solvers[self.names[0]].seeds if self.names else np.zeros((0, 2))
+        seed_mids = self.bases[:, None] + np.einsum(
+            'si,cik->csk', _trig_derivative_rows(self.seeds[:, 0])[:, 0], self.mid_forms)
+        seed_tips = np.array([solvers[name].seed_tips for name in self.names])
+        self.seed_points = np.stack([seed_mids, seed_tips], axis=2)
+
+    def __contains__(self, finger_name: str) -> bool:
+        return finger_name in self.index
+
+    def _points(self, q: np.ndarray, chains: np.ndarray) -> tuple:
+        """Intermediate and tip positions with exact derivatives for a batch
+
+        Args:
+            q: Knuckle and first bend angles, shape (P, 2)
+            chains: Chain index of each problem, shape (P,)
+
+        Returns:
+            tuple: (points (P, 2, 3), jacobians (P, 2, 3, 2), hessians (P, 2, 3, 2, 2))
+        """
+        g = _trig_derivative_rows(q[:, 0])
+        h = _trig_derivative_rows(q[:, 1])
+        base = self.bases[chains]
+
+        # terms[:, a, b] is the tip form differentiated a times in q1 and b times in q2
+        knuckle = np.einsum('pai,pijk->pajk', g, self.forms[chains])
+        terms = np.einsum('pbj,pajk->pabk', h, knuckle)
+        mid_terms = np.einsum('pai,pik->pak', g, self.mid_forms[chains])
+        zero = np.zeros_like(mid_terms[:, 0])
+
+        points = np.stack([base + mid_terms[:, 0], base + terms[:, 0, 0]], axis=1)
+        jacobians = np.stack([
+            np.stack([mid_terms[:, 1], zero], axis=-1),
+            np.stack([terms[:, 1, 0], terms[:, 0, 1]], axis=-1)
+        ], axis=1)
+        hessians = np.stack([
+            np.stack([np.stack([mid_terms[:, 2], zero], axis=-1),
+                      np.stack([zero, zero], axis=-1)], axis=-2),
+            np.stack([np.stack([terms[:, 2, 0], terms[:, 1, 1]], axis=-1),
+                      np.stack([terms[:, 1, 1], terms[:, 0, 2]], axis=-1)], axis=-2)
+        ], axis=1)
+        return points, jacobians, hessians
+
+    def _project(self, q: np.ndarray, chains: np.ndarray) -> np.ndarray:
+        """Wrap continuous joints and clip the others to their bounds"""
+        low, high = self.bounds[chains, :, 0], self.bounds[chains, :, 1]
+        wrapped = low + np.mod(q - low, 2 * np.pi)
+        return np.where(self.periodic[chains], wrapped, np.clip(q, low, high))
+
+    def fit(self, finger_names: List[str], targets: np.ndarray,
+            initial_positions: Optional[List[Optional[np.ndarray]]] = None) -> tuple:
+        """Fit a batch of fingers to their tracked intermediate joints and tips
+
+        Args:
+            finger_names: Finger chain of each problem
+            targets: Array of shape (P, 2, 3) with the intermediate joint and tip
+                targets; a NaN intermediate target fits the tip only
+            initial_positions: Optional full joint vector per problem (None
+                entries seed from the grid)
+
+        Returns:
+            tuple: (list of full joint vectors, array of Newton iterations per problem)
+        """
+        if not finger_names:
+            return [], np.zeros(0, dtype=int)
+        targets = np.array(targets, dtype=float).reshape(len(finger_names), 2, 3)
+        chains = np.array([self.index[name] for name in finger_names], dtype=int)
+        if initial_positions is None:
+            initial_positions = [None] * len(finger_names)
+
+        # Missing joints drop out of the residual
+        weights = np.where(np.isnan(targets).any(axis=2), 0.0, self.weights)
+        targets = np.nan_to_num(targets)
+
+        # Seed from the grid by the full-pose cost, or from the given solution
+        offsets = self.seed_points[chains] - targets[:, None]
+        seed_costs = (weights[:, None] ** 2 * np.einsum('psmk,psmk->psm', offsets, offsets)).sum(axis=2)
+        q = self.seeds[np.argmin(seed_costs, axis=1)].copy()
+        solutions = []
+        for i, (name, initial) in enumerate(zip(finger_names, initial_positions)):
+            solution = np.zeros(self.n_links[name]) if initial is None else np.array(initial, dtype=float)
+            if initial is not None:
+                q[i] = solution[1:3]
+            solutions.append(solution)
+        q = self._project(q, chains)
+
+        points, jacobians, hessians = self._points(q, chains)
+        residuals = weights[:, :, None] * (points - targets)
+        costs = np.einsum('pmk,pmk->p', residuals, residuals)
+        low, high = self.bounds[chains, :, 0], self.bounds[chains, :, 1]
+        periodic = self.periodic[chains]
+        damping = np.zeros(len(chains))
+        active = np.ones(len(chains), dtype=bool)
+        iterations = np.zeros(len(chains), dtype=int)
+        eye = np.eye(2)
+
+        for _ in range(self.max_iterations):
+            if not active.any():
+                break
+            iterations += active
+            weighted_jacobians = weights[:, :, None, None] * jacobians
+            gradients = np.einsum('pmk,pmkj->pj', residuals, weighted_jacobians)
+            curvatures = (np.einsum('pmki,pmkj->pij', weighted_jacobians, weighted_jacobians) +
+                          np.einsum('pmk,pmkij->pij', residuals, weights[:, :, None, None, None] * hessians))
+
+            # Joints pinned at a bound by the gradient stay there
+            pinned = ~periodic & (((q <= low) & (gradients > 0)) | ((q >= high) & (gradients < 0)))
+            active &= ~pinned.all(axis=1)
+            free = (~pinned).astype(float)
+            gradients = gradients * free
+            curvatures = curvatures * free[:, :, None] * free[:, None, :] + eye * (1 - free)[:, None, :]
+
+            # Shift each 2x2 system until it is positive definite
+            scale = np.trace(curvatures, axis1=1, axis2=2) / 2
+            scale = np.where(scale > 0, scale, 1.0)
+            a, b, c = curvatures[:, 0, 0], curvatures[:, 0, 1], curvatures[:, 1, 1]
+            lowest = (a + c) / 2 - np.sqrt(((a - c) / 2) ** 2 + b ** 2)
+            shift = np.maximum(damping * scale, np.where(lowest <= 0, 1e-9 * scale - lowest, 0.0))
+            steps = -np.linalg.solve(curvatures + shift[:, None, None] * eye, gradients[..., None])[..., 0]
+            steps *= active[:, None]
+
+            candidates = self._project(q + steps, chains)
+            candidate_points, candidate_jacobians, candidate_hessians = self._points(candidates, chains)
+            candidate_residuals = weights[:, :, None] * (candidate_points - targets)
+            candidate_costs = np.einsum('pmk,pmk->p', candidate_residuals, candidate_residuals)
+
+            accepted = active & (candidate_costs <= costs)
+            damping = np.where(accepted, damping * 0.1, np.where(active, np.maximum(damping * 10, 1e-3), damping))
+            q = np.where(accepted[:, None], candidates, q)
+            costs = np.where(accepted, candidate_costs, costs)
+            residuals = np.where(accepted[:, None, None], candidate_residuals, residuals)
+            jacobians = np.where(accepted[:, None, None, None], candidate_jacobians, jacobians)
+            hessians = np.where(accepted[:, None, None, None, None], candidate_hessians, hessians)
+            active &= ~(accepted & (np.einsum('pj,pj->p', steps, steps) < self.tolerance))
+
+        for solution, angles in zip(solutions, q):
+            solution[1:3] = angles
+        return solutions, iterations
+
@@ -0,0 +1,178 @@
+import numpy as np
+from threading import Lock
+from typing import Any, Dict, Optional, Union
+
+
+class KalmanPredictor:
+    """Constant-velocity Kalman filter that extrapolates arm targets ahead in time
+
+    Each axis of each arm is an independent position/velocity filter. The
+    state and covariance of all of them are kept in arrays of shape
+    (arms, 3), so one vector step filters both hands. Rows (arms) missing
+    from a frame are skipped. The filter runs on the frames' arrival times,
+    since headset timestamps usually only resolve whole seconds. Each estimate
+    is projected ``horizon`` seconds past the arrival, to when the robot will
+    act on it, so the arm no longer trails the operator by the pipeline latency.
+
+    The horizon is fixed, or 'auto': the measured delay between the frame's
+    capture time and its arrival, plus ``actuation_delay``. Measuring the delay
+    needs sub-second capture times from a headset clock synchronised with the
+    server's; otherwise only ``actuation_delay`` is used.
+    """
+
+    def __init__(self, arms: int = 2, horizon: Union[float, str] = 0.0,
+                 process_noise: float = 2000.0, measurement_noise: float = 0.25,
+                 actuation_delay: float = 0.05, max_horizon: float = 0.3,
+                 reset_after: float = 1.0):
+        """Set up the predictor
+
+        Args:
+            arms: Number of rows (one per arm)
+            horizon: Seconds to predict ahead, or 'auto'; 0 disables prediction
+            process_noise: Acceleration noise spectral density (units^2/s^3);
+                higher follows changes of speed faster but passes more noise
+            measurement_noise: Variance of the measured positions (units^2)
+            actuation_delay: Seconds from processing to the robot moving, added
+                to the measured latency in 'auto' mode
+            max_horizon: Upper limit of the 'auto' horizon in seconds
+            reset_after: Seconds without a measurement after which a row starts over
+        """
+        self.arms = arms
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.actuation_delay = actuation_delay
+        self.max_horizon = max_horizon
+        self.reset_after = reset_after
+        self.horizon = self._check_horizon(horizon)
+        self.latency = 0.0  # Moving average of arrival time minus capture time
+        self._lock = Lock()
+        self.reset()
+
+    @staticmethod
+    def _check_horizon(horizon: Union[float, str]) -> Union[float, str]:
+        """Check that a horizon is 'auto' or a non-negative number of seconds"""
+        if horizon == 'auto':
+            return horizon
+        horizon = float(horizon)
+        if horizon < 0:
+            raise ValueError(f"Prediction horizon must be 'auto' or at least 0, got {horizon}")
+        return horizon
+
+    def reset(self) -> None:
+        """Forget the filter state"""
+        shape = (self.arms, 3)
+        self.position = np.zeros(shape)
+        self.velocity = np.zeros(shape)
+        # Symmetric 2x2 covariance per axis: var(position), cov, var(velocity)
+        self.p_pp = np.zeros(shape)
+        self.p_pv = np.zeros(shape)
+        self.p_vv = np.zeros(shape)
+        self.time = np.zeros(self.arms)
+        self.initialized = np.zeros(self.arms, dtype=bool)
+
+    @property
+    def enabled(self) -> bool:
+        return self.horizon == 'auto' or self.horizon > 0
+
+    def configure(self, horizon: Optional[Union[float, str]] = None,
+                  process_noise: Optional[float] = None, measurement_noise: Optional[float] = None,
+                  actuation_delay: Optional[float] = None) -> Dict[str, Any]:
+        """Change parameters at runtime; None leaves a parameter unchanged
+
+        Returns:
+            The current parameters
+        """
+        with self._lock:
+            for name, value in [('process_noise', process_noise), ('measurement_noise', measurement_noise)]:
+                if value is not None:
+                    if value <= 0:
+                        raise ValueError(f"{name} must be positive, got {value}")
+                    setattr(self, name, float(value))
+            if actuation_delay is not None:
+                if actuation_delay < 0:
+                    raise ValueError(f"actuation_delay must be at least 0, got {actuation_delay}")
+                self.actuation_delay = float(actuation_delay)
+            if horizon is not None:
+                self.horizon = self._check_horizon(horizon)
+                self.reset()
+            return self.params()
+
+    def params(self) -> Dict[str, Any]:
+        """Get the current parameters and the horizon in use"""
+        return {
+            'enabled': self.enabled,
+            'horizon': self.horizon,
+            'horizon_seconds': self.current_horizon(),
+            'measured_latency': self.latency,
+            'process_noise': self.process_noise,
+            'measurement_noise': self.measurement_noise,
+            'actuation_delay': self.actuation_delay
+        }
+
+    def current_horizon(self) -> float:
+        """Seconds ahead of the frame arrival that targets are predicted"""
+        if self.horizon == 'auto':
+            return float(np.clip(self.latency + self.actuation_delay, 0.0, self.max_horizon))
+        return self.horizon
+
+    def update(self, measurements: np.ndarray, timestamp: float, mask: Optional[np.ndarray] = None,
+               sent_at: Optional[float] = None) -> np.ndarray:
+        """Filter new measurements and predict them ahead
+
+        Args:
+            measurements: Array of shape (arms, 3)
+            timestamp: Arrival time of the frame in seconds
+            mask: Boolean array of shape (arms,), the rows measured in this
+                frame; default all
+            sent_at: Capture time of the frame, for measuring the latency
+
+        Returns:
+            Predicted positions of shape (arms, 3); rows not measured are
+            returned unchanged
+        """
+        measurements = np.asarray(measurements, dtype=float)
+        if mask is None:
+            mask = np.ones(self.arms, dtype=bool)
+        with self._lock:
+            if not self.enabled:
+                return measurements.copy()
+            if sent_at is not None and 0 <= timestamp - sent_at <= self.reset_after:
+                # Delays outside that range mean the headset clock isn't synchronised with ours
+                self.latency += 0.1 * (timestamp - sent_at - self.latency)
+
+            dt = timestamp - self.time
+            restart = mask & (~self.initialized | (dt > self.reset_after) | (dt < 0))
+            step = mask & ~restart
+            if restart.any():
+                self.position[restart] = measurements[restart]
+                self.velocity[restart] = 0.0
+                self.p_pp[restart] = self.measurement_noise
+                self.p_pv[restart] = 0.0
+                self.p_vv[restart] = 1e4  # Speed unknown until the next measurement
+                self.time[restart] = timestamp
+                self.initialized |= restart
+
+            if step.any():
+                dt = np.where(step, dt, 0.0)[:, None]
+                q = self.process_noise
+
+                # Predict to the measurement time (no change for repeated timestamps)
+                position = self.position + self.velocity * dt
+                p_pp = self.p_pp + dt * (2 * self.p_pv + dt * self.p_vv) + q * dt ** 3 / 3
+                p_pv = self.p_pv + dt * self.p_vv + q * dt ** 2 / 2
+                p_vv = self.p_vv + q * dt
+
+                # Correct with the measurement
+                innovation = measurements - position
+                gain_p = p_pp / (p_pp + self.measurement_noise)
+                gain_v = p_pv / (p_pp + self.measurement_noise)
+                rows = step[:, None]
+                self.position = np.where(rows, position + gain_p * innovation, self.position)
+                self.velocity = np.where(rows, self.velocity + gain_v * innovation, self.velocity)
+                self.p_vv = np.where(rows, p_vv - gain_v * p_pv, self.p_vv)
+                self.p_pp = np.where(rows, (1 - gain_p) * p_pp, self.p_pp)
+                self.p_pv = np.where(rows, (1 - gain_p) * p_pv, self.p_pv)
+                self.time = np.where(step, timestamp, self.time)
+
+            predicted = self.position + self.velocity * self.current_horizon()
+            return np.where(mask[:, None], predicted, measurements)
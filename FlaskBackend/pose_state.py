@@ -0,0 +1,116 @@
+import time
+import numpy as np
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, Mapping, Optional
+from frame_history import ARMS
+
+
+class PoseSnapshot:
+    """Immutable arm pose of the simulated robot at one version
+
+    Writers never change a snapshot; they publish a new one. Readers take the
+    current snapshot with a single attribute read and get both arms from the
+    same update without any lock.
+    """
+
+    __slots__ = ('positions', 'version', 'updated_at')
+
+    def __init__(self, positions: np.ndarray, version: int = 0, updated_at: Optional[float] = None):
+        """Freeze a pose
+
+        Args:
+            positions: Array of shape (2, 3), leftArm then rightArm
+            version: Number of poses published before this one
+            updated_at: Publish time in seconds since the epoch
+        """
+        self.positions = np.array(positions, dtype=float)
+        self.positions.setflags(write=False)
+        self.version = version
+        self.updated_at = updated_at if updated_at is not None else time.time()
+
+    def arm(self, arm: str) -> Dict[str, float]:
+        """Get one arm's position as an {'x', 'y', 'z'} dictionary"""
+        x, y, z = self.positions[ARMS.index(arm)].tolist()
+        return {"x": x, "y": y, "z": z}
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """Get both arms' positions keyed by arm"""
+        return {arm: self.arm(arm) for arm in ARMS}
+
+
+class PoseState:
+    """Publishes PoseSnapshots for concurrent readers and writers
+
+    Writers build the next snapshot from the current one under a lock that
+    only other writers take, so concurrent partial updates (one arm each) are
+    not lost. Readers only read ``snapshot``, which is replaced in a single
+    reference assignment, so polling never waits on or delays the ingest path.
+    """
+
+    def __init__(self, positions: Mapping[str, Mapping[str, float]]):
+        """Publish the initial pose
+
+        Args:
+            positions: {'x', 'y', 'z'} per arm
+        """
+        self._publish_lock = Lock()
+        self.snapshot = PoseSnapshot(self._to_array(positions))
+
+    @staticmethod
+    def _to_array(positions: Mapping[str, Mapping[str, float]],
+                  base: Optional[np.ndarray] = None) -> np.ndarray:
+        """Convert per-arm dictionaries to a (2, 3) array, keeping ``base`` for missing arms"""
+        array = np.zeros((len(ARMS), 3)) if base is None else base.copy()
+        for index, arm in enumerate(ARMS):
+            if arm in positions:
+                array[index] = (positions[arm]["x"], positions[arm]["y"], positions[arm]["z"])
+        return array
+
+    def publish(self, positions: Mapping[str, Mapping[str, float]]) -> PoseSnapshot:
+        """Publish a new pose with some arms moved
+
+        Args:
+            positions: {'x', 'y', 'z'} for each arm that moved; other arms keep
+                their current position
+
+        Returns:
+            The published snapshot, or the current one if no arm moved
+        """
+        with self._publish_lock:
+            current = self.snapshot
+            if not any(arm in positions for arm in ARMS):
+                return current
+            snapshot = PoseSnapshot(self._to_array(positions, current.positions), current.version + 1)
+            self.snapshot = snapshot
+            return snapshot
+
+
+class HeadsetSnapshot:
+    """The latest headset frame received, with its arrival time
+
+    The frame dictionary is shared, not copied; it must not be modified after
+    it is published.
+    """
+
+    __slots__ = ('data', 'received_at', 'version')
+
+    def __init__(self, data: Dict[str, Any], version: int, received_at: Optional[float] = None):
+        """Wrap a received frame
+
+        Args:
+            data: The headset frame as received
+            version: Number of frames received before this one
+            received_at: Arrival time in seconds since the epoch
+        """
+        self.data = data
+        self.version = version
+        self.received_at = received_at if received_at is not None else time.time()
+
+    def timestamp(self) -> str:
+        """Arrival time as an ISO 8601 string"""
+        return datetime.fromtimestamp(self.received_at).isoformat()
+
+    def age(self) -> float:
+        """Seconds since the frame arrived"""
+        return time.time() - self.received_at
@@ -1,16 +1,41 @@
-from collections import deque
-from datetime import datetime
+import time
+import numpy as np
+from frame_history import FrameHistory, ARMS, HANDS
+from hand_frame import HandFrame, N_JOINTS, parse_timestamp
+from pose_filter import OneEuroFilter
+from pose_predictor import KalmanPredictor
+from pose_state import PoseState
+
+# Sim target limits per axis (x, y, z)
+POSE_LOWER = np.array([-50.0, -50.0, 0.0])
+POSE_UPPER = np.array([50.0, 50.0, 60.0])
+
+# How much debug information responses carry: nothing, a few counts, or the
+# full echo of the input with the mapping tables
+DEBUG_LEVELS = ['none', 'summary', 'full']
 
 class SimProcessor:
-    def __init__(self):
-        """Initialize the simulation processor."""
-        self.current_position = {
+    def __init__(self, debug_level='summary', history_size=30000):
+        """Initialize the simulation processor.
+        
+        Args:
+            debug_level (str): Default debug level of responses, one of DEBUG_LEVELS
+            history_size (int): Number of processed headset frames kept in the history
+        """
+        self.debug_level = self._check_debug_level(debug_level)
+        # Current pose, published as immutable versioned snapshots
+        self.pose_state = PoseState({
             "rightArm": {"x": 0, "y": 0, "z": 30},
             "leftArm": {"x": 0, "y": 0, "z": 30}
-        }
+        })
         
-        # Request cache using deque for efficient fixed-size queue
-        self.request_cache = deque(maxlen=10)
+        # Fixed-size history of processed headset frames (joints and resulting pose)
+        self.history = FrameHistory(history_size)
+        
+        # Latency-compensating prediction (off until a horizon is set) and adaptive
+        # smoothing of the headset-driven arm targets, both arms at once
+        self.prediction = KalmanPredictor(len(ARMS))
+        self.smoothing = OneEuroFilter((len(ARMS), 3))
         
         # Mapping of hand points to robot controls
         self.hand_mapping = {
@@ -37,50 +62,87 @@ class SimProcessor:
             "z": 0.3       # Shift z to positive range (-0.3-0.0 -> 0-0.3)
         }
 
-    def _cache_request(self, request_data, processed_result):
-        """Cache a request and its processed result.
+    def _filter_pose(self, pose, frame_time=None, received_at=None):
+        """Predict and smooth the arm targets of a headset frame in place.
+        
+        Both filters run on the arrival time, since headset timestamps are
+        often only to the second.
+        
+        Args:
+            pose (dict): Arm poses computed from the frame, keyed by arm
+            frame_time (float, optional): Frame timestamp in seconds; used only
+                to measure the latency, and only if it has sub-second precision
+            received_at (float, optional): Arrival time in seconds, default now
+        """
+        targets = np.full((len(ARMS), 3), np.nan)
+        updated = np.array([arm in pose for arm in ARMS])
+        for index, arm in enumerate(ARMS):
+            if updated[index]:
+                targets[index] = (pose[arm]["x"], pose[arm]["y"], pose[arm]["z"])
+        if received_at is None:
+            received_at = time.time()
+        
+        # Extrapolate to when the robot acts on the target
+        sent_at = frame_time if frame_time is not None and frame_time % 1 else None
+        targets = self.prediction.update(targets, received_at, updated, sent_at)
+        targets = np.clip(targets, POSE_LOWER, POSE_UPPER)
+        targets = self.smoothing.update(targets, received_at, updated)
+        for index in np.flatnonzero(updated):
+            x, y, z = targets[index].tolist()
+            pose[ARMS[index]] = {"x": x, "y": y, "z": z}
+
+    def _record_frame(self, frames, pose):
+        """Add a processed headset frame to the history.
         
         Args:
-            request_data (dict): The original request data
-            processed_result (dict): The processed result
+            frames (dict): HandFrame per hand ('left'/'right') that was received
+            pose (dict): Arm poses computed from the frame
         """
-        cache_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "request": request_data,
-            "result": processed_result
-        }
-        self.request_cache.append(cache_entry)
+        hands = np.full((len(HANDS), N_JOINTS, 3), np.nan)
+        for index, hand in enumerate(HANDS):
+            if hand in frames:
+                hands[index] = frames[hand].positions
+        arms = np.full((len(ARMS), 3), np.nan)
+        for index, arm in enumerate(ARMS):
+            if arm in pose:
+                arms[index] = (pose[arm]["x"], pose[arm]["y"], pose[arm]["z"])
+        self.history.append(time.time(), hands, arms)
 
-    def get_cached_requests(self):
-        """Get the cached requests.
+    def get_cached_requests(self, count=10):
+        """Get the most recent processed headset frames.
         
+        Args:
+            count (int): Number of frames
+            
         Returns:
-            list: List of cached requests, most recent first
+            list: Entries with 'timestamp' and the resulting 'pose', oldest first
         """
-        return list(self.request_cache)
+        return [
+            {"timestamp": entry["time"], "result": {"pose": entry["pose"]}}
+            for entry in FrameHistory.to_dicts(self.history.last(count))
+        ]
 
-    def process_movement(self, movement_data):
+    def _check_debug_level(self, debug_level):
+        """Check that a debug level is one of DEBUG_LEVELS and return it."""
+        if debug_level not in DEBUG_LEVELS:
+            raise ValueError(f"Unknown debug level '{debug_level}', expected one of {DEBUG_LEVELS}")
+        return debug_level
+
+    def process_movement(self, movement_data, debug_level=None):
         """Process incoming movement data and return updated position.
         
         Args:
             movement_data (dict): Input movement data containing target positions
+            debug_level (str, optional): Debug level for this response, default self.debug_level
             
         Returns:
             dict: Processed movement data with updated positions
         """
+        debug_level = self.debug_level if debug_level is None else self._check_debug_level(debug_level)
+        
         # For now, just echo back the movement data with some basic validation
         processed_data = {"pose": {}}
         
-        # Add debug information
-        processed_data["debug"] = {
-            "original_data": movement_data,
-            "assumptions": {
-                "x_y_range": "Clamped between -50 and 50",
-                "z_range": "Clamped between 0 and 60",
-                "missing_coords": "Defaulting to 0 for x/y, 30 for z"
-            }
-        }
-        
         # Process right arm if present
         if "rightArm" in movement_data:
             processed_data["pose"]["rightArm"] = {
@@ -88,7 +150,6 @@ class SimProcessor:
                 "y": self._clamp(movement_data["rightArm"].get("y", 0), -50, 50),
                 "z": self._clamp(movement_data["rightArm"].get("z", 30), 0, 60)
             }
-            self.current_position["rightArm"] = processed_data["pose"]["rightArm"]
 
         # Process left arm if present
         if "leftArm" in movement_data:
@@ -97,80 +158,100 @@ class SimProcessor:
                 "y": self._clamp(movement_data["leftArm"].get("y", 0), -50, 50),
                 "z": self._clamp(movement_data["leftArm"].get("z", 30), 0, 60)
             }
-            self.current_position["leftArm"] = processed_data["pose"]["leftArm"]
 
-        # Add processing results to debug info
-        processed_data["debug"]["processed"] = {
-            "rightArm": self.current_position["rightArm"] if "rightArm" in movement_data else "not updated",
-            "leftArm": self.current_position["leftArm"] if "leftArm" in movement_data else "not updated"
-        }
+        # Both arms move in one update
+        snapshot = self.pose_state.publish(processed_data["pose"])
+
+        # Debug information is only built at the level asked for
+        if debug_level == "summary":
+            processed_data["debug"] = {"arms_updated": list(processed_data["pose"])}
+        elif debug_level == "full":
+            processed_data["debug"] = {
+                "original_data": movement_data,
+                "assumptions": {
+                    "x_y_range": "Clamped between -50 and 50",
+                    "z_range": "Clamped between 0 and 60",
+                    "missing_coords": "Defaulting to 0 for x/y, 30 for z"
+                },
+                "processed": {
+                    "rightArm": snapshot.arm("rightArm") if "rightArm" in movement_data else "not updated",
+                    "leftArm": snapshot.arm("leftArm") if "leftArm" in movement_data else "not updated"
+                }
+            }
 
         return processed_data
 
-    def process_headset_data(self, headset_data):
+    def process_headset_data(self, headset_data, debug_level=None):
         """Process complex hand tracking data into simplified robot movements.
         
         Args:
             headset_data (dict): Complex hand tracking data with points for both hands
+            debug_level (str, optional): Debug level for this response, default self.debug_level
             
         Returns:
             dict: Simplified robot movement data
         """
+        debug_level = self.debug_level if debug_level is None else self._check_debug_level(debug_level)
         processed_data = {"pose": {}}
+        frames = {}
         
         # Process each hand if present
         for hand_key in ["left_hand", "right_hand"]:
             if hand_key not in headset_data.get("hands", {}):
                 continue
                 
-            hand_data = headset_data["hands"][hand_key]
+            # Accepts both 'wrist' and 'handWrist' style point names
+            frame = HandFrame.from_hand_data(headset_data["hands"][hand_key])
             arm_key = "leftArm" if hand_key == "left_hand" else "rightArm"
-            
-            # Create point lookup for easier access
-            points = {point["name"]: point for point in hand_data["points"]}
+            frames[hand_key.split("_")[0]] = frame
             
             # Calculate arm position from wrist position
-            if "wrist" in points:
-                wrist = points["wrist"]
+            wrist = frame.get("wrist")
+            if wrist is not None:
                 # Apply coordinate transformation and scaling
                 processed_data["pose"][arm_key] = {
-                    "x": self._clamp((wrist["x"] + self.offset["x"]) * self.scaling["position"]["x"], -50, 50),
-                    "y": self._clamp((wrist["y"] + self.offset["y"]) * self.scaling["position"]["y"], -50, 50),
-                    "z": self._clamp((wrist["z"] + self.offset["z"]) * self.scaling["position"]["z"], 0, 60)
+                    "x": self._clamp((wrist[0] + self.offset["x"]) * self.scaling["position"]["x"], -50, 50),
+                    "y": self._clamp((wrist[1] + self.offset["y"]) * self.scaling["position"]["y"], -50, 50),
+                    "z": self._clamp((wrist[2] + self.offset["z"]) * self.scaling["position"]["z"], 0, 60)
                 }
                 
                 # Calculate additional transformations based on finger positions
-                if "indexFingerTip" in points and "thumbTip" in points:
-                    index_tip = points["indexFingerTip"]
-                    thumb_tip = points["thumbTip"]
-                    
+                index_tip = frame.get("indexFingerTip")
+                if index_tip is not None and frame.get("thumbTip") is not None:
                     # Calculate relative positions for finer control
-                    dx = (index_tip["x"] - wrist["x"]) * self.scaling["position"]["x"] * 0.5
-                    dy = (index_tip["y"] - wrist["y"]) * self.scaling["position"]["y"] * 0.5
-                    dz = (index_tip["z"] - wrist["z"]) * self.scaling["position"]["z"] * 0.5
+                    dx = (index_tip[0] - wrist[0]) * self.scaling["position"]["x"] * 0.5
+                    dy = (index_tip[1] - wrist[1]) * self.scaling["position"]["y"] * 0.5
+                    dz = (index_tip[2] - wrist[2]) * self.scaling["position"]["z"] * 0.5
                     
                     # Apply the fine adjustments to the arm position
                     processed_data["pose"][arm_key]["x"] = self._clamp(processed_data["pose"][arm_key]["x"] + dx, -50, 50)
                     processed_data["pose"][arm_key]["y"] = self._clamp(processed_data["pose"][arm_key]["y"] + dy, -50, 50)
                     processed_data["pose"][arm_key]["z"] = self._clamp(processed_data["pose"][arm_key]["z"] + dz, 0, 60)
             
-            # Update current position
-            self.current_position[arm_key] = processed_data["pose"][arm_key]
-        
-        # Add debug information
-        processed_data["debug"] = {
-            "original_data": headset_data,
-            "mapping_used": self.hand_mapping,
-            "scaling_factors": self.scaling,
-            "offsets": self.offset,
-            "processed_points": {
-                "left": list(points.keys()) if "left_hand" in headset_data.get("hands", {}) else [],
-                "right": list(points.keys()) if "right_hand" in headset_data.get("hands", {}) else []
+        # Compensate latency and smooth out tracking jitter, then update the current position
+        self._filter_pose(processed_data["pose"], parse_timestamp(headset_data.get("timestamp")))
+        self.pose_state.publish(processed_data["pose"])
+        
+        # Debug information is only built at the level asked for
+        if debug_level == "summary":
+            processed_data["debug"] = {
+                "points_received": {hand: len(frame) for hand, frame in frames.items()},
+                "arms_updated": list(processed_data["pose"])
+            }
+        elif debug_level == "full":
+            processed_data["debug"] = {
+                "original_data": headset_data,
+                "mapping_used": self.hand_mapping,
+                "scaling_factors": self.scaling,
+                "offsets": self.offset,
+                "processed_points": {
+                    "left": frames["left"].point_names() if "left" in frames else [],
+                    "right": frames["right"].point_names() if "right" in frames else []
+                }
             }
-        }
         
-        # Cache the request and result
-        self._cache_request(headset_data, processed_data)
+        # Keep the frame and resulting pose for debugging
+        self._record_frame(frames, processed_data["pose"])
         
         return processed_data
 
@@ -178,6 +259,12 @@ class SimProcessor:
         """Clamp a value between min and max values."""
         return max(min(value, max_val), min_val)
 
+    @property
+    def current_position(self):
+        """Current position of each arm (a copy; publish through pose_state to change it)."""
+        return self.pose_state.snapshot.to_dict()
+
     def get_current_position(self):
         """Get the current position of the simulated robot."""
-        return {"pose": self.current_position.copy()} 
+        snapshot = self.pose_state.snapshot
+        return {"pose": snapshot.to_dict(), "version": snapshot.version} 
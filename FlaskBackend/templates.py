@@ -212,6 +212,10 @@ curl -X POST http://192.168.154.196:5001/validate \\
         }
     }
 }'</pre>
+            
+            <h3>3. Streaming Validation</h3>
+            <pre>POST /validate/stream</pre>
+            <p>Validates a recorded session in one request. Send NDJSON (one /validate body per line) to get one JSON result per line back, or float32 (27, 3) hand frames as application/octet-stream to get one byte per frame (1 = valid).</p>
         </div>
     </div>
 </body>
@@ -0,0 +1,32 @@
+import unittest
+from benchmark import build_stages, compare_results, load_frames, run_benchmark
+
+class TestBenchmark(unittest.TestCase):
+    def test_run_benchmark(self):
+        frames = load_frames(synthetic=3)
+        self.assertEqual(len(frames['synthetic']), 3)
+        stages = build_stages()
+        report = run_benchmark(frames, {name: stages[name] for name in ['transform_hand_data', 'validate_hand']},
+                               repeat=1, warmup=1)
+
+        total_frames = sum(report['meta']['frames'].values())
+        for stats in report['stages'].values():
+            self.assertEqual(stats['calls'], total_frames)
+            self.assertEqual(stats['errors'], 0)
+            self.assertLessEqual(stats['p50_ms'], stats['p95_ms'])
+            self.assertLessEqual(stats['p95_ms'], stats['p99_ms'])
+            self.assertGreater(stats['fps'], 0)
+
+    def test_compare_results(self):
+        baseline = {'stages': {'validate_hand': {'p50_ms': 1.0, 'p95_ms': 2.0}}}
+        current = {'stages': {'validate_hand': {'p50_ms': 1.05, 'p95_ms': 2.5},
+                              'process_hand': {'p50_ms': 9.0, 'p95_ms': 9.0}}}
+
+        # Only stages present in the baseline are compared
+        regressions = compare_results(current, baseline, threshold=0.1)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn('validate_hand p95_ms', regressions[0])
+        self.assertEqual(compare_results(current, baseline, threshold=0.3), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import time
+import unittest
+from unittest import mock
+import numpy as np
+from calibration_capture import CalibrationCapture, align_streams, http_wrist_source
+from hand_calibration import HandCalibration
+
+
+def joint_path(t):
+    """Smooth arm motion in degrees (shoulder yaw, shoulder pitch, elbow)"""
+    return np.array([40 * np.sin(3 * t), 30 + 25 * np.sin(5 * t + 1), 35 * np.cos(4 * t)])
+
+
+class TestCalibrationCapture(unittest.TestCase):
+    def test_align_streams(self):
+        headset_times = np.array([0.0, 0.1, 0.1, 0.2, 0.6, 0.7])
+        headset_values = np.array([[0, 0, 0], [1, 1, 1], [1, 1, 1], [2, 2, 2], [6, 6, 6], [7, 7, 7]], dtype=float)
+        robot_times = np.array([-0.05, 0.05, 0.15, 0.4, 0.65, 0.8])
+        robot_values = np.arange(6, dtype=float)[:, None] * np.ones(3)
+
+        vr, robot = align_streams(headset_times, headset_values, robot_times, robot_values, max_gap=0.15)
+
+        # Outside the recording and across the 0.2-0.6 dropout are dropped
+        np.testing.assert_allclose(vr, [[0.5] * 3, [1.5] * 3, [6.5] * 3])
+        np.testing.assert_allclose(robot[:, 0], [1, 2, 4])
+
+    def test_http_wrist_source_records_each_frame_once(self):
+        def response(version, x, arrived, age):
+            body = {
+                "data": {"hands": {"left_hand": {"points": [{"name": "handWrist", "x": x, "y": 0.5, "z": 0.5}]}}},
+                "timestamp": arrived, "age_seconds": age, "version": version
+            }
+            return mock.Mock(status_code=200, json=mock.Mock(return_value=body))
+
+        # Frame 1 is polled three times with different response delays before frame 2 arrives
+        polls = [response(1, 0.1, 100.0, 0.02), response(1, 0.1, 100.0, 0.03), response(1, 0.1, 100.0, 0.05),
+                 response(2, 0.2, 100.04, 0.01)]
+        with mock.patch('calibration_capture.requests.Session') as session:
+            session.return_value.get.side_effect = polls
+            read = http_wrist_source('http://headset')
+            samples = [read() for _ in polls]
+
+        self.assertEqual([sample is None for sample in samples], [False, True, True, False])
+        # Stamped at the server arrival times, 40ms apart, whatever the poll delays
+        self.assertAlmostEqual(samples[3][0] - samples[0][0], 0.04, places=1)
+        np.testing.assert_allclose(samples[3][1], [0.2, 0.5, 0.5])
+
+    def test_capture_recovers_calibration(self):
+        calibration = HandCalibration('missing_calibration.json')
+        angle = np.radians(20)
+        rotation = np.array([[np.cos(angle), 0, np.sin(angle)], [0, 1, 0], [-np.sin(angle), 0, np.cos(angle)]])
+        scale, offset = np.array([1.2, 0.9, 1.1]), np.array([0.05, 0.1, -0.2])
+        calibration.joints_to_positions(joint_path(0.0))  # Load the arm model before the timed recording
+        start = time.time()
+
+        def headset():
+            # The wrist position that the calibration maps onto the gripper position
+            t = time.time()
+            position = calibration.joints_to_positions(joint_path(t - start))
+            return t, rotation.T @ (position - offset) / scale
+
+        def robot():
+            t = time.time()
+            return t, joint_path(t - start)
+
+        capture = CalibrationCapture(calibration, headset, robot, rate=200)
+        vr, robot_positions = capture.capture_pairs(duration=0.5)
+        self.assertGreater(len(vr), 50)
+
+        calibration.calibrate_from_pairs(vr, robot_positions, save=False)
+        np.testing.assert_allclose(calibration.transform_matrix, rotation, atol=0.02)
+        np.testing.assert_allclose(calibration.scale_factors, scale, atol=0.02)
+
+
+if __name__ == '__main__':
+    unittest.main()
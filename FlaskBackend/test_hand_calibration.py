@@ -0,0 +1,141 @@
+import copy
+import json
+import os
+import tempfile
+import time
+import unittest
+import numpy as np
+from calibration_estimator import OnlineCalibrationEstimator, fit_ransac
+from hand_calibration import HandCalibration
+
+
+class TestHandCalibration(unittest.TestCase):
+    def setUp(self):
+        self.calibration = HandCalibration('missing_calibration.json')
+        angle = np.radians(30)
+        self.rotation = np.array([
+            [np.cos(angle), -np.sin(angle), 0],
+            [np.sin(angle), np.cos(angle), 0],
+            [0, 0, 1]
+        ])
+        self.scale = np.array([1.1, 0.9, 1.0])
+        self.offset = np.array([0.01, -0.02, 0.03])
+        self.calibration.set_calibration(self.rotation, self.scale, self.offset)
+
+    def test_affine_matches_scaled_rotation(self):
+        points = np.random.default_rng(0).uniform(-1, 1, (4, 27, 3))
+        expected = (points * self.scale) @ self.rotation.T + self.offset
+        np.testing.assert_allclose(self.calibration.transform_points(points), expected, atol=1e-12)
+        np.testing.assert_allclose(self.calibration.affine[3], [0, 0, 0, 1])
+
+    def test_transform_hand_data_does_not_mutate(self):
+        hand_data = {"points": [
+            {"id": 0, "name": "handWrist", "x": 0.1, "y": 0.2, "z": 0.3},
+            {"id": 1, "name": "handThumbTip", "x": 0.3, "y": 0.4, "z": 0.5}
+        ]}
+        original = copy.deepcopy(hand_data)
+        transformed = self.calibration.transform_hand_data(hand_data)
+
+        self.assertEqual(hand_data, original)
+        self.assertEqual(transformed['points'][1]['name'], 'handThumbTip')
+        expected = self.rotation @ (np.array([0.3, 0.4, 0.5]) * self.scale) + self.offset
+        np.testing.assert_allclose([transformed['points'][1][k] for k in 'xyz'], expected)
+
+    def test_requires_calibration(self):
+        with self.assertRaises(ValueError):
+            HandCalibration('missing_calibration.json').transform_points(np.zeros(3))
+        with self.assertRaises(ValueError):
+            self.calibration.set_calibration(np.eye(2), self.scale, self.offset)
+
+    def test_reload_publishes_new_snapshot(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'calibration.json')
+            calibration = HandCalibration(path)
+            self.assertIsNone(calibration.version)
+
+            with open(path, 'w') as f:
+                json.dump({'transform_matrix': np.eye(3).tolist(), 'scale_factors': [1, 1, 1],
+                           'offset': [0, 0, 0]}, f)
+            first = calibration.reload_calibration()
+            self.assertEqual(first.version, 1)
+            with self.assertRaises(ValueError):
+                first.affine[0, 0] = 2.0
+
+            # An invalid file keeps the current calibration
+            with open(path, 'w') as f:
+                json.dump({'transform_matrix': [[2, 0, 0], [0, 1, 0], [0, 0, 1]], 'scale_factors': [1, 1, 1],
+                           'offset': [0, 0, 0]}, f)
+            with self.assertRaises(ValueError):
+                calibration.reload_calibration()
+            self.assertIs(calibration.snapshot, first)
+
+            # The watcher picks up the next valid file
+            calibration.watch(interval=0.01)
+            try:
+                with open(path, 'w') as f:
+                    json.dump({'transform_matrix': np.eye(3).tolist(), 'scale_factors': [1, 1, 1],
+                               'offset': [0.1, 0, 0]}, f)
+                os.utime(path, (time.time() + 5, time.time() + 5))
+                deadline = time.time() + 5
+                while calibration.version == 1 and time.time() < deadline:
+                    time.sleep(0.01)
+            finally:
+                calibration.stop_watching()
+            self.assertEqual(calibration.version, 2)
+            np.testing.assert_allclose(calibration.transform_points(np.zeros(3)), [0.1, 0, 0])
+
+    def _pairs(self, count, noise=0.0, seed=0):
+        rng = np.random.default_rng(seed)
+        vr = rng.uniform(-0.5, 0.5, (count, 3))
+        robot = (vr * self.scale) @ self.rotation.T + self.offset + rng.normal(0, noise, (count, 3))
+        return vr, robot
+
+    def test_online_estimator_matches_batch_fit(self):
+        vr, robot = self._pairs(200, noise=0.001)
+        streamed = OnlineCalibrationEstimator()
+        for vr_point, robot_point in zip(vr, robot):
+            streamed.add(vr_point, robot_point)
+        batch = OnlineCalibrationEstimator()
+        batch.add_batch(vr, robot)
+
+        for a, b in zip(streamed.solve(), batch.solve()):
+            np.testing.assert_allclose(a, b, atol=1e-10)
+        R, scale, offset = streamed.solve()
+        np.testing.assert_allclose(R, self.rotation, atol=1e-3)
+        np.testing.assert_allclose(scale, self.scale, atol=1e-3)
+
+    def test_ransac_ignores_outliers(self):
+        vr, robot = self._pairs(2000, noise=0.001)
+        robot[:600] += np.random.default_rng(1).uniform(-0.5, 0.5, (600, 3))
+        fit = fit_ransac(vr, robot, threshold=0.01, seed=0)
+
+        self.assertGreater(fit['inliers'][600:].mean(), 0.99)
+        self.assertLess(fit['inliers'][:600].mean(), 0.05)
+        np.testing.assert_allclose(fit['transform_matrix'], self.rotation, atol=1e-3)
+        np.testing.assert_allclose(fit['scale_factors'], self.scale, atol=1e-3)
+        np.testing.assert_allclose(fit['offset'], self.offset, atol=1e-3)
+
+    def test_calibrate_with_robot_points(self):
+        vr, robot = self._pairs(5)
+        calibration = HandCalibration('missing_calibration.json')
+        calibration.calibrate_from_pairs([dict(zip('xyz', p)) for p in vr],
+                                         [dict(zip('xyz', p)) for p in robot], save=False)
+        quality = calibration.check_calibration_quality(vr, robot)
+        self.assertLess(quality['max_error'], 1e-9)
+
+    def test_arm_forward_kinematics_matches_ikpy(self):
+        joints = np.random.default_rng(2).uniform(-90, 90, (50, 3))
+        positions = self.calibration.joints_to_positions(joints)
+        self.assertEqual(positions.shape, (50, 3))
+
+        arm = self.calibration.arm
+        for reading, position in zip(joints, positions):
+            expected = arm.chain.forward_kinematics(arm.chain_joints(reading))[:3, 3]
+            np.testing.assert_allclose(position, expected, atol=1e-12)
+
+        # Zero pose: upper arm hanging down, forearm pointing forward
+        np.testing.assert_allclose(self.calibration.joints_to_positions(np.zeros(3)), [0.1, 0, -0.1], atol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
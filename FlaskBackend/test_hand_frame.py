@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+from hand_calibration import HandCalibration
+from hand_frame import HandFrame, JOINT_NAMES, joint_index, parse_timestamp
+from hand_validator import HandValidator
+
+
+class TestHandFrame(unittest.TestCase):
+    def setUp(self):
+        self.points = [
+            {"id": 0, "name": "handWrist", "x": 0.1, "y": 0.2, "z": 0.3},
+            {"id": 1, "name": "indexFingerKnuckle", "x": 0.4, "y": 0.5, "z": 0.6},
+            {"id": 2, "name": "handIndexFingerTip", "x": 0.55, "y": 0.65, "z": 0.75},
+            {"id": 3, "name": "customMarker", "x": 1.0, "y": 1.0, "z": 1.0}
+        ]
+
+    def test_schema_covers_both_variants(self):
+        self.assertEqual(len(JOINT_NAMES), 27)
+        self.assertEqual(joint_index('indexFingerTip'), joint_index('handIndexFingerTip'))
+        self.assertIsNone(joint_index('customMarker'))
+
+    def test_round_trip(self):
+        frame = HandFrame.from_points(self.points, hand_id='left')
+        self.assertEqual(frame.positions.shape, (27, 3))
+        self.assertEqual(len(frame), 4)
+        np.testing.assert_allclose(frame.get('indexFingerTip'), [0.55, 0.65, 0.75])
+        np.testing.assert_allclose(frame.finger_positions('index'), [[0.4, 0.5, 0.6], [0.55, 0.65, 0.75]])
+        self.assertIsNone(frame.get('thumbTip'))
+        self.assertIs(HandFrame.from_hand_data(frame), frame)
+        self.assertEqual(sorted(frame.to_points(), key=lambda p: p['id']), self.points)
+
+    def test_transform_frame_matches_transform_point(self):
+        calibration = HandCalibration('missing_calibration.json')
+        angle = np.radians(30)
+        calibration.set_calibration(np.array([
+            [np.cos(angle), -np.sin(angle), 0],
+            [np.sin(angle), np.cos(angle), 0],
+            [0, 0, 1]
+        ]), [1.1, 0.9, 1.0], [0.01, -0.02, 0.03])
+
+        frame = HandFrame.from_points(self.points)
+        original = frame.positions.copy()
+        transformed = calibration.transform_frame(frame)
+
+        np.testing.assert_array_equal(frame.positions, original)
+        for point in transformed.to_points()[:-1]:
+            expected = calibration.transform_point(next(p for p in self.points if p['name'] == point['name']))
+            self.assertAlmostEqual(point['x'], expected['x'])
+            self.assertAlmostEqual(point['y'], expected['y'])
+            self.assertAlmostEqual(point['z'], expected['z'])
+
+    def test_validator_matches_point_rules(self):
+        validator = HandValidator('validation.csv')
+        hand = {"points": [
+            {"name": "handWrist", "x": 2.5, "y": 0.2, "z": 0.3},
+            {"name": "handThumbTip", "x": 0.3, "y": -1.0, "z": 0.5},
+            {"name": "indexFingerTip", "x": 9.0, "y": 9.0, "z": 9.0}  # no rule for this variant
+        ]}
+        expected = [v for point in hand['points'] for v in validator.validate_point(point)[1]]
+        is_valid, violations = validator.validate_frame(HandFrame.from_hand_data(hand))
+        self.assertFalse(is_valid)
+        self.assertEqual(sorted(violations), sorted(expected))
+
+    def test_parse_timestamp(self):
+        self.assertEqual(parse_timestamp(12.5), 12.5)
+        self.assertEqual(parse_timestamp('2025-01-18T18:30:00.250Z') - parse_timestamp('2025-01-18T18:30:00Z'), 0.25)
+        self.assertIsNone(parse_timestamp('yesterday'))
+        self.assertIsNone(parse_timestamp(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,8 @@
 import unittest
+import os
+import tempfile
 from hand_ik import HandIK
+from ik_workspace import WorkspaceTable, build_workspace_table
 import numpy as np
 
 class TestHandIK(unittest.TestCase):
@@ -46,6 +49,226 @@ class TestHandIK(unittest.TestCase):
                 self.assertGreaterEqual(angle, -np.pi)
                 self.assertLessEqual(angle, np.pi)
     
+    def test_analytic_solver_matches_ikpy(self):
+        targets = [[0.01, 0.02, 0.03], [-0.02, 0.01, 0.03], [0.55, 0.65, 0.75]]
+        for finger_name, chain in self.ik_processor.fingers.items():
+            self.assertIn(finger_name, self.ik_processor.analytic_solvers)
+            solver = self.ik_processor.analytic_solvers[finger_name]
+            for target in targets:
+                analytic = solver.solve(target)
+                iterative = chain.inverse_kinematics(target)
+                
+                # Same joint layout as ikpy, with the inactive base left at zero
+                self.assertEqual(len(analytic), len(iterative))
+                self.assertEqual(analytic[0], 0.0)
+                
+                # Tip error is never worse than the iterative solver
+                analytic_error = np.linalg.norm(chain.forward_kinematics(analytic)[:3, 3] - target)
+                iterative_error = np.linalg.norm(chain.forward_kinematics(iterative)[:3, 3] - target)
+                self.assertLessEqual(analytic_error, iterative_error + 1e-9)
+    
+    def test_batch_fk_matches_ikpy(self):
+        rng = np.random.default_rng(0)
+        for finger_name, chain in self.ik_processor.fingers.items():
+            joints = rng.uniform(-np.pi, np.pi, (50, len(chain.links)))
+            positions = self.ik_processor.forward_kinematics(finger_name, joints)
+            self.assertEqual(positions.shape, (50, len(chain.links), 3))
+
+            expected = np.array([
+                [frame[:3, 3] for frame in chain.forward_kinematics(q, full_kinematics=True)]
+                for q in joints
+            ])
+            np.testing.assert_allclose(positions, expected, atol=1e-12)
+
+            # A single configuration keeps the unbatched shape
+            np.testing.assert_allclose(self.ik_processor.forward_kinematics(finger_name, joints[0]), expected[0],
+                                       atol=1e-12)
+
+    def test_ikpy_solver_fallback(self):
+        ik_processor = HandIK(ik_solver='ikpy')
+        target = [0.01, 0.02, 0.03]
+        expected = ik_processor.fingers['index'].inverse_kinematics(target)
+        np.testing.assert_allclose(ik_processor._solve_ik('index', target), expected)
+    
+    def test_warm_start(self):
+        ik_processor = HandIK(cache_size=0)
+        target = np.array([0.02, 0.01, 0.03])
+        first = ik_processor._solve_ik('index', target, hand_id='left')
+        second = ik_processor._solve_ik('index', target + 0.001, hand_id='left')
+        stats = ik_processor.get_stats()['warm_start']
+        self.assertEqual(stats['cold_starts'], 1)
+        self.assertEqual(stats['warm_starts'], 1)
+        self.assertGreaterEqual(stats['iterations_saved'], 0)
+        
+        # Nearby frames stay on the same branch instead of flipping
+        self.assertLess(np.abs(second - first).max(), 0.2)
+        
+        # Other hands keep their own state, and large jumps start cold
+        ik_processor._solve_ik('index', target, hand_id='right')
+        ik_processor._solve_ik('index', target + 0.1, hand_id='left')
+        stats = ik_processor.get_stats()['warm_start']
+        self.assertEqual(stats['cold_starts'], 3)
+        self.assertEqual(stats['jump_resets'], 1)
+    
+    def test_ik_cache(self):
+        ik_processor = HandIK(cache_size=2, cache_step=0.01)
+        first = ik_processor._solve_ik('index', [0.020, 0.010, 0.030])
+        # Same grid cell: served from the cache without solving
+        second = ik_processor._solve_ik('index', [0.021, 0.011, 0.031])
+        np.testing.assert_array_equal(first, second)
+        
+        ik_processor._solve_ik('index', [0.0, 0.0, 0.05])
+        ik_processor._solve_ik('middle', [0.020, 0.010, 0.030])
+        stats = ik_processor.get_stats()['cache']
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 3)
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual(stats['size'], 2)
+    
+    def test_workspace_table(self):
+        table = build_workspace_table(self.ik_processor.fingers, samples=(64, 16))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'ik_workspace.npy')
+            WorkspaceTable.save(table, path)
+            ik_processor = HandIK(ik_solver='workspace', workspace_file=path,
+                                  cache_size=0, warm_start=False)
+            self.assertIsInstance(ik_processor.workspace.table, np.memmap)
+            
+            for finger_name, chain in ik_processor.fingers.items():
+                self.assertIn(finger_name, ik_processor.workspace)
+                for target in [[0.01, 0.02, 0.03], [0.55, 0.65, 0.75]]:
+                    lookup = ik_processor._solve_ik(finger_name, target)
+                    analytic = self.ik_processor.analytic_solvers[finger_name].solve(target)
+                    lookup_error = np.linalg.norm(chain.forward_kinematics(lookup)[:3, 3] - target)
+                    analytic_error = np.linalg.norm(chain.forward_kinematics(analytic)[:3, 3] - target)
+                    self.assertAlmostEqual(lookup_error, analytic_error, places=5)
+            del ik_processor
+    
+    def test_workspace_table_out_of_name_order(self):
+        table = build_workspace_table(self.ik_processor.fingers, samples=(8, 4))
+        names = sorted(self.ik_processor.fingers)
+        reordered = np.concatenate([table[table['chain'] == name.encode()] for name in reversed(names)])
+        workspace = WorkspaceTable(reordered)
+        
+        for name in names:
+            rows = workspace.table[workspace.slices[name]]
+            self.assertEqual(len(rows), 8 * 4)
+            self.assertTrue(np.all(rows['chain'] == name.encode()))
+    
+    def test_parallel_process_hands(self):
+        hand = {
+            "points": [
+                {"name": "handThumbTip", "x": 0.01, "y": 0.02, "z": 0.03},
+                {"name": "handIndexFingerTip", "x": -0.02, "y": 0.01, "z": 0.03},
+                {"name": "handMiddleFingerTip", "x": 0.0, "y": 0.03, "z": 0.02},
+                {"name": "handRingFingerTip", "x": 0.02, "y": -0.01, "z": 0.03},
+                {"name": "handLittleFingerTip", "x": 0.55, "y": 0.65, "z": 0.75}
+            ]
+        }
+        serial = HandIK(cache_size=0, warm_start=False).process_hands(
+            {'left': hand, 'right': hand}, apply_calibration=False)
+        
+        for kind in ['thread', 'process']:
+            ik_processor = HandIK(cache_size=0, warm_start=False)
+            ik_processor.set_executor(2, kind)
+            try:
+                parallel = ik_processor.process_hands({'left': hand, 'right': hand}, apply_calibration=False)
+            finally:
+                ik_processor.executor.shutdown()
+            self.assertEqual(set(parallel), {'left', 'right'})
+            for hand_id in parallel:
+                self.assertEqual(list(parallel[hand_id]), list(serial[hand_id]))
+                for finger_name, angles in parallel[hand_id].items():
+                    np.testing.assert_allclose(angles, serial[hand_id][finger_name])
+
+    def test_full_pose_fit(self):
+        ik_processor = HandIK(fit_mode='full_pose', cache_size=0, warm_start=False)
+        rng = np.random.default_rng(0)
+        hands = {}
+        expected = {}
+        for hand_id in ['left', 'right']:
+            points = []
+            for finger_name in ik_processor.fingers:
+                joints = np.array([0.0, rng.uniform(-2.5, 2.5), rng.uniform(-1.2, 1.2), 0.0])
+                positions = ik_processor.forward_kinematics(finger_name, joints)
+                prefix = 'handThumb' if finger_name == 'thumb' else f'hand{finger_name.capitalize()}Finger'
+                points.append({"id": 0, "name": f"{prefix}IntermediateBase",
+                               "x": positions[2][0], "y": positions[2][1], "z": positions[2][2]})
+                points.append({"id": 1, "name": f"{prefix}Tip",
+                               "x": positions[3][0], "y": positions[3][1], "z": positions[3][2]})
+                expected[(hand_id, finger_name)] = positions[2:]
+            hands[hand_id] = {"points": points}
+
+        results = ik_processor.process_hands(hands, apply_calibration=False)
+
+        # Reachable poses are recovered exactly, intermediate joint included
+        for (hand_id, finger_name), positions in expected.items():
+            fitted = ik_processor.forward_kinematics(finger_name, results[hand_id][finger_name])
+            np.testing.assert_allclose(fitted[2:], positions, atol=1e-6)
+
+        # Without an intermediate point the fit matches tip IK
+        tip_only = ik_processor.process_hand({"points": [
+            {"name": "handIndexFingerTip", "x": 0.55, "y": 0.65, "z": 0.75}
+        ]}, apply_calibration=False)
+        target = [0.55, 0.65, 0.75]
+        tip_error = np.linalg.norm(ik_processor.forward_kinematics('index', tip_only['index'])[-1] - target)
+        analytic_error = np.linalg.norm(
+            ik_processor.forward_kinematics('index', ik_processor.analytic_solvers['index'].solve(target))[-1] - target)
+        self.assertAlmostEqual(tip_error, analytic_error, places=9)
+
+    def test_plot_renderer_reuse(self):
+        _, points_by_finger, targets = self.ik_processor._prepare_hand({"points": [
+            {"id": 0, "name": "handIndexFingerKnuckle", "x": 0.4, "y": 0.5, "z": 0.6},
+            {"id": 1, "name": "handIndexFingerTip", "x": 0.55, "y": 0.65, "z": 0.75}
+        ]}, apply_calibration=False)
+        self.assertEqual(targets, {'index': [0.55, 0.65, 0.75]})
+        chain_positions = {
+            'index': self.ik_processor.forward_kinematics(
+                'index', self.ik_processor._solve_ik('index', targets['index']))
+        }
+        limits = self.ik_processor._get_plot_limits(points_by_finger)
+
+        self.ik_processor.plot_quality = 'low'
+        renderer = self.ik_processor._get_renderer()
+        self.assertIs(self.ik_processor._get_renderer(), renderer)
+        artist_count = len(renderer.ax.get_children())
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for i in range(2):
+                plot_path = os.path.join(tmp_dir, f'frame_{i}.png')
+                renderer.render(points_by_finger, targets, chain_positions, limits, 'test', plot_path)
+                self.assertGreater(os.path.getsize(plot_path), 0)
+
+        # Frames update the existing artists instead of adding new ones
+        self.assertEqual(len(renderer.ax.get_children()), artist_count)
+        self.assertTrue(renderer.artists['index']['chain_line'].get_visible())
+        self.assertFalse(renderer.artists['thumb']['chain_line'].get_visible())
+
+        # Changing the preset rebuilds the renderer
+        self.ik_processor.plot_quality = 'medium'
+        self.assertIsNot(self.ik_processor._get_renderer(), renderer)
+
+    def test_plot_filenames_unique(self):
+        _, points_by_finger, targets = self.ik_processor._prepare_hand({"points": [
+            {"id": 0, "name": "handIndexFingerKnuckle", "x": 0.4, "y": 0.5, "z": 0.6},
+            {"id": 1, "name": "handIndexFingerTip", "x": 0.55, "y": 0.65, "z": 0.75}
+        ]}, apply_calibration=False)
+        solutions = {'index': self.ik_processor._solve_ik('index', targets['index'])}
+        self.ik_processor.plot_quality = 'low'
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.chdir(tmp_dir)
+            try:
+                os.makedirs('plots')
+                # Plots in the same second must not overwrite each other
+                paths = [self.ik_processor._plot_hand(points_by_finger, targets, solutions, 'left', 'frame.json')
+                         for _ in range(3)]
+                self.assertEqual(len(set(paths)), 3)
+                self.assertEqual(len(os.listdir('plots')), 3)
+            finally:
+                os.chdir(cwd)
+
     def test_organize_points(self):
         test_points = [
             {"name": "handThumbTip", "x": 0, "y": 0, "z": 0},
@@ -55,22 +278,24 @@ class TestHandIK(unittest.TestCase):
             {"name": "handLittleFingerTip", "x": 0, "y": 0, "z": 0}
         ]
         
-        organized = self.ik_processor._organize_points_by_finger(test_points)
+        _, points_by_finger, targets = self.ik_processor._prepare_hand({"points": test_points},
+                                                                       apply_calibration=False)
         
         # Check that all fingers are present
-        self.assertEqual(len(organized), 5)
-        self.assertIn('thumb', organized)
-        self.assertIn('index', organized)
-        self.assertIn('middle', organized)
-        self.assertIn('ring', organized)
-        self.assertIn('little', organized)
+        self.assertEqual(len(points_by_finger), 5)
+        self.assertIn('thumb', points_by_finger)
+        self.assertIn('index', points_by_finger)
+        self.assertIn('middle', points_by_finger)
+        self.assertIn('ring', points_by_finger)
+        self.assertIn('little', points_by_finger)
         
         # Check that points were correctly categorized
-        self.assertEqual(len(organized['thumb']), 1)
-        self.assertEqual(len(organized['index']), 1)
-        self.assertEqual(len(organized['middle']), 1)
-        self.assertEqual(len(organized['ring']), 1)
-        self.assertEqual(len(organized['little']), 1)
+        self.assertEqual(len(points_by_finger['thumb']), 1)
+        self.assertEqual(len(points_by_finger['index']), 1)
+        self.assertEqual(len(points_by_finger['middle']), 1)
+        self.assertEqual(len(points_by_finger['ring']), 1)
+        self.assertEqual(len(points_by_finger['little']), 1)
+        self.assertEqual(len(targets), 5)
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -1,5 +1,8 @@
+import time
 import unittest
+import numpy as np
 from hand_validator import HandValidator
+from hand_frame import HandFrame
 import json
 
 class TestHandValidator(unittest.TestCase):
@@ -41,6 +44,75 @@ class TestHandValidator(unittest.TestCase):
         self.assertFalse(is_valid)
         self.assertGreater(len(violations), 0)
         print("Invalid hand data failed the test.")
+        
+    def test_validate_frames(self):
+        rng = np.random.default_rng(0)
+        positions = rng.uniform(0.1, 1.9, (100, 27, 3))
+        positions[7, 3, 1] = 2.5
+        positions[42, 0, 0] = -0.1
+        positions[50, 5] = np.nan  # Missing joint
+        
+        valid = self.validator.validate_frames(positions)
+        self.assertEqual(valid.shape, (100,))
+        np.testing.assert_array_equal(np.flatnonzero(~valid), [7, 42])
+        
+        # Messages are only built on request, and match validate_hand's
+        frame = HandFrame.from_points([{'name': 'handWrist', 'x': -0.1, 'y': 0.5, 'z': 0.5}])
+        self.assertEqual(self.validator.violations(positions[42]), self.validator.validate_frame(frame)[1])
+        self.assertEqual(len(self.validator.violations(positions[7])), 1)
+        
+    def test_validate_motion(self):
+        def frame(x):
+            return HandFrame.from_points([{'name': 'handWrist', 'x': x, 'y': 0.5, 'z': 0.5}], hand_id='left')
+        
+        # Steady motion at 1 m/s passes
+        for i in range(5):
+            self.assertTrue(self.validator.validate_motion(frame(0.5 + 0.01 * i), timestamp=0.01 * i)[0])
+        
+        # A 30cm jump in one frame is rejected and not used as the new reference
+        is_valid, violations = self.validator.validate_motion(frame(0.84), timestamp=0.05)
+        self.assertFalse(is_valid)
+        self.assertTrue(violations[0].startswith('handWrist speed'))
+        self.assertTrue(self.validator.validate_motion(frame(0.55), timestamp=0.06)[0])
+        
+        # Sudden stop from 1 m/s within 10ms exceeds the acceleration limit
+        self.assertTrue(self.validator.validate_motion(frame(0.56), timestamp=0.07)[0])
+        is_valid, violations = self.validator.validate_motion(frame(0.54), timestamp=0.08)
+        self.assertFalse(is_valid)
+        self.assertIn('acceleration', violations[0])
+        
+        # Other sessions and hands have their own histories, and a long gap starts over
+        self.assertTrue(self.validator.validate_motion(frame(1.5), session='replay', timestamp=0.08)[0])
+        self.assertTrue(self.validator.validate_motion(frame(1.5), timestamp=1.0)[0])
+    
+    def test_validate_motion_stale_reference(self):
+        def check(x, timestamp):
+            frame = HandFrame.from_points([{'name': 'handWrist', 'x': x, 'y': 0.5, 'z': 0.5}], hand_id='left')
+            return self.validator.validate_motion(frame, timestamp=timestamp)[0]
+        
+        self.assertTrue(check(0.5, 0.0))
+        self.assertTrue(check(0.5, 0.01))
+        
+        # A two-frame glitch is rejected on both frames, and the hand's return is accepted
+        self.assertFalse(check(0.8, 0.02))
+        self.assertFalse(check(0.8, 0.03))
+        self.assertTrue(check(0.5, 0.04))
+        
+        # A hand that really moved is rejected only until the reference is re-seeded
+        results = [check(0.9 + 0.001 * i, 0.05 + 0.01 * i) for i in range(5)]
+        self.assertEqual(results, [False, False, False, True, True])
+
+    def test_idle_histories_are_dropped(self):
+        validator = HandValidator('validation.csv', history_ttl=0.05)
+        frame = HandFrame.from_points([{'name': 'handWrist', 'x': 0.5, 'y': 0.5, 'z': 0.5}], hand_id='left')
+        for i in range(100):
+            validator.validate_motion(frame, session=f'client-{i}')
+        self.assertEqual(len(validator.histories), 100)
+        
+        # The next new session sweeps out the ones left unused
+        time.sleep(0.1)
+        validator.validate_motion(frame, session='fresh')
+        self.assertEqual(list(validator.histories), [('fresh', 'left')])
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
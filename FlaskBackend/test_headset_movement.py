@@ -20,10 +20,6 @@ def check_cache():
                 print(f"\nEntry {i}:")
                 print(f"Timestamp: {entry['timestamp']}")
                 print(f"Result pose: {json.dumps(entry['result']['pose'], indent=2)}")
-                if 'debug' in entry['result']:
-                    print("Transformations:")
-                    print(f"Scaling: {json.dumps(entry['result']['debug']['scaling_factors'], indent=2)}")
-                    print(f"Offsets: {json.dumps(entry['result']['debug']['offsets'], indent=2)}")
         else:
             print("Failed to retrieve cache:", response.status_code)
     except Exception as e:
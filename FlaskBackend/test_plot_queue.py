@@ -0,0 +1,40 @@
+import unittest
+import threading
+from plot_queue import PlotQueue
+
+class TestPlotQueue(unittest.TestCase):
+    def test_render_job(self):
+        queue = PlotQueue()
+        job_id = queue.submit(lambda name: f"plots/{name}.png", "hand")
+        self.assertTrue(queue.wait(timeout=5))
+        
+        job = queue.get_job(job_id)
+        self.assertEqual(job['status'], 'done')
+        self.assertEqual(job['plot_path'], 'plots/hand.png')
+        self.assertIsNone(queue.get_job('unknown'))
+        
+    def test_drop_oldest(self):
+        queue = PlotQueue(max_pending=2)
+        release = threading.Event()
+        
+        # Block the worker so later jobs pile up in the queue
+        blocker = queue.submit(lambda: release.wait(5) and 'plots/blocker.png')
+        while queue.get_job(blocker)['status'] != 'rendering':
+            pass
+        jobs = [queue.submit(lambda i=i: f"plots/{i}.png") for i in range(3)]
+        release.set()
+        self.assertTrue(queue.wait(timeout=5))
+        
+        self.assertEqual(queue.get_job(jobs[0])['status'], 'dropped')
+        self.assertEqual(queue.get_job(jobs[1])['status'], 'done')
+        self.assertEqual(queue.get_job(jobs[2])['plot_path'], 'plots/2.png')
+        self.assertEqual(queue.get_stats()['dropped'], 1)
+        
+    def test_failed_job(self):
+        queue = PlotQueue()
+        job_id = queue.submit(lambda: 1 / 0)
+        self.assertTrue(queue.wait(timeout=5))
+        self.assertEqual(queue.get_job(job_id)['status'], 'failed')
+
+if __name__ == '__main__':
+    unittest.main() 
@@ -2,6 +2,7 @@ import requests
 import json
 import argparse
 import os
+import time
 
 def send_test_request(json_file: str, enable_ik: bool = False):
     """Send a test request to the validation endpoint
@@ -36,6 +37,15 @@ def send_test_request(json_file: str, enable_ik: bool = False):
                 if 'ik_results' in hand_data and 'plot_path' in hand_data['ik_results']:
                     print(f"\nPlot generated for {hand_key}:")
                     print(hand_data['ik_results']['plot_path'])
+                elif 'ik_results' in hand_data and 'plot_job' in hand_data['ik_results']:
+                    # Plots are rendered in the background; poll until the job finishes
+                    job_url = f"http://localhost:5001/plot_jobs/{hand_data['ik_results']['plot_job']}"
+                    job = requests.get(job_url).json()
+                    while job.get('status') in ('queued', 'rendering'):
+                        time.sleep(0.2)
+                        job = requests.get(job_url).json()
+                    print(f"\nPlot {job.get('status')} for {hand_key}:")
+                    print(job.get('plot_path'))
         
     except requests.exceptions.RequestException as e:
         print(f"Error sending request: {e}")
@@ -0,0 +1,162 @@
+import json
+import threading
+import unittest
+import numpy as np
+from frame_history import FrameHistory
+from pose_filter import OneEuroFilter
+from pose_predictor import KalmanPredictor
+from sim_processor import SimProcessor
+from test_headset_movement import generate_hand_movement
+
+def headset_frame(t):
+    return {
+        "hands": {
+            "left_hand": {"points": generate_hand_movement(t, is_left=True)},
+            "right_hand": {"points": generate_hand_movement(t, is_left=False)}
+        }
+    }
+
+class TestSimProcessor(unittest.TestCase):
+    def setUp(self):
+        self.processor = SimProcessor()
+
+    def test_debug_levels(self):
+        frame = headset_frame(0.5)
+        results = {level: self.processor.process_headset_data(frame, debug_level=level)
+                   for level in ['none', 'summary', 'full']}
+
+        # The pose is the same at every level; only the debug section changes
+        self.assertEqual(results['none']['pose'], results['full']['pose'])
+        self.assertNotIn('debug', results['none'])
+        self.assertEqual(results['summary']['debug']['arms_updated'], ['leftArm', 'rightArm'])
+        self.assertEqual(results['full']['debug']['original_data'], frame)
+        self.assertLess(len(json.dumps(results['summary'])), len(json.dumps(results['full'])) / 10)
+
+        movement = self.processor.process_movement({"rightArm": {"x": 75}}, debug_level='none')
+        self.assertEqual(movement, {"pose": {"rightArm": {"x": 50, "y": 0, "z": 30}}})
+
+        with self.assertRaises(ValueError):
+            self.processor.process_headset_data(frame, debug_level='verbose')
+    def test_history_ring_buffer(self):
+        history = FrameHistory(capacity=8)
+        hands = np.zeros((2, 27, 3))
+        for i in range(13):  # Wraps around the buffer
+            history.append(100.0 + i, hands, np.full((2, 3), i))
+
+        self.assertEqual(len(history), 8)
+        np.testing.assert_array_equal(history.last(3)['timestamp'], [110, 111, 112])
+        np.testing.assert_array_equal(history.last(5, stride=2)['timestamp'], [108, 110, 112])
+        np.testing.assert_array_equal(history.last(50)['timestamp'], np.arange(105, 113))
+        np.testing.assert_array_equal(history.between(106.5, 110)['timestamp'], [107, 108, 109])
+        np.testing.assert_array_equal(history.between(start=111)['timestamp'], [111, 112])
+        np.testing.assert_array_equal(history.between(stride=3)['timestamp'], [105, 108, 111])
+        self.assertEqual(len(history.between(0, 50)), 0)
+        self.assertEqual(history.stats()['oldest'], 105)
+
+    def test_headset_frames_are_recorded(self):
+        for i in range(21):
+            last = self.processor.process_headset_data(headset_frame(0.1 * i))
+        entries = FrameHistory.to_dicts(self.processor.history.last(1), joints=True)
+
+        self.assertEqual(len(self.processor.history), 21)
+        self.assertEqual(set(entries[0]['pose']), {'leftArm', 'rightArm'})
+        for axis in 'xyz':
+            self.assertAlmostEqual(entries[0]['pose']['leftArm'][axis], last['pose']['leftArm'][axis], places=4)
+        self.assertEqual(len(entries[0]['hands']['left']), 27)
+        self.assertEqual(len(self.processor.get_cached_requests()), 10)
+    def test_one_euro_filter(self):
+        rng = np.random.default_rng(0)
+        times = np.arange(600) / 60.0
+        moving = np.stack([20 * np.sin(times), 20 * np.cos(times), np.full_like(times, 30)], axis=1)
+        truth = np.stack([moving, np.full_like(moving, 10)], axis=1)  # One arm moving, one at rest
+        noisy = truth + rng.normal(0, 0.5, truth.shape)
+
+        smoothing = OneEuroFilter((2, 3))
+        filtered = np.array([smoothing.update(noisy[i], times[i]) for i in range(len(times))])
+        for arm in range(2):
+            self.assertLess(np.abs(filtered - truth)[60:, arm].mean(), np.abs(noisy - truth)[60:, arm].mean() * 0.7)
+
+        # A row that is not updated keeps its output, and disabling passes values through
+        held = smoothing.update(np.full((2, 3), 10.0), times[-1] + 0.1, mask=np.array([True, False]))
+        np.testing.assert_array_equal(held[1], filtered[-1, 1])
+        smoothing.configure(enabled=False)
+        np.testing.assert_array_equal(smoothing.update(noisy[0], 10.0), noisy[0])
+        with self.assertRaises(ValueError):
+            smoothing.configure(min_cutoff=0)
+    def test_concurrent_pose_reads_are_consistent(self):
+        def write(offset):
+            for i in range(200):
+                value = (offset + i) % 50
+                self.processor.process_movement({"leftArm": {"x": value, "y": value, "z": value},
+                                                 "rightArm": {"x": value, "y": value, "z": value}},
+                                                debug_level='none')
+
+        writers = [threading.Thread(target=write, args=(offset,)) for offset in range(4)]
+        for writer in writers:
+            writer.start()
+        versions = []
+        while any(writer.is_alive() for writer in writers):
+            position = self.processor.get_current_position()
+            # Both arms always come from the same update
+            self.assertEqual(position['pose']['leftArm'], position['pose']['rightArm'])
+            versions.append(position['version'])
+        for writer in writers:
+            writer.join()
+
+        self.assertEqual(versions, sorted(versions))
+        self.assertEqual(self.processor.get_current_position()['version'], 800)
+        with self.assertRaises(ValueError):
+            self.processor.pose_state.snapshot.positions[0, 0] = 1.0
+    def test_kalman_prediction(self):
+        rng = np.random.default_rng(0)
+        times = np.arange(600) / 60.0
+        horizon = 0.1
+
+        def circle(t):
+            arm = np.stack([20 * np.sin(2 * t), 20 * np.cos(2 * t), np.full_like(t, 30)], axis=1)
+            return np.stack([arm, -arm], axis=1)
+
+        noisy = circle(times) + rng.normal(0, 0.5, (len(times), 2, 3))
+        predictor = KalmanPredictor(horizon=horizon)
+        predicted = np.array([predictor.update(noisy[i], times[i]) for i in range(len(times))])
+
+        # Closer to where the hands will be at actuation time than the raw measurements
+        future = circle(times + horizon)
+        self.assertLess(np.abs(predicted - future)[60:].mean(), np.abs(noisy - future)[60:].mean() / 2)
+
+        # The auto horizon follows the measured latency
+        predictor.configure(horizon='auto', actuation_delay=0.02)
+        for i in range(100):
+            predictor.update(noisy[i], times[i] + 0.08, sent_at=times[i])
+        self.assertAlmostEqual(predictor.current_horizon(), 0.1, places=3)
+
+        # Disabled by default, so targets pass through unchanged
+        self.assertEqual(self.processor.prediction.params()['enabled'], False)
+        with self.assertRaises(ValueError):
+            predictor.configure(horizon=-1)
+
+    def test_prediction_with_whole_second_timestamps(self):
+        rng = np.random.default_rng(0)
+        arrivals = 1000.0 + np.arange(600) / 30.0
+        horizon = 0.1
+
+        def circle(t):
+            return np.stack([20 * np.sin(2 * t), 20 * np.cos(2 * t), np.full_like(t, 30)], axis=1)
+
+        noisy = circle(arrivals) + rng.normal(0, 0.5, (len(arrivals), 3))
+        self.processor.smoothing.configure(enabled=False)
+        self.processor.prediction.configure(horizon=horizon)
+        predicted = []
+        for i, arrival in enumerate(arrivals):
+            x, y, z = noisy[i].tolist()
+            pose = {"leftArm": {"x": x, "y": y, "z": z}}
+            # Headset stamps only resolve the second the frame was sent in
+            self.processor._filter_pose(pose, frame_time=float(np.floor(arrival)), received_at=arrival)
+            predicted.append([pose["leftArm"][axis] for axis in 'xyz'])
+
+        # Predicting ahead still beats sending the measurements as they are
+        future = circle(arrivals + horizon)
+        self.assertLess(np.abs(np.array(predicted) - future)[60:].mean(), np.abs(noisy - future)[60:].mean() / 2)
+
+if __name__ == '__main__':
+    unittest.main()
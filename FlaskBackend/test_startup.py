@@ -0,0 +1,13 @@
+import unittest
+from import_report import measure_imports
+
+class TestStartup(unittest.TestCase):
+    def test_main_import_is_light(self):
+        report = measure_imports('main')
+
+        # Feature packages load only when their feature is enabled
+        self.assertEqual(report['heavy_modules'], [])
+        self.assertGreater(report['total_seconds'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
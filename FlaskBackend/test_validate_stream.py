@@ -0,0 +1,81 @@
+import json
+import unittest
+import numpy as np
+import main
+from hand_frame import N_JOINTS
+
+class TestValidateStream(unittest.TestCase):
+    def setUp(self):
+        main.app.config['ENABLE_IK'] = False
+        self.client = main.app.test_client()
+
+    def test_ndjson_stream(self):
+        frames = [
+            {"hands": {"left_hand": {"points": [{"name": "handWrist", "x": 0.1, "y": 0.2, "z": 0.3}]}}},
+            {"hands": {"left_hand": {"points": [{"name": "handWrist", "x": 2.5, "y": 0.2, "z": 0.3}]}}},
+            {"no_hands": {}}
+        ]
+        body = '\n'.join(json.dumps(frame) for frame in frames) + '\n'
+        response = self.client.post('/validate/stream', data=body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+
+        results = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual([result['frame'] for result in results], [0, 1, 2])
+        self.assertTrue(results[0]['overall_valid'])
+        self.assertFalse(results[1]['overall_valid'])
+        self.assertEqual(results[1], {'frame': 1, **main.validate_frame_data(frames[1])})
+        self.assertIn('error', results[2])
+
+    def test_motion_with_whole_second_timestamps(self):
+        def frame(x, timestamp):
+            return {"timestamp": timestamp,
+                    "hands": {"left_hand": {"points": [{"name": "handWrist", "x": x, "y": 0.5, "z": 0.5}]}}}
+
+        # Live frames are timed by arrival, so a teleport within one stamped second is caught
+        session = 'whole-second-test'
+        try:
+            for x in [0.5, 0.5]:
+                result = main.validate_frame_data(frame(x, "2025-01-18T18:30:00Z"), session=session)
+                self.assertTrue(result['overall_valid'])
+            result = main.validate_frame_data(frame(0.8, "2025-01-18T18:30:00Z"), session=session)
+            self.assertFalse(result['overall_valid'])
+            self.assertIn('speed', result['validation_results']['left_hand']['violations'][0])
+        finally:
+            main.get_validator().end_session(session)
+
+        # Recorded frames are checked only when their timestamps resolve the frame interval
+        for stamps, expected in [(["2025-01-18T18:30:00Z"] * 3, [True, True, True]),
+                                 ([1000.0, 1000.01, 1000.02], [True, True, False])]:
+            body = ''.join(json.dumps(frame(x, stamp)) + '\n' for x, stamp in zip([0.5, 0.5, 0.8], stamps))
+            response = self.client.post('/validate/stream', data=body, content_type='application/x-ndjson')
+            results = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+            self.assertEqual([result['overall_valid'] for result in results], expected)
+
+    def test_validate_without_session_is_stateless(self):
+        frames = []
+        for name in ['example.json', 'ex2.json']:
+            with open(name) as f:
+                frames.append(json.load(f))
+
+        # Unrelated captures posted back to back are each checked on their own
+        results = [self.client.post('/validate', json=frame).get_json() for frame in frames]
+        for frame, result in zip(frames, results):
+            self.assertEqual(result, main.validate_frame_data(frame))
+            for hand in result['validation_results'].values():
+                self.assertFalse(any('speed' in violation for violation in hand['violations']))
+
+    def test_binary_stream(self):
+        positions = np.full((600, N_JOINTS, 3), 0.5, dtype='<f4')
+        positions[3, 0, 0] = 2.5
+        positions[599, 10, 2] = -1.0
+        positions[7, 4] = np.nan  # Missing joint
+        response = self.client.post('/validate/stream', data=positions.tobytes(),
+                                    content_type='application/octet-stream')
+        self.assertEqual(response.status_code, 200)
+
+        valid = np.frombuffer(response.get_data(), dtype=np.uint8)
+        self.assertEqual(len(valid), 600)
+        np.testing.assert_array_equal(np.flatnonzero(valid == 0), [3, 599])
+
+if __name__ == '__main__':
+    unittest.main()